@@ -0,0 +1,231 @@
+"""
+Admin integration for the behaviors: single UPDATE actions, list filters
+served by the behavior indexes and a changelist that doesn't count every row.
+"""
+from __future__ import unicode_literals
+
+import json
+
+from django.contrib import admin
+from django.contrib.admin.utils import model_ngettext
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models.query import QuerySet
+from django.utils import timezone
+from django.utils.functional import cached_property
+from django.utils.text import capfirst
+
+from .behaviors import Published, Released, StoreDeleted
+from .querysets import behavior_queryset_class
+
+
+def estimate_count(queryset):
+    """
+    Return the number of rows the planner estimates ``queryset`` has on
+    PostgreSQL, ``None`` on the other databases.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute('EXPLAIN (FORMAT JSON) ' + sql, params)
+        plan = cursor.fetchone()[0]
+    if not isinstance(plan, list):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+class CappedCount(int):
+    """
+    A count stopped at a cap, shown as ``10000+`` in the changelist.
+    """
+
+    def __str__(self):
+        return '%d+' % self
+
+
+class BehaviorPaginator(Paginator):
+    """
+    Paginator counting at most ``max_count`` objects with a ``LIMIT``ed
+    subquery. Beyond that, the count is the PostgreSQL planner's estimate, or
+    a ``CappedCount`` of ``max_count``, so the pages after it are not linked.
+    """
+    max_count = 10000
+
+    @cached_property
+    def count(self):
+        if not isinstance(self.object_list, QuerySet):
+            return super(BehaviorPaginator, self).count
+        queryset = self.object_list.order_by()
+        count = queryset[:self.max_count + 1].count()
+        if count <= self.max_count:
+            return count
+        estimate = estimate_count(queryset)
+        if estimate is not None and estimate > self.max_count:
+            return estimate
+        return CappedCount(self.max_count)
+
+    @property
+    def capped(self):
+        """
+        Whether or not there are objects past ``count``.
+        """
+        return isinstance(self.count, CappedCount)
+
+
+def _behavior_queryset(queryset):
+    # The admin queryset comes from the default manager, which may lack the
+    # bulk methods of the model's behaviors.
+    queryset_class = behavior_queryset_class(queryset.model)
+    if isinstance(queryset, queryset_class):
+        return queryset
+    return queryset_class(queryset.model, query=queryset.query.clone(),
+                          using=queryset._db, hints=queryset._hints)
+
+
+def _bulk_action(name, verb, description, transition, permission='change'):
+    def action(modeladmin, request, queryset):
+        rows = transition(_behavior_queryset(queryset))
+        modeladmin.message_user(request, '%d %s %s.' % (
+            rows, model_ngettext(modeladmin.opts, rows), verb))
+    action.__name__ = str(name)
+    action.short_description = description
+    action.allowed_permissions = (permission,)
+    return action
+
+
+soft_delete_selected = _bulk_action(
+    'soft_delete_selected', 'deleted',
+    'Delete selected %(verbose_name_plural)s',
+    lambda queryset: queryset.soft_delete(), permission='delete')
+restore_selected = _bulk_action(
+    'restore_selected', 'restored',
+    'Restore selected %(verbose_name_plural)s',
+    lambda queryset: queryset.restore())
+publish_selected = _bulk_action(
+    'publish_selected', 'published',
+    'Publish selected %(verbose_name_plural)s',
+    lambda queryset: queryset.publish())
+unpublish_selected = _bulk_action(
+    'unpublish_selected', 'unpublished',
+    'Unpublish selected %(verbose_name_plural)s',
+    lambda queryset: queryset.unpublish())
+release_now_selected = _bulk_action(
+    'release_now_selected', 'released',
+    'Release selected %(verbose_name_plural)s now',
+    lambda queryset: queryset.release_on(timezone.now()))
+
+
+class DeletedListFilter(admin.SimpleListFilter):
+    """
+    Filter on the ``deleted`` state, showing the objects that aren't deleted
+    by default.
+    """
+    title = 'deleted'
+    parameter_name = 'deleted'
+
+    def lookups(self, request, model_admin):
+        return (('no', 'No'), ('yes', 'Yes'), ('all', 'All'))
+
+    def choices(self, changelist):
+        for lookup, title in self.lookup_choices:
+            yield {
+                'selected': (self.value() or 'no') == lookup,
+                'query_string': changelist.get_query_string(
+                    {self.parameter_name: lookup}),
+                'display': title,
+            }
+
+    def queryset(self, request, queryset):
+        value = self.value() or 'no'
+        if value == 'no':
+            return queryset.filter(deleted__isnull=True)
+        if value == 'yes':
+            return queryset.filter(deleted__isnull=False)
+        return queryset
+
+
+class ReleasedListFilter(admin.SimpleListFilter):
+    title = 'released'
+    parameter_name = 'released'
+
+    def lookups(self, request, model_admin):
+        return (('yes', 'Yes'), ('no', 'Not yet'), ('none', 'No release date'))
+
+    def queryset(self, request, queryset):
+        if self.value() == 'yes':
+            return queryset.filter(release_date__lte=timezone.now())
+        if self.value() == 'no':
+            return queryset.filter(release_date__gt=timezone.now())
+        if self.value() == 'none':
+            return queryset.filter(release_date__isnull=True)
+        return queryset
+
+
+class BehaviorsAdminMixin(object):
+    """
+    ``ModelAdmin`` mixin adding the bulk actions and list filters of the
+    model's behaviors, soft deleting ``StoreDeleted`` objects, and paginating
+    without counting every row of the changelist.
+    """
+    paginator = BehaviorPaginator
+    show_full_result_count = False
+
+    def __init__(self, model, admin_site):
+        super(BehaviorsAdminMixin, self).__init__(model, admin_site)
+        if self.actions is not None:
+            self.actions = list(self.actions) + [
+                action for action in self.get_behavior_actions()
+                if action not in self.actions]
+
+    def get_behavior_actions(self):
+        actions = []
+        if issubclass(self.model, StoreDeleted):
+            actions += [soft_delete_selected, restore_selected]
+        if issubclass(self.model, Published):
+            actions += [publish_selected, unpublish_selected]
+        if issubclass(self.model, Released):
+            actions.append(release_now_selected)
+        return actions
+
+    def get_actions(self, request):
+        actions = super(BehaviorsAdminMixin, self).get_actions(request)
+        if issubclass(self.model, StoreDeleted):
+            # soft_delete_selected replaces it, without listing every related
+            # object first.
+            actions.pop('delete_selected', None)
+        return actions
+
+    def get_list_filter(self, request):
+        list_filter = list(super(BehaviorsAdminMixin, self).get_list_filter(request))
+        if issubclass(self.model, Published):
+            list_filter.append('publication_status')
+        if issubclass(self.model, Released):
+            list_filter.append(ReleasedListFilter)
+        if issubclass(self.model, StoreDeleted):
+            list_filter.append(DeletedListFilter)
+        return list_filter
+
+    def get_queryset(self, request):
+        if not issubclass(self.model, StoreDeleted):
+            return super(BehaviorsAdminMixin, self).get_queryset(request)
+        # Deleted objects are listed by DeletedListFilter and can be edited.
+        queryset = _behavior_queryset(self.model._base_manager.all())
+        ordering = self.get_ordering(request)
+        if ordering:
+            queryset = queryset.order_by(*ordering)
+        return queryset
+
+    def get_deleted_objects(self, objs, request):
+        if not issubclass(self.model, StoreDeleted):
+            return super(BehaviorsAdminMixin, self).get_deleted_objects(
+                objs, request)
+        # A soft delete doesn't cascade: only list the objects themselves.
+        objs = list(objs)
+        verbose_name = capfirst(self.opts.verbose_name)
+        perms_needed = set()
+        if not self.has_delete_permission(request):
+            perms_needed.add(self.opts.verbose_name)
+        return (['%s: %s' % (verbose_name, obj) for obj in objs],
+                {self.opts.verbose_name_plural: len(objs)}, perms_needed, [])
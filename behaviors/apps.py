@@ -1,13 +1,52 @@
 # -*- coding: utf-8
 from django.apps import AppConfig
 from django.conf import settings
+from django.core import checks
+from django.db.models import signals
 
 
 class BehaviorsConfig(AppConfig):
     name = 'behaviors'
 
+    def ready(self):
+        from .checks import check_behavior_indexes
+        checks.register(check_behavior_indexes, checks.Tags.models)
+        from .routers import pin_on_write
+        signals.post_save.connect(pin_on_write, dispatch_uid='behaviors_pin_on_save')
+        signals.post_delete.connect(pin_on_write, dispatch_uid='behaviors_pin_on_delete')
+        if self.instrumentation_enabled():
+            from . import instrumentation
+            instrumentation.enable()
+
     @classmethod
     def are_slug_unique(cls):
         # By default, the Slugged behavior will generate unique slugs.
         # You can disable this constraint in your project's settings module.
         return getattr(settings, "UNIQUE_SLUG_BEHAVIOR", True)
+
+    @classmethod
+    def status_counts_cache_timeout(cls):
+        # Published.status_counts() is not cached unless a timeout (in
+        # seconds) is set in your project's settings module.
+        return getattr(settings, "STATUS_COUNTS_CACHE_TIMEOUT", None)
+
+    @classmethod
+    def instrumentation_enabled(cls):
+        # The queries of the behavior methods are only timed when enabled in
+        # your project's settings module, see behaviors.instrumentation.
+        return getattr(settings, "BEHAVIORS_INSTRUMENTATION", False)
+
+    @classmethod
+    def metrics_path(cls):
+        # Path at which BehaviorMetricsMiddleware serves the metrics.
+        return getattr(settings, "BEHAVIORS_METRICS_PATH", "/metrics/behaviors/")
+
+    @classmethod
+    def primary_database(cls):
+        # Database BehaviorRouter sends the writes to.
+        return getattr(settings, "BEHAVIORS_PRIMARY_DATABASE", "default")
+
+    @classmethod
+    def replica_databases(cls):
+        # Databases BehaviorRouter picks from for the behavior reads.
+        return list(getattr(settings, "BEHAVIORS_REPLICA_DATABASES", []))
@@ -1,8 +1,11 @@
 from __future__ import unicode_literals
 
+import functools
+
 from django.conf import settings
-from django.db import models
+from django.db import models, router, transaction
 from django.utils import timezone
+from django.utils.text import capfirst
 from django.core.exceptions import ObjectDoesNotExist
 
 try:
@@ -10,12 +13,72 @@ try:
 except ImportError:
     from django.utils.text import slugify
 
+from . import signals
 from .apps import BehaviorsConfig
+from .cache import invalidate_status_counts
+from .compat import (epoch_micros, in_thread, is_relation_cached,
+                     supports_async)
+from .exceptions import ConflictError
+from .instrumentation import instrumented
 from .querysets import (AuthoredQuerySet, EditoredQuerySet,
                         PublishedQuerySet, ReleasedQuerySet,
                         StoreDeletedQuerySet)
 
 
+def _add_update_field(kwargs, name):
+    """
+    Include ``name`` in the ``update_fields`` of a narrowed ``save()``.
+    """
+    update_fields = kwargs.get('update_fields')
+    if update_fields and name not in update_fields:
+        kwargs['update_fields'] = list(update_fields) + [name]
+
+
+def _send_for_instance(instance, signal, save, signal_kwargs=None, using=None):
+    """
+    Call ``save()`` and send the batched ``signal`` for ``instance`` once its
+    transaction commits, as the bulk queryset methods do for their rows.
+    """
+    model = instance.__class__
+    result = save()
+    if signal.has_listeners(model):
+        signals.send_on_commit(
+            signal, model, [instance.pk], using or instance._state.db,
+            instance=instance, **(signal_kwargs or {}))
+    return result
+
+
+def _sync_user_name(instance, field):
+    """
+    Copy the username of the ``field`` user to ``<field>_name``. The user is
+    only fetched when it isn't loaded yet and no name was stored, or when
+    ``<field>_id`` changed since the name was loaded or synced. Return
+    whether or not the name changed.
+    """
+    name_field = '%s_name' % field
+    synced_field = '_synced_%s_id' % field
+    user_id = getattr(instance, '%s_id' % field)
+    if user_id is None:
+        name = ''
+    elif is_relation_cached(instance, field) or not getattr(instance, name_field) \
+            or instance.__dict__.get(synced_field, user_id) != user_id:
+        name = getattr(instance, field).get_username()
+    else:
+        return False
+    instance.__dict__[synced_field] = user_id
+    if name == getattr(instance, name_field):
+        return False
+    setattr(instance, name_field, name)
+    return True
+
+
+def _loaded_user_id(instance, field):
+    # The user the loaded <field>_name is the name of.
+    attname = '%s_id' % field
+    if attname in instance.__dict__:
+        instance.__dict__['_synced_%s' % attname] = instance.__dict__[attname]
+
+
 class Authored(models.Model):
     """
     An abstract behavior representing adding an author to a model based on the
@@ -51,6 +114,63 @@ class Editored(models.Model):
         abstract = True
 
 
+class NamedAuthored(Authored):
+    """
+    An abstract behavior extending ``Authored`` with a denormalized
+    ``author_name`` so that lists can show the author without joining the
+    user table.
+    """
+    author_name = models.CharField(max_length=150, blank=True, editable=False)
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super(NamedAuthored, cls).from_db(db, field_names, values)
+        _loaded_user_id(instance, 'author')
+        return instance
+
+    def sync_author_name(self):
+        return _sync_user_name(self, 'author')
+
+    def save(self, *args, **kwargs):
+        if self.sync_author_name():
+            _add_update_field(kwargs, 'author_name')
+        return super(NamedAuthored, self).save(*args, **kwargs)
+
+
+class NamedEditored(Editored):
+    """
+    An abstract behavior extending ``Editored`` with a denormalized
+    ``editor_name`` so that lists can show the editor without joining the
+    user table.
+    """
+    editor_name = models.CharField(max_length=150, blank=True, editable=False)
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super(NamedEditored, cls).from_db(db, field_names, values)
+        _loaded_user_id(instance, 'editor')
+        return instance
+
+    def sync_editor_name(self):
+        return _sync_user_name(self, 'editor')
+
+    def save(self, *args, **kwargs):
+        if self.sync_editor_name():
+            _add_update_field(kwargs, 'editor_name')
+        return super(NamedEditored, self).save(*args, **kwargs)
+
+
+# The fields besides publication_status whose narrowed saves invalidate the
+# cached status_counts().
+STATUS_COUNTED_FIELDS = frozenset(['deleted', 'release_date'])
+
+
 class Published(models.Model):
     """
     An abstract behavior representing adding a publication status. A
@@ -67,7 +187,7 @@ class Published(models.Model):
 
     publication_status = models.CharField(
         "Publication Status", max_length=1,
-        choices=PUBLICATION_STATUS_CHOICES, default=DRAFT)
+        choices=PUBLICATION_STATUS_CHOICES, default=DRAFT, db_index=True)
 
     class Meta:
         abstract = True
@@ -75,6 +195,44 @@ class Published(models.Model):
     objects = PublishedQuerySet.as_manager()
     publications = PublishedQuerySet.as_manager()
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super(Published, cls).from_db(db, field_names, values)
+        if 'publication_status' in instance.__dict__:
+            # The status the row is counted in by status_counts().
+            instance._loaded_publication_status = instance.publication_status
+        return instance
+
+    def _changes_status_counts(self, update_fields):
+        if self._state.adding or '_loaded_publication_status' not in self.__dict__:
+            return True
+        if update_fields is not None:
+            # The behavior transitions of StoreDeleted and Released move the
+            # row in or out of querysets like not_deleted() and live().
+            if STATUS_COUNTED_FIELDS.intersection(update_fields):
+                return True
+            if 'publication_status' not in update_fields:
+                return False
+        return self.publication_status != self._loaded_publication_status
+
+    def save(self, *args, **kwargs):
+        # The with_states() annotation is a snapshot of the saved status.
+        self.__dict__.pop('is_published', None)
+        invalidate = self._changes_status_counts(kwargs.get('update_fields'))
+        super(Published, self).save(*args, **kwargs)
+        self._loaded_publication_status = self.publication_status
+        if invalidate:
+            invalidate_status_counts(self.__class__, self._state.db)
+
+    def delete(self, *args, **kwargs):
+        result = super(Published, self).delete(*args, **kwargs)
+        invalidate_status_counts(self.__class__, self._state.db)
+        return result
+
+    # Unlike the other states, these don't depend on ``now``, so they are read
+    # from ``publication_status`` rather than from a ``with_states()``
+    # annotation that reassigning it would leave stale.
+
     @property
     def draft(self):
         return self.publication_status == self.DRAFT
@@ -97,15 +255,29 @@ class Released(models.Model):
     objects = ReleasedQuerySet.as_manager()
     releases = ReleasedQuerySet.as_manager()
 
+    @instrumented('released')
     def release_on(self, date=None):
         if not date:
             date = timezone.now()
         self.release_date = date
-        self.save()
+        self.__dict__.pop('is_released', None)
+        if self._state.adding:
+            save = self.save
+        else:
+            save = functools.partial(self.save, update_fields=['release_date'])
+        _send_for_instance(self, signals.released, save,
+                           {'release_date': date})
+
+    if supports_async():
+        def arelease_on(self, date=None):
+            return in_thread(self.release_on)(date)
 
     @property
     def released(self):
-        return self.release_date and self.release_date < timezone.now()
+        if 'is_released' in self.__dict__:
+            return self.is_released
+        # Released at its release date, like released() and is_released.
+        return self.release_date and self.release_date <= timezone.now()
 
 
 class Slugged(models.Model):
@@ -122,10 +294,22 @@ class Slugged(models.Model):
         abstract = True
 
     def save(self, *args, **kwargs):
-        if not self.slug:
-            self.slug = self.generate_unique_slug() \
-                if BehaviorsConfig.are_slug_unique() else self.get_slug()
-        super(Slugged, self).save(*args, **kwargs)
+        if self.slug:
+            super(Slugged, self).save(*args, **kwargs)
+            return
+        self.slug = self.generate_unique_slug(kwargs.get('using')) \
+            if BehaviorsConfig.are_slug_unique() else self.get_slug()
+        _add_update_field(kwargs, 'slug')
+        _send_for_instance(self, signals.slug_assigned, functools.partial(
+            super(Slugged, self).save, *args, **kwargs), using=kwargs.get('using'))
+
+    if supports_async():
+        def asave(self, *args, **kwargs):
+            """
+            Save from async code. The slug is generated and saved in a single
+            thread hop rather than one per uniqueness probe.
+            """
+            return in_thread(self.save)(*args, **kwargs)
 
     def get_slug(self):
         try:
@@ -134,21 +318,70 @@ class Slugged(models.Model):
             # django.utils.text.slugify fallback
             return slugify(getattr(self, "slug_source"))
 
-    def is_unique_slug(self, slug):
-        qs = self.__class__.objects.filter(slug=slug)
+    @classmethod
+    def _slug_queryset(cls, using=None, instance=None):
+        # Slugs are checked among every row of the database they are written
+        # to, whatever the default manager filters out or the router reads.
+        if using is None:
+            using = router.db_for_write(cls, instance=instance)
+        return cls._base_manager.using(using)
+
+    @instrumented('slugged')
+    def is_unique_slug(self, slug, using=None):
+        qs = self._slug_queryset(using, self).filter(slug=slug)
         return not qs.exists()
 
-    def generate_unique_slug(self):
+    if supports_async():
+        def ais_unique_slug(self, slug, using=None):
+            return in_thread(self.is_unique_slug)(slug, using)
+
+    @instrumented('slugged')
+    def generate_unique_slug(self, using=None):
         slug = self.get_slug()
         new_slug = slug
 
         iteration = 1
-        while not self.is_unique_slug(new_slug):
+        while not self.is_unique_slug(new_slug, using):
             new_slug = "%s-%d" % (slug, iteration)
             iteration += 1
 
         return new_slug
 
+    if supports_async():
+        def agenerate_unique_slug(self, using=None):
+            return in_thread(self.generate_unique_slug)(using)
+
+    @classmethod
+    @instrumented('slugged')
+    def assign_slugs(cls, objs, using=None):
+        """
+        Set the slug of every object of ``objs`` that has none, like
+        ``save()`` does but with a single query for the slugs already taken
+        in the ``using`` database.
+        """
+        objs = [obj for obj in objs if not obj.slug]
+        if not BehaviorsConfig.are_slug_unique():
+            for obj in objs:
+                obj.slug = obj.get_slug()
+            return
+        slugs = [obj.get_slug() for obj in objs]
+        if not slugs:
+            return
+
+        lookups = models.Q()
+        for slug in set(slugs):
+            lookups |= models.Q(slug=slug) | models.Q(slug__startswith='%s-' % slug)
+        taken = set(cls._slug_queryset(using).filter(lookups).values_list(
+            'slug', flat=True))
+        for obj, slug in zip(objs, slugs):
+            new_slug = slug
+            iteration = 1
+            while new_slug in taken:
+                new_slug = "%s-%d" % (slug, iteration)
+                iteration += 1
+            taken.add(new_slug)
+            obj.slug = new_slug
+
 
 class Timestamped(models.Model):
     """
@@ -161,14 +394,82 @@ class Timestamped(models.Model):
     class Meta:
         abstract = True
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super(Timestamped, cls).from_db(db, field_names, values)
+        if 'modified' in instance.__dict__:
+            # The value compare-and-swap saves expect to find in the row.
+            instance._loaded_modified = instance.modified
+        return instance
+
     @property
     def changed(self):
+        if 'is_changed' in self.__dict__:
+            return self.is_changed
         return True if self.modified else False
 
+    @property
+    def last_modified(self):
+        return self.modified or self.created
+
+    @property
+    def cache_key(self):
+        """
+        A key for template fragment caching that changes whenever the object
+        is saved, e.g. ``{% cache 600 post post.cache_key %}``.
+        """
+        return '%s.%s.%s' % (self._meta.label_lower, self.pk,
+                             epoch_micros(self.last_modified))
+
+    @instrumented('timestamped')
     def save(self, *args, **kwargs):
+        """
+        Pass ``check_conflicts=True`` to only update the row if its
+        ``modified`` is still the one the object was loaded with, raising
+        ``ConflictError`` otherwise.
+        """
+        check_conflicts = kwargs.pop('check_conflicts', False)
         if self.pk:
             self.modified = timezone.now()
-        return super(Timestamped, self).save(*args, **kwargs)
+            self.__dict__.pop('is_changed', None)
+            _add_update_field(kwargs, 'modified')
+        if not (check_conflicts and '_loaded_modified' in self.__dict__):
+            result = super(Timestamped, self).save(*args, **kwargs)
+            self._loaded_modified = self.modified
+            return result
+
+        self._expected_modified = self._loaded_modified
+        using = kwargs.get('using') or router.db_for_write(
+            self.__class__, instance=self)
+        try:
+            # A conflict only rolls back this savepoint, leaving an enclosing
+            # transaction usable.
+            with transaction.atomic(using=using):
+                result = super(Timestamped, self).save(*args, **kwargs)
+        finally:
+            del self._expected_modified
+        self._loaded_modified = self.modified
+        return result
+
+    if supports_async():
+        def asave(self, *args, **kwargs):
+            """
+            Save from async code, accepting ``check_conflicts`` like ``save()``.
+            """
+            return in_thread(self.save)(*args, **kwargs)
+
+    def _do_update(self, base_qs, using, pk_val, values, update_fields,
+                   forced_update):
+        if '_expected_modified' not in self.__dict__:
+            return super(Timestamped, self)._do_update(
+                base_qs, using, pk_val, values, update_fields, forced_update)
+        updated = super(Timestamped, self)._do_update(
+            base_qs.filter(modified=self._expected_modified), using, pk_val,
+            values, update_fields, forced_update)
+        if not updated and base_qs.filter(pk=pk_val).exists():
+            raise ConflictError('%s was modified since it was loaded.' %
+                                capfirst(self._meta.verbose_name))
+        return updated
 
 
 class StoreDeleted(models.Model):
@@ -185,18 +486,40 @@ class StoreDeleted(models.Model):
 
     @property
     def is_deleted(self):
+        if '_is_deleted' in self.__dict__:
+            return self._is_deleted
         return self.deleted is not None
 
-    def delete(self, *args, **kwargs):
+    @is_deleted.setter
+    def is_deleted(self, value):
+        # Assigned by the ``is_deleted`` annotation of ``with_states()``.
+        self._is_deleted = value
+
+    @instrumented('store_deleted')
+    def delete(self, using=None, keep_parents=False):
         if not self.pk:
             raise ObjectDoesNotExist(
                 'Object must be created before it can be deleted')
         self.deleted = timezone.now()
-        return super(StoreDeleted, self).save(*args, **kwargs)
-
-    def restore(self, *args, **kwargs):
+        self.__dict__.pop('_is_deleted', None)
+        # Only the deleted column (and whatever the other behaviors add, such
+        # as Timestamped's modified) is written.
+        return _send_for_instance(self, signals.soft_deleted, functools.partial(
+            self.save, using=using, update_fields=['deleted']), using=using)
+
+    @instrumented('store_deleted')
+    def restore(self, using=None):
         if not self.pk:
             raise ObjectDoesNotExist(
                 'Object must be created before it can be restored')
         self.deleted = None
-        return super(StoreDeleted, self).save(*args, **kwargs)
+        self.__dict__.pop('_is_deleted', None)
+        return _send_for_instance(self, signals.restored, functools.partial(
+            self.save, using=using, update_fields=['deleted']), using=using)
+
+    if supports_async():
+        def adelete(self, using=None, keep_parents=False):
+            return in_thread(self.delete)(using, keep_parents)
+
+        def arestore(self, using=None):
+            return in_thread(self.restore)(using)
@@ -0,0 +1,59 @@
+from __future__ import unicode_literals
+
+import hashlib
+import uuid
+
+from django.core.cache import cache
+from django.db import connections, transaction
+
+from .apps import BehaviorsConfig
+
+
+def _generation_key(model):
+    return 'behaviors:status_counts:%s:generation' % (
+        model._meta.concrete_model._meta.label_lower)
+
+
+def _generation(model):
+    key = _generation_key(model)
+    generation = cache.get(key)
+    if generation is None:
+        # A fresh token never matches counts cached under an evicted one.
+        generation = uuid.uuid4().hex
+        cache.set(key, generation, None)
+    return generation
+
+
+def status_counts_key(queryset):
+    """
+    Return the cache key of ``status_counts()`` for a queryset. The key
+    changes with the queryset's SQL and whenever the model is invalidated,
+    but not with the ``now`` of time-bound filters like ``released()``.
+    """
+    sql, params = queryset.query.sql_with_params()
+    ops = connections[queryset.db].ops
+    bounds = []
+    for now in queryset._time_bounds:
+        # Parameters are the database's representation of the datetime.
+        bounds.extend([now, ops.adapt_datetimefield_value(now)])
+    params = tuple('<now>' if param in bounds else param for param in params)
+    digest = hashlib.md5(
+        ('%s:%s:%r' % (queryset.db, sql, params)).encode('utf-8')).hexdigest()
+    return 'behaviors:status_counts:%s:%s:%s' % (
+        queryset.model._meta.concrete_model._meta.label_lower,
+        _generation(queryset.model), digest)
+
+
+def _invalidate(model):
+    cache.set(_generation_key(model), uuid.uuid4().hex, None)
+
+
+def invalidate_status_counts(model, using=None):
+    """
+    Invalidate every cached ``status_counts()`` of the model once the
+    transaction on ``using`` commits, so that counts read concurrently before
+    the commit aren't cached as current. Does nothing when the cache is
+    disabled.
+    """
+    if BehaviorsConfig.status_counts_cache_timeout() is not None:
+        transaction.on_commit(lambda: _invalidate(model), using=using)
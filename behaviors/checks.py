@@ -0,0 +1,115 @@
+from __future__ import unicode_literals
+
+from django.apps import apps
+from django.core import checks
+from django.db import models
+
+from .compat import supports_partial_indexes
+
+
+def _condition_fields(condition):
+    fields = set()
+    for child in condition.children:
+        if isinstance(child, models.Q):
+            fields.update(_condition_fields(child))
+        else:
+            fields.add(child[0].split('__')[0])
+    return fields
+
+
+def _indexes(model):
+    """
+    Return the ``(fields, condition fields)`` of every index of ``model``.
+    """
+    opts = model._meta
+    indexes = []
+    for field in opts.concrete_fields:
+        if field.db_index or field.unique:
+            indexes.append(([field.name], set()))
+    for index in opts.indexes:
+        condition = getattr(index, 'condition', None)
+        indexes.append((
+            [name.lstrip('-') for name in index.fields],
+            _condition_fields(condition) if condition else set()))
+    for fields in tuple(getattr(opts, 'index_together', ())) + tuple(opts.unique_together):
+        indexes.append((list(fields), set()))
+    for constraint in getattr(opts, 'constraints', ()):
+        if getattr(constraint, 'fields', None):
+            condition = getattr(constraint, 'condition', None)
+            indexes.append((
+                list(constraint.fields),
+                _condition_fields(condition) if condition else set()))
+    return indexes
+
+
+def _is_covered(model, name):
+    """
+    Return whether or not an index serves the behavior filters on ``name``:
+    ``name`` leads the index, which is either complete or partial on a
+    condition of ``name`` alone. Following other columns, or being part of
+    the condition of an index on other columns, doesn't count: the database
+    scans the whole index then.
+    """
+    for fields, condition in _indexes(model):
+        if fields[:1] == [name] and condition <= set([name]):
+            return True
+    return False
+
+
+def check_behavior_indexes(app_configs=None, **kwargs):
+    """
+    Warn about the behavior fields filtered on by the behavior querysets
+    without an index. A model silences them by listing their ids in a
+    ``silenced_behavior_checks`` attribute.
+    """
+    from .behaviors import Published, Released, StoreDeleted
+
+    if app_configs is None:
+        models_ = apps.get_models()
+    else:
+        models_ = [model for app_config in app_configs
+                   for model in app_config.get_models()]
+
+    errors = []
+    for model in models_:
+        if model._meta.proxy or not model._meta.managed:
+            continue
+        silenced = getattr(model, 'silenced_behavior_checks', ())
+        is_live = all(issubclass(model, behavior)
+                      for behavior in (Published, Released, StoreDeleted))
+
+        if issubclass(model, Published) and 'behaviors.W001' not in silenced \
+                and not _is_covered(model, 'publication_status'):
+            errors.append(checks.Warning(
+                "'publication_status' is filtered on by draft() and "
+                "published() but has no index.",
+                hint="Set db_index=True on the field or add "
+                     "models.Index(fields=['publication_status']) to Meta.indexes.",
+                obj=model, id='behaviors.W001'))
+
+        if issubclass(model, Released) and 'behaviors.W002' not in silenced \
+                and not _is_covered(model, 'release_date'):
+            hint = ("Add models.Index(fields=['release_date']) to "
+                    "Meta.indexes.")
+            if is_live:
+                hint += " live_index() doesn't serve released()."
+            errors.append(checks.Warning(
+                "'release_date' is filtered on by released() and "
+                "not_released() but has no index.",
+                hint=hint, obj=model, id='behaviors.W002'))
+
+        if issubclass(model, StoreDeleted) and 'behaviors.W003' not in silenced \
+                and not _is_covered(model, 'deleted'):
+            if supports_partial_indexes():
+                hint = ("Add models.Index(fields=['deleted'], "
+                        "condition=models.Q(deleted__isnull=False)) to "
+                        "Meta.indexes.")
+            else:
+                hint = "Add models.Index(fields=['deleted']) to Meta.indexes."
+            if is_live:
+                hint += " live_index() doesn't serve deleted()."
+            errors.append(checks.Warning(
+                "'deleted' is filtered on by deleted() and not_deleted() "
+                "but has no index.",
+                hint=hint, obj=model, id='behaviors.W003'))
+    return errors
@@ -0,0 +1,89 @@
+"""
+Columnar export of the behavior timestamps, for analytics over many rows
+without building a model instance, or a Python object, per value.
+"""
+from __future__ import unicode_literals
+
+from array import array
+from collections import OrderedDict
+
+from django.core.exceptions import FieldDoesNotExist
+
+from .compat import epoch_micros
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# The timestamp columns of Timestamped, Released and StoreDeleted.
+TIMESTAMP_FIELDS = ('created', 'modified', 'release_date', 'deleted')
+
+# Stands for NULL in the columns. It is the int64 NumPy reads as NaT.
+NULL_TIMESTAMP = -2 ** 63
+
+
+def _has_field(model, name):
+    try:
+        model._meta.get_field(name)
+    except FieldDoesNotExist:
+        return False
+    return True
+
+
+def _integer_pk(model):
+    return model._meta.pk.get_internal_type().endswith(
+        ('AutoField', 'IntegerField'))
+
+
+def _timestamp_column(values):
+    return array('q', [NULL_TIMESTAMP if value is None else epoch_micros(value)
+                       for value in values])
+
+
+def timestamp_chunks(queryset, fields=None, chunk_size=10000, as_numpy=None):
+    """
+    Yield the timestamp ``fields`` of ``queryset`` (those of
+    ``TIMESTAMP_FIELDS`` the model has by default) in chunks of at most
+    ``chunk_size`` rows, read in primary key order with keyset pagination.
+
+    Each chunk is an ``OrderedDict`` of columns, starting with ``pk``. The
+    timestamps are ``array('q')`` of microseconds since the epoch, with
+    ``NULL_TIMESTAMP`` for NULL. With NumPy (``as_numpy`` defaults to whether
+    it is installed) they are ``datetime64[us]`` arrays with NaT for NULL.
+    Integer primary keys are ``array('q')``, or ``int64`` NumPy arrays.
+    """
+    model = queryset.model
+    if fields is None:
+        fields = [name for name in TIMESTAMP_FIELDS if _has_field(model, name)]
+    if as_numpy is None:
+        as_numpy = numpy is not None
+    elif as_numpy and numpy is None:
+        raise ImportError('as_numpy needs NumPy to be installed.')
+    integer_pk = _integer_pk(model)
+
+    queryset = queryset.order_by('pk').values_list('pk', *fields)
+    last_pk = None
+    while True:
+        chunk = queryset if last_pk is None else queryset.filter(pk__gt=last_pk)
+        rows = list(chunk[:chunk_size])
+        if not rows:
+            return
+        last_pk = rows[-1][0]
+        values = list(zip(*rows))
+        pks = array('q', values[0]) if integer_pk else list(values[0])
+        columns = OrderedDict([('pk', pks)])
+        for name, column in zip(fields, values[1:]):
+            columns[name] = _timestamp_column(column)
+        # Free the rows before the chunk is used.
+        del rows, values
+        if as_numpy:
+            for name, column in columns.items():
+                if isinstance(column, array):
+                    column = numpy.frombuffer(column, dtype='int64')
+                    if name != 'pk':
+                        column = column.view('datetime64[us]')
+                columns[name] = column
+        yield columns
+        if len(columns['pk']) < chunk_size:
+            return
@@ -1,5 +1,13 @@
+import calendar
+import threading
+
 import django
 
+try:
+    string_types = (basestring,)
+except NameError:
+    string_types = (str,)
+
 
 def is_authenticated(user):
     """
@@ -12,3 +20,113 @@ def is_authenticated(user):
         return user.is_authenticated()
     else:
         return user.is_authenticated
+
+
+def supports_partial_indexes():
+    """
+    Return whether or not ``models.Index`` accepts a ``condition``, added in
+    Django 2.2.
+    """
+
+    return django.VERSION >= (2, 2)
+
+
+def alias(queryset, **expressions):
+    """
+    Add expressions usable in filters without selecting them. Falls back to
+    ``annotate()`` before ``QuerySet.alias()`` was added in Django 3.2.
+    """
+
+    if hasattr(queryset, 'alias'):
+        return queryset.alias(**expressions)
+    return queryset.annotate(**expressions)
+
+
+def is_relation_cached(instance, name):
+    """
+    Return whether or not the related object of the ``name`` foreign key is
+    already loaded on ``instance``.
+    """
+
+    field = instance._meta.get_field(name)
+    if django.VERSION < (2, 0):
+        return hasattr(instance, field.get_cache_name())
+    return field.is_cached(instance)
+
+
+def supports_bulk_update():
+    """
+    Return whether or not ``QuerySet.bulk_update()`` exists, added in Django
+    2.2.
+    """
+
+    return django.VERSION >= (2, 2)
+
+
+try:
+    # Django's async ORM runs the queries of its async methods this way too.
+    from asgiref.sync import sync_to_async
+except ImportError:
+    sync_to_async = None
+
+
+def supports_async():
+    """
+    Return whether or not ``asgiref``, installed with Django 3.0+, is there
+    to run the ORM from async code. The async methods aren't defined without
+    it.
+    """
+
+    return sync_to_async is not None
+
+
+def in_thread(func):
+    """
+    Return an awaitable calling ``func`` in the thread of the synchronous ORM
+    code, like the async ORM methods added in Django 4.1.
+    """
+
+    return sync_to_async(func)
+
+
+def epoch_micros(value):
+    """
+    Return the microseconds between the epoch and the datetime ``value``,
+    read as UTC when it is naive.
+    """
+    return calendar.timegm(value.utctimetuple()) * 10 ** 6 + value.microsecond
+
+
+try:
+    from contextvars import ContextVar
+except ImportError:
+    ContextVar = None
+
+
+class _ThreadLocalVar(object):
+    """
+    Thread local stand-in for ``ContextVar``, before Python 3.7.
+    """
+
+    def __init__(self, name, default=None):
+        self.name = name
+        self._default = default
+        self._local = threading.local()
+
+    def get(self):
+        return getattr(self._local, 'value', self._default)
+
+    def set(self, value):
+        self._local.value = value
+
+
+def context_var(name, default=None):
+    """
+    Return a ``ContextVar``, so that the value is kept per request and
+    coroutine under ASGI and not only per thread. Falls back to a thread
+    local before Python 3.7.
+    """
+
+    if ContextVar is None:
+        return _ThreadLocalVar(name, default)
+    return ContextVar(name, default=default)
@@ -0,0 +1 @@
+default_app_config = 'behaviors.counters.apps.CountersConfig'
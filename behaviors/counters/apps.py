@@ -0,0 +1,8 @@
+# -*- coding: utf-8
+from django.apps import AppConfig
+
+
+class CountersConfig(AppConfig):
+    name = 'behaviors.counters'
+    label = 'behaviors_counters'
+    verbose_name = 'Behavior counters'
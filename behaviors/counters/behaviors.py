@@ -0,0 +1,133 @@
+from __future__ import unicode_literals
+
+from collections import Counter
+
+from django.db import router, transaction
+
+from behaviors import signals
+from behaviors.behaviors import Authored, Published, StoreDeleted
+from behaviors.querysets import _author_counts
+
+
+class CountedAuthored(Authored):
+    """
+    An abstract behavior extending ``Authored`` with per-author counters,
+    kept in ``behaviors.counters`` so that ``counts_for()`` doesn't count the
+    rows. The counters are updated in the transaction of ``save()``,
+    ``delete()``, ``restore()`` and the bulk ``publish()``/``unpublish()``
+    and ``soft_delete()``/``restore()``.
+    Other bulk writes are fixed by the ``reconcile_author_counts`` command.
+    """
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def counter_attnames(cls):
+        attnames = ['author_id']
+        if issubclass(cls, Published):
+            attnames.append('publication_status')
+        if issubclass(cls, StoreDeleted):
+            attnames.append('deleted')
+        return attnames
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super(CountedAuthored, cls).from_db(db, field_names, values)
+        if all(name in instance.__dict__ for name in cls.counter_attnames()):
+            # The counter the row is counted in, moved from on the next save.
+            instance._counted_key = instance.counter_key()
+        return instance
+
+    def counter_key(self):
+        return (
+            self.author_id,
+            self.publication_status if isinstance(self, Published) else '',
+            self.deleted is not None if isinstance(self, StoreDeleted) else False,
+        )
+
+    def _stored_counter_key(self, using):
+        values = self.__class__._base_manager.using(using).filter(
+            pk=self.pk).values(*self.counter_attnames()).first()
+        if values is None:
+            return None
+        stored = self.__class__(**values)
+        return stored.counter_key()
+
+    def _saved_counter_key(self, counted_key, update_fields):
+        key = self.counter_key()
+        if counted_key is None or update_fields is None:
+            return key
+        # Values a narrowed save didn't write keep their counted value.
+        names = (('author', 'author_id'), ('publication_status',), ('deleted',))
+        return tuple(
+            new if set(field_names) & set(update_fields) else old
+            for field_names, old, new in zip(names, counted_key, key))
+
+    def _adjust_counts(self, deltas, using):
+        from .models import AuthorCount
+        AuthorCount.objects.using(using).adjust(self.__class__, deltas)
+
+    @classmethod
+    def behavior_transitioned(cls, signal, pks, using):
+        """
+        Move the counts of the ``pks`` objects, already updated by a bulk
+        transition, out of the state the transition only applies to (e.g.
+        ``publish()`` to drafts), in its transaction.
+        """
+        if signal is signals.published:
+            old_status, old_deleted = cls.DRAFT, None
+        elif signal is signals.unpublished:
+            old_status, old_deleted = cls.PUBLISHED, None
+        elif signal is signals.soft_deleted:
+            old_status, old_deleted = None, False
+        elif signal is signals.restored:
+            old_status, old_deleted = None, True
+        else:
+            return
+        from .models import AuthorCount
+        queryset = cls._base_manager.using(using).filter(pk__in=pks)
+        deltas = Counter()
+        for (author, status, deleted), count in _author_counts(queryset).items():
+            old_key = (author,
+                       status if old_status is None else old_status,
+                       deleted if old_deleted is None else old_deleted)
+            deltas[old_key] -= count
+            deltas[(author, status, deleted)] += count
+        AuthorCount.objects.using(using).adjust(cls, deltas)
+
+    def save(self, *args, **kwargs):
+        using = kwargs.get('using') or router.db_for_write(
+            self.__class__, instance=self)
+        adding = self._state.adding
+        with transaction.atomic(using=using):
+            if adding:
+                counted_key = None
+            elif '_counted_key' in self.__dict__:
+                counted_key = self._counted_key
+            else:
+                counted_key = self._stored_counter_key(using)
+            result = super(CountedAuthored, self).save(*args, **kwargs)
+            key = self._saved_counter_key(
+                counted_key, kwargs.get('update_fields'))
+            if key != counted_key:
+                deltas = Counter({key: 1})
+                if counted_key is not None:
+                    deltas[counted_key] -= 1
+                self._adjust_counts(deltas, using)
+        self._counted_key = key
+        return result
+
+    def delete(self, using=None, keep_parents=False):
+        if isinstance(self, StoreDeleted):
+            # A soft delete is a save.
+            return super(CountedAuthored, self).delete(using, keep_parents)
+        using = using or router.db_for_write(self.__class__, instance=self)
+        with transaction.atomic(using=using):
+            counted_key = self.__dict__.get('_counted_key') or \
+                self._stored_counter_key(using)
+            result = super(CountedAuthored, self).delete(using, keep_parents)
+            if counted_key is not None:
+                self._adjust_counts(Counter({counted_key: -1}), using)
+        self.__dict__.pop('_counted_key', None)
+        return result
@@ -0,0 +1,50 @@
+from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, transaction
+
+from behaviors.counters.behaviors import CountedAuthored
+from behaviors.counters.models import AuthorCount
+from behaviors.querysets import _author_counts
+
+
+class Command(BaseCommand):
+    help = ("Recount the per-author counters of CountedAuthored models and "
+            "fix the ones that drifted, e.g. after raw or bulk writes.")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'models', nargs='*', metavar='app_label.ModelName',
+            help='Models to reconcile, defaults to every CountedAuthored model.')
+        parser.add_argument(
+            '--database', default=DEFAULT_DB_ALIAS,
+            help='Database to reconcile, defaults to the "default" database.')
+
+    def handle(self, *args, **options):
+        models = [apps.get_model(label) for label in options['models']]
+        for model in models or apps.get_models():
+            if not issubclass(model, CountedAuthored) or model._meta.proxy:
+                continue
+            fixed = self.reconcile(model, options['database'])
+            self.stdout.write('%s: %d counters fixed' % (
+                model._meta.label, fixed))
+
+    def reconcile(self, model, using):
+        content_type = ContentType.objects.db_manager(
+            using).get_for_model(model)
+        with transaction.atomic(using=using):
+            actual = _author_counts(model._base_manager.using(using).all())
+            counters = AuthorCount.objects.using(using).filter(
+                content_type=content_type).select_for_update()
+            stored = dict(
+                ((author, status, deleted), count) for
+                author, status, deleted, count in counters.values_list(
+                    'author', 'publication_status', 'deleted', 'count'))
+            drifted = [key for key in set(actual) | set(stored)
+                       if actual.get(key, 0) != stored.get(key, 0)]
+            for author, status, deleted in drifted:
+                count = actual.get((author, status, deleted), 0)
+                counters.update_or_create(
+                    content_type=content_type, author_id=author, publication_status=status,
+                    deleted=deleted, defaults={'count': count})
+        return len(drifted)
@@ -0,0 +1,70 @@
+from __future__ import unicode_literals
+
+from collections import Counter
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import IntegrityError, models, transaction
+
+
+class AuthorCountQuerySet(models.QuerySet):
+
+    def adjust(self, model, deltas):
+        """
+        Add each delta of the ``deltas`` mapping, keyed by ``(author_pk,
+        publication_status, deleted)``, to the counters of ``model``.
+        """
+        content_type = ContentType.objects.db_manager(
+            self.db).get_for_model(model)
+        for (author, status, deleted), delta in deltas.items():
+            if not delta:
+                continue
+            counts = self.filter(
+                content_type=content_type, author=author,
+                publication_status=status, deleted=deleted)
+            if counts.update(count=models.F('count') + delta):
+                continue
+            try:
+                with transaction.atomic(using=self.db):
+                    counts.create(
+                        content_type=content_type, author_id=author,
+                        publication_status=status, deleted=deleted,
+                        count=delta)
+            except IntegrityError:
+                # Created concurrently since the UPDATE.
+                counts.update(count=models.F('count') + delta)
+    adjust.alters_data = True
+
+    def counts_for(self, model, author):
+        """
+        Return a ``Counter`` of the ``model`` objects of ``author`` keyed by
+        ``(publication_status, deleted)``.
+        """
+        content_type = ContentType.objects.db_manager(
+            self.db).get_for_model(model)
+        rows = self.filter(
+            content_type=content_type, author=author).exclude(
+            count=0).values_list('publication_status', 'deleted', 'count')
+        return Counter(dict(((status, deleted), count)
+                            for status, deleted, count in rows))
+
+
+class AuthorCount(models.Model):
+    """
+    The number of objects of a ``CountedAuthored`` model per author,
+    publication status (blank unless the model is ``Published``) and deleted
+    state (``False`` unless the model is ``StoreDeleted``).
+    """
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    author = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE,
+        related_name='+')
+    publication_status = models.CharField(max_length=1, blank=True)
+    deleted = models.BooleanField(default=False)
+    count = models.IntegerField(default=0)
+
+    objects = AuthorCountQuerySet.as_manager()
+
+    class Meta:
+        unique_together = (
+            ('content_type', 'author', 'publication_status', 'deleted'),)
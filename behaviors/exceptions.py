@@ -0,0 +1,8 @@
+from __future__ import unicode_literals
+
+
+class ConflictError(Exception):
+    """
+    Raised by ``Timestamped.save(check_conflicts=True)`` when the row was
+    modified since the object was loaded.
+    """
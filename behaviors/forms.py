@@ -1,15 +1,89 @@
 from django import forms
+from django.db import connections, router, transaction
+from django.forms.models import BaseModelFormSet
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.utils.text import capfirst
 
-from .compat import is_authenticated
+from . import signals
+from .behaviors import Authored, Editored, Slugged, Timestamped
+from .cache import invalidate_status_counts
+from .compat import is_authenticated, supports_bulk_update
+from .exceptions import ConflictError
+from .querysets import _is_counted
 
 
-class AuthoredModelForm(forms.ModelForm):
+class ConflictCheckMixin(object):
+    """
+    Carries the ``modified`` value of a ``Timestamped`` instance through a
+    hidden field. The form doesn't validate when the row was modified since,
+    and saves with ``check_conflicts=True`` so that an edit made between
+    validating and saving isn't overwritten either: ``save()`` then adds the
+    conflict to the form's non field errors and raises ``ConflictError``,
+    without saving the many-to-many data.
+    """
+    check_conflicts = False
+    conflict_field_name = 'modified_token'
+
+    def _init_conflict_field(self):
+        if not self._checks_conflicts():
+            return
+        modified = self.instance.modified
+        self.fields[self.conflict_field_name] = forms.CharField(
+            widget=forms.HiddenInput, required=False,
+            initial=modified.isoformat() if modified else '')
+
+    def _checks_conflicts(self):
+        if not self.check_conflicts or self.instance.pk is None:
+            return False
+        return hasattr(self.instance, '_loaded_modified')
+
+    def clean(self):
+        cleaned_data = super(ConflictCheckMixin, self).clean()
+        if not self._checks_conflicts() or \
+                self.add_prefix(self.conflict_field_name) not in self.data:
+            return cleaned_data
+        token = cleaned_data.get(self.conflict_field_name)
+        try:
+            expected = parse_datetime(token) if token else None
+        except ValueError:
+            # Well formed but impossible, such as February 30th.
+            expected = None
+        if token and expected is None:
+            self.add_error(self.conflict_field_name, 'Invalid modification token.')
+            return cleaned_data
+        self._expected_modified = expected
+        model = self.instance.__class__
+        modified = model._base_manager.filter(pk=self.instance.pk).values_list(
+            'modified', flat=True).first()
+        if modified != expected:
+            self.add_error(None, '%s was modified since it was loaded.' %
+                           capfirst(self.instance._meta.verbose_name))
+        return cleaned_data
+
+    def _save_instance(self, obj, update_fields=None):
+        if not self._checks_conflicts():
+            obj.save(update_fields=update_fields)
+            return
+        if '_expected_modified' in self.__dict__:
+            obj._loaded_modified = self._expected_modified
+        try:
+            obj.save(check_conflicts=True, update_fields=update_fields)
+        except ConflictError as error:
+            # The row was modified after the form validated: show the error
+            # when the caller renders the form again.
+            self.add_error(None, str(error))
+            raise
+
+
+class AuthoredModelForm(ConflictCheckMixin, forms.ModelForm):
     class Meta:
         fields = []
 
     def __init__(self, request=None, *args, **kwargs):
         self.request = request
         super(AuthoredModelForm, self).__init__(*args, **kwargs)
+        self._init_conflict_field()
 
     def save(self, commit=True):
         obj = super(AuthoredModelForm, self).save(commit=False)
@@ -17,26 +91,190 @@ class AuthoredModelForm(forms.ModelForm):
         if self.request is not None and is_authenticated(self.request.user):
             if not obj.pk:
                 obj.author = self.request.user
+                if hasattr(obj, 'sync_author_name'):
+                    obj.sync_author_name()
 
         if commit:
-            obj.save()
+            self._save_instance(obj)
         return obj
 
 
-class EditoredModelForm(forms.ModelForm):
+class EditoredModelForm(ConflictCheckMixin, forms.ModelForm):
     class Meta:
         fields = []
 
     def __init__(self, request=None, *args, **kwargs):
         self.request = request
         super(EditoredModelForm, self).__init__(*args, **kwargs)
+        self._init_conflict_field()
+        self._initial_editor_id = self.instance.editor_id
+
+    def _update_fields(self, obj):
+        """
+        Return the model fields changed by the form, and the editor when it
+        was reassigned. ``Timestamped`` adds ``modified`` itself.
+        """
+        model_fields = set(field.name for field in obj._meta.concrete_fields
+                           if not field.primary_key)
+        update_fields = [name for name in self.changed_data
+                         if name in model_fields]
+        if obj.editor_id != self._initial_editor_id:
+            update_fields.append('editor')
+            if hasattr(obj, 'editor_name'):
+                update_fields.append('editor_name')
+        return update_fields
 
     def save(self, commit=True):
         obj = super(EditoredModelForm, self).save(commit=False)
 
         if self.request is not None and is_authenticated(self.request.user):
             obj.editor = self.request.user
+            if hasattr(obj, 'sync_editor_name'):
+                obj.sync_editor_name()
 
         if commit:
-            obj.save()
+            if obj._state.adding:
+                self._save_instance(obj)
+            else:
+                # Only the changed columns are written, and nothing at all
+                # when the form didn't change anything.
+                update_fields = self._update_fields(obj)
+                if update_fields:
+                    self._save_instance(obj, update_fields=update_fields)
+            self.save_m2m()
         return obj
+
+
+class BehaviorModelFormSet(BaseModelFormSet):
+    """
+    Model formset stamping ``author`` on new objects and ``editor`` on every
+    saved object from ``request.user``, like ``AuthoredModelForm`` and
+    ``EditoredModelForm`` (which receive the request), and saving the new
+    objects with a single ``bulk_create()`` and the changed ones with a
+    single ``bulk_update()``. Slugs and ``modified`` are assigned in bulk.
+
+    Like the bulk methods, this doesn't call ``save()`` or send the
+    ``pre_save`` and ``post_save`` signals. Objects are saved one by one
+    instead for multi-table inheritance, ``CountedAuthored`` models and
+    conflict checking forms, and new objects are when the database can't
+    return the primary keys of a bulk insert.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.request = kwargs.pop('request', None)
+        super(BehaviorModelFormSet, self).__init__(*args, **kwargs)
+
+    def get_form_kwargs(self, index):
+        kwargs = super(BehaviorModelFormSet, self).get_form_kwargs(index)
+        if issubclass(self.form, (AuthoredModelForm, EditoredModelForm)):
+            kwargs.setdefault('request', self.request)
+        return kwargs
+
+    def _stamp(self, obj):
+        if self.request is None or not is_authenticated(self.request.user):
+            return
+        if isinstance(obj, Authored) and obj.pk is None:
+            obj.author = self.request.user
+            if hasattr(obj, 'sync_author_name'):
+                obj.sync_author_name()
+        if isinstance(obj, Editored):
+            obj.editor = self.request.user
+            if hasattr(obj, 'sync_editor_name'):
+                obj.sync_editor_name()
+
+    def _save_form(self, form, commit):
+        obj = form.save(commit=False)
+        self._stamp(obj)
+        if commit:
+            if isinstance(form, ConflictCheckMixin):
+                form._save_instance(obj)
+            else:
+                obj.save()
+            form.save_m2m()
+        return obj
+
+    def save_new(self, form, commit=True):
+        return self._save_form(form, commit)
+
+    def save_existing(self, form, instance, commit=True):
+        return self._save_form(form, commit)
+
+    def _saves_in_bulk(self):
+        if not supports_bulk_update() or self.model._meta.parents:
+            return False
+        if getattr(self.form, 'check_conflicts', False):
+            return False
+        # Historied models record the changes of each save().
+        historied = hasattr(self.model, 'history_attnames')
+        return not (_is_counted(self.model) or historied)
+
+    def save(self, commit=True):
+        if not commit or not self._saves_in_bulk():
+            return super(BehaviorModelFormSet, self).save(commit)
+
+        using = router.db_for_write(self.model)
+        with transaction.atomic(using=using):
+            self.saved_forms = []
+            changed_objects = self.save_existing_objects(commit=False)
+            new_objects = self.save_new_objects(commit=False)
+            for obj in self.deleted_objects:
+                obj.delete()
+            self._bulk_update(changed_objects, using)
+            self._bulk_create(new_objects, using)
+            for form in self.saved_forms:
+                form.save_m2m()
+        return changed_objects + new_objects
+
+    def _assign_slugs(self, objs, using):
+        # Return the objects that got a slug, to send slug_assigned for.
+        if not issubclass(self.model, Slugged):
+            return []
+        assigned = [obj for obj in objs if not obj.slug]
+        if assigned:
+            self.model.assign_slugs(assigned, using)
+        return assigned
+
+    def _send_slug_assigned(self, objs, using):
+        if objs and signals.slug_assigned.has_listeners(self.model):
+            signals.send_on_commit(signals.slug_assigned, self.model,
+                                   [obj.pk for obj in objs], using)
+
+    def _bulk_create(self, objs, using):
+        if not objs:
+            return
+        assigned = self._assign_slugs(objs, using)
+        if not connections[using].features.can_return_rows_from_bulk_insert:
+            for obj in objs:
+                obj.save(using=using)
+        else:
+            self.model._base_manager.db_manager(using).bulk_create(objs)
+            invalidate_status_counts(self.model, using)
+        self._send_slug_assigned(assigned, using)
+
+    def _bulk_update(self, objs, using):
+        if not objs:
+            return
+        model_fields = set(field.name for field in self.model._meta.concrete_fields
+                           if not field.primary_key)
+        fields = set()
+        for obj, changed_data in self.changed_objects:
+            fields.update(model_fields.intersection(changed_data))
+        if issubclass(self.model, Editored) and self.request is not None:
+            fields.update(model_fields.intersection(['editor', 'editor_name']))
+        assigned = self._assign_slugs(objs, using)
+        if assigned:
+            fields.add('slug')
+        if issubclass(self.model, Timestamped):
+            now = timezone.now()
+            for obj in objs:
+                obj.modified = now
+                obj.__dict__.pop('is_changed', None)
+            fields.add('modified')
+        if fields:
+            self.model._base_manager.db_manager(using).bulk_update(
+                objs, sorted(fields))
+            invalidate_status_counts(self.model, using)
+        self._send_slug_assigned(assigned, using)
+        for obj in objs:
+            if '_loaded_modified' in obj.__dict__:
+                obj._loaded_modified = obj.modified
@@ -0,0 +1 @@
+default_app_config = 'behaviors.history.apps.HistoryConfig'
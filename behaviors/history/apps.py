@@ -0,0 +1,8 @@
+# -*- coding: utf-8
+from django.apps import AppConfig
+
+
+class HistoryConfig(AppConfig):
+    name = 'behaviors.history'
+    label = 'behaviors_history'
+    verbose_name = 'Behavior history'
@@ -0,0 +1,113 @@
+from __future__ import unicode_literals
+
+from django.db import models, router
+
+from behaviors.behaviors import StoreDeleted
+
+from .buffer import entry, record
+from .querysets import HistoriedQuerySet
+
+
+class Historied(models.Model):
+    """
+    An abstract behavior recording the changes of its objects in
+    ``behaviors.history``. The changes of ``save()``, soft deletes and
+    restores, and ``HistoriedQuerySet`` updates and deletes are buffered and
+    written with one ``bulk_create()`` when the transaction commits.
+    """
+    # Fields whose changes are not recorded.
+    history_excluded_fields = ('created', 'modified')
+
+    # Combined by ``BehaviorManager`` with the querysets of the other
+    # behaviors.
+    behavior_querysets = (HistoriedQuerySet,)
+
+    objects = HistoriedQuerySet.as_manager()
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def history_attnames(cls):
+        excluded = set(cls.history_excluded_fields)
+        excluded.add(cls._meta.pk.name)
+        return [field.attname for field in cls._meta.concrete_fields
+                if field.name not in excluded]
+
+    @classmethod
+    def history_action(cls, changes):
+        """
+        Return the action of an update changing ``changes``.
+        """
+        if issubclass(cls, StoreDeleted) and 'deleted' in changes:
+            return 'r' if changes['deleted'][1] is None else 'd'
+        return 'u'
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super(Historied, cls).from_db(db, field_names, values)
+        # The values the next save records the changes from.
+        instance._history_values = instance._current_history_values(
+            cls.history_attnames())
+        return instance
+
+    def _current_history_values(self, attnames):
+        return dict((attname, self.__dict__[attname])
+                    for attname in attnames if attname in self.__dict__)
+
+    def _stored_history_values(self, using):
+        attnames = self.history_attnames()
+        values = self.__class__._base_manager.using(using).filter(
+            pk=self.pk).values_list(*attnames).first()
+        return dict(zip(attnames, values or ()))
+
+    def _saved_history_attnames(self, update_fields):
+        if update_fields is None:
+            return self.history_attnames()
+        update_fields = set(update_fields)
+        saved = [field.attname for field in self._meta.concrete_fields
+                 if update_fields.intersection([field.name, field.attname])]
+        return [attname for attname in self.history_attnames() if attname in saved]
+
+    def save(self, *args, **kwargs):
+        using = kwargs.get('using') or router.db_for_write(
+            self.__class__, instance=self)
+        adding = self._state.adding
+        if adding:
+            old = {}
+        elif '_history_values' in self.__dict__:
+            old = self._history_values
+        else:
+            old = self._stored_history_values(using)
+        result = super(Historied, self).save(*args, **kwargs)
+
+        new = self._current_history_values(
+            self._saved_history_attnames(kwargs.get('update_fields')))
+        changes = dict((attname, [old.get(attname), value])
+                       for attname, value in new.items()
+                       if adding or old.get(attname) != value)
+        if changes:
+            action = 'c' if adding else self.history_action(changes)
+            record(using, [entry(self.__class__, self.pk, action, changes,
+                                 getattr(self, 'editor_id', None), using)])
+        self._history_values = dict(old, **new)
+        return result
+
+    def delete(self, using=None, keep_parents=False):
+        if isinstance(self, StoreDeleted):
+            # A soft delete is a save.
+            return super(Historied, self).delete(using, keep_parents)
+        using = using or router.db_for_write(self.__class__, instance=self)
+        pk = self.pk
+        result = super(Historied, self).delete(using, keep_parents)
+        record(using, [entry(self.__class__, pk, 'd',
+                             editor_id=getattr(self, 'editor_id', None),
+                             using=using)])
+        return result
+
+    def history(self):
+        """
+        Return the history entries of the object, latest first.
+        """
+        from .models import HistoryEntry
+        return HistoryEntry.objects.history_for(self)
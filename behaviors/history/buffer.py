@@ -0,0 +1,89 @@
+"""
+Per-transaction buffers of history entries, written with a single
+``bulk_create()`` when the transaction commits.
+
+Entries are buffered per savepoint, each buffer having its own
+``on_commit()`` hook, so rolling a savepoint back discards its entries along
+with the hook. Outside of a transaction, entries are written right away.
+"""
+from __future__ import unicode_literals
+
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections, transaction
+
+from behaviors.compat import context_var
+
+# The buffers of the context (a thread, or an asyncio task) per database, like
+# its connections.
+_buffers_var = context_var('behaviors_history_buffers')
+
+
+def entry(model, pk, action, changes=None, editor_id=None, using=None):
+    """
+    Return an unsaved ``HistoryEntry`` of the ``model`` object ``pk``.
+    """
+    from django.contrib.contenttypes.models import ContentType
+    from .models import HistoryEntry
+    content_type = ContentType.objects.db_manager(using).get_for_model(model)
+    return HistoryEntry(
+        content_type=content_type, object_id=str(pk), action=action,
+        changes=json.dumps(changes or {}, cls=DjangoJSONEncoder, sort_keys=True),
+        editor_id=editor_id)
+
+
+def _write(using, entries):
+    from .models import HistoryEntry
+    HistoryEntry.objects.using(using).bulk_create(entries)
+
+
+class _Buffer(object):
+
+    def __init__(self, using, key):
+        self.using = using
+        self.key = key
+        self.entries = []
+
+    def flush(self):
+        buffers = _buffers(self.using)
+        if buffers.get(self.key) is self:
+            del buffers[self.key]
+        entries, self.entries = self.entries, []
+        if entries:
+            _write(self.using, entries)
+
+
+def _buffers(using):
+    buffers = _buffers_var.get()
+    if buffers is None:
+        buffers = {}
+        _buffers_var.set(buffers)
+    return buffers.setdefault(using, {})
+
+
+def _is_scheduled(connection, buffer):
+    return any(hook[1] == buffer.flush for hook in connection.run_on_commit)
+
+
+def record(using, entries):
+    """
+    Write ``entries`` when the current transaction of ``using`` commits.
+    """
+    if not entries:
+        return
+    connection = connections[using]
+    if not connection.in_atomic_block:
+        _write(using, entries)
+        return
+    key = tuple(connection.savepoint_ids)
+    buffers = _buffers(using)
+    buffer = buffers.get(key)
+    if buffer is None or not _is_scheduled(connection, buffer):
+        # Forget the buffers of rolled back transactions and savepoints.
+        for stale_key, stale in list(buffers.items()):
+            if not _is_scheduled(connection, stale):
+                del buffers[stale_key]
+        buffer = buffers[key] = _Buffer(using, key)
+        transaction.on_commit(buffer.flush, using=using)
+    buffer.entries.extend(entries)
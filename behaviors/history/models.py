@@ -0,0 +1,62 @@
+from __future__ import unicode_literals
+
+import json
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.db import models
+from django.utils import timezone
+
+
+class HistoryEntryQuerySet(models.QuerySet):
+
+    def history_for(self, obj):
+        """
+        Return the entries of ``obj``, latest first, served by the
+        ``(content_type, object_id, created)`` index.
+        """
+        content_type = ContentType.objects.db_manager(
+            self.db).get_for_model(obj.__class__)
+        return self.filter(
+            content_type=content_type, object_id=str(obj.pk)).order_by(
+            '-created', '-pk')
+
+
+class HistoryEntry(models.Model):
+    """
+    A change of a ``Historied`` object: its creation, the old and new values
+    of the fields an update changed, or its (soft) deletion or restoration.
+    """
+    CREATED = 'c'
+    UPDATED = 'u'
+    DELETED = 'd'
+    RESTORED = 'r'
+    ACTION_CHOICES = (
+        (CREATED, 'Created'),
+        (UPDATED, 'Updated'),
+        (DELETED, 'Deleted'),
+        (RESTORED, 'Restored'),
+    )
+
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE)
+    object_id = models.CharField(max_length=255)
+    action = models.CharField(max_length=1, choices=ACTION_CHOICES)
+    # JSON mapping of each changed attname to its [old, new] values.
+    changes = models.TextField(blank=True)
+    editor = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL,
+        related_name='+', blank=True, null=True)
+    created = models.DateTimeField(default=timezone.now)
+
+    objects = HistoryEntryQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['content_type', 'object_id', 'created'],
+                         name='behaviors_history_object'),
+        ]
+        verbose_name_plural = 'history entries'
+
+    @property
+    def diff(self):
+        return json.loads(self.changes) if self.changes else {}
@@ -0,0 +1,83 @@
+from __future__ import unicode_literals
+
+from collections import Counter
+
+from django.db import router, transaction
+
+from behaviors.querysets import BehaviorQuerySet, _pk_batches
+
+from .buffer import entry, record
+
+
+class HistoriedQuerySet(BehaviorQuerySet):
+    """
+    QuerySet for ``Historied`` models recording the changes of ``update()``,
+    and so of the bulk transitions, and of ``delete()``.
+    """
+
+    def _history_using(self):
+        return self._db or router.db_for_write(self.model, **self._hints)
+
+    def update(self, **kwargs):
+        """
+        Update the rows and record the fields each one changed. The rows are
+        locked, and their old and new values read with a SELECT before and
+        after the UPDATE, in batches of at most ``TRANSITION_BATCH_SIZE``.
+        """
+        fields = [field for field in self.model._meta.concrete_fields
+                  if field.name in kwargs or field.attname in kwargs]
+        historied = set(self.model.history_attnames())
+        attnames = [field.attname for field in fields if field.attname in historied]
+        if not attnames:
+            return super(HistoriedQuerySet, self).update(**kwargs)
+
+        using = self._history_using()
+        editor = kwargs.get('editor_id', kwargs.get('editor'))
+        editor = getattr(editor, 'pk', editor)
+        rows = 0
+        with transaction.atomic(using=using):
+            pks = list(self.using(using).select_for_update().values_list(
+                'pk', flat=True))
+            for batch in _pk_batches(using, pks):
+                batch_qs = self.using(using).filter(pk__in=batch)
+                old = dict((row[0], row[1:]) for row in batch_qs.values_list(
+                    'pk', *attnames))
+                rows += super(HistoriedQuerySet, batch_qs).update(**kwargs)
+                new = self.model._base_manager.using(using).filter(
+                    pk__in=list(old)).values_list('pk', *attnames)
+                entries = []
+                for row in new:
+                    changes = dict(
+                        (attname, [before, after])
+                        for attname, before, after in zip(attnames, old[row[0]], row[1:])
+                        if before != after)
+                    if changes:
+                        entries.append(entry(
+                            self.model, row[0], self.model.history_action(changes),
+                            changes, editor, using))
+                record(using, entries)
+        return rows
+    update.alters_data = True
+
+    def delete(self):
+        """
+        Delete the rows and record their deletion, in batches of at most
+        ``TRANSITION_BATCH_SIZE``.
+        """
+        using = self._history_using()
+        deleted, per_model = 0, Counter()
+        with transaction.atomic(using=using):
+            pks = list(self.using(using).select_for_update().values_list(
+                'pk', flat=True))
+            for batch in _pk_batches(using, pks):
+                result = super(HistoriedQuerySet, self.using(using).filter(
+                    pk__in=batch)).delete()
+                record(using, [entry(self.model, pk, 'd', using=using)
+                               for pk in batch])
+                if result is not None:
+                    # Django 1.8 doesn't count the deleted objects.
+                    deleted += result[0]
+                    per_model.update(result[1])
+        return deleted, dict(per_model)
+    delete.alters_data = True
+    delete.queryset_only = True
@@ -0,0 +1,23 @@
+from __future__ import unicode_literals
+
+from django.db import models
+
+from .compat import supports_partial_indexes
+
+
+def live_index(name):
+    """
+    Return the index serving ``LiveQuerySet.live()`` for models combining the
+    ``Published``, ``Released`` and ``StoreDeleted`` behaviors. Add it to the
+    model's ``Meta.indexes``.
+
+    The index is partial on ``deleted IS NULL`` since Django 2.2, before it
+    ``deleted`` leads a plain composite index.
+    """
+    if supports_partial_indexes():
+        return models.Index(
+            fields=['publication_status', 'release_date'],
+            condition=models.Q(deleted__isnull=True),
+            name=name)
+    return models.Index(
+        fields=['deleted', 'publication_status', 'release_date'], name=name)
@@ -0,0 +1,219 @@
+"""
+Opt-in counters and latency histograms of the queries issued by the behavior
+methods, per model, behavior and method.
+
+Instrumented methods check a single flag when instrumentation is off. When it
+is on, the queries they run (and, for queryset methods, the queries of the
+querysets they return) are timed through ``connection.execute_wrapper()``.
+"""
+from __future__ import unicode_literals
+
+import functools
+import threading
+import types
+from contextlib import contextmanager
+
+from django.db import connections
+from django.db.models.query import QuerySet
+
+from .compat import context_var
+
+try:
+    from time import perf_counter as timer
+except ImportError:
+    from time import time as timer
+
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+_enabled = False
+# The tags of the enclosing tagged() blocks, per thread and coroutine.
+_tags = context_var('behaviors_instrumentation_tags', ())
+_lock = threading.Lock()
+_metrics = {}
+
+
+def enable():
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def is_enabled():
+    return _enabled
+
+
+def reset():
+    with _lock:
+        _metrics.clear()
+
+
+class Metric(object):
+    """
+    Number, total duration and latency histogram of the queries of one
+    ``(model, behavior, method)``.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.time = 0.0
+        self.buckets = [0] * len(BUCKETS)
+
+    def observe(self, duration):
+        self.count += 1
+        self.time += duration
+        for index, bound in enumerate(BUCKETS):
+            if duration <= bound:
+                self.buckets[index] += 1
+                break
+
+
+def get_metrics():
+    """
+    Return a copy of the metrics as ``{(model, behavior, method): {'count',
+    'time', 'buckets'}}``, the buckets being cumulative counts per ``BUCKETS``
+    upper bound.
+    """
+    with _lock:
+        metrics = {}
+        for key, metric in _metrics.items():
+            cumulative, total = [], 0
+            for count in metric.buckets:
+                total += count
+                cumulative.append(total)
+            metrics[key] = {
+                'count': metric.count,
+                'time': metric.time,
+                'buckets': cumulative,
+            }
+        return metrics
+
+
+def _record(execute, sql, params, many, context):
+    tags = _tags.get()
+    start = timer()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration = timer() - start
+        with _lock:
+            for tag in tags:
+                metric = _metrics.get(tag)
+                if metric is None:
+                    metric = _metrics[tag] = Metric()
+                metric.observe(duration)
+
+
+@contextmanager
+def tagged(tags):
+    """
+    Attribute the queries run in the block to each of the ``(model, behavior,
+    method)`` ``tags``, on top of the tags of enclosing blocks.
+    """
+    outer = _tags.get()
+    _tags.set(outer + tuple(tag for tag in tags if tag not in outer))
+    try:
+        if outer:
+            yield
+        else:
+            # The outermost block times the queries of every connection.
+            with _wrapped(list(connections.all())):
+                yield
+    finally:
+        _tags.set(outer)
+
+
+def tagged_iterator(tags, iterator):
+    """
+    Yield the items of ``iterator``, attributing the queries run to fetch
+    each one to ``tags``. The caller's code between them isn't tagged.
+    """
+    while True:
+        with tagged(tags):
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+        yield item
+
+
+@contextmanager
+def _wrapped(connections_):
+    if not connections_:
+        yield
+        return
+    with connections_[0].execute_wrapper(_record):
+        with _wrapped(connections_[1:]):
+            yield
+
+
+def instrumented(behavior):
+    """
+    Decorate a behavior method so that, when instrumentation is enabled, its
+    queries are counted for its model, ``behavior`` and name. Querysets and
+    generators returned by the method carry the tag to their evaluation.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            if not _enabled:
+                return func(self, *args, **kwargs)
+            if isinstance(self, QuerySet):
+                model = self.model
+            elif isinstance(self, type):
+                model = self
+            else:
+                model = self.__class__
+            tag = (model._meta.label_lower, behavior, func.__name__)
+            with tagged([tag]):
+                result = func(self, *args, **kwargs)
+            if isinstance(result, QuerySet) and hasattr(result, '_behavior_tags'):
+                if tag not in result._behavior_tags:
+                    result._behavior_tags += (tag,)
+            elif isinstance(result, types.GeneratorType):
+                # Generators, like timestamp_chunks(), query as they are
+                # consumed.
+                result = tagged_iterator([tag], result)
+            return result
+        return wrapper
+    return decorator
+
+
+def _label(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def prometheus_text():
+    """
+    Return the metrics in the Prometheus text exposition format.
+    """
+    lines = [
+        '# HELP behaviors_queries_total Queries issued by behavior methods.',
+        '# TYPE behaviors_queries_total counter',
+    ]
+    metrics = sorted(get_metrics().items())
+    labels = {}
+    for key, metric in metrics:
+        labels[key] = 'model="%s",behavior="%s",method="%s"' % tuple(
+            _label(part) for part in key)
+        lines.append('behaviors_queries_total{%s} %d' % (
+            labels[key], metric['count']))
+    lines.extend([
+        '# HELP behaviors_query_duration_seconds Duration of the queries '
+        'issued by behavior methods.',
+        '# TYPE behaviors_query_duration_seconds histogram',
+    ])
+    for key, metric in metrics:
+        for bound, count in zip(BUCKETS, metric['buckets']):
+            lines.append('behaviors_query_duration_seconds_bucket{%s,le="%s"} %d' % (
+                labels[key], bound, count))
+        lines.append('behaviors_query_duration_seconds_bucket{%s,le="+Inf"} %d' % (
+            labels[key], metric['count']))
+        lines.append('behaviors_query_duration_seconds_sum{%s} %r' % (
+            labels[key], metric['time']))
+        lines.append('behaviors_query_duration_seconds_count{%s} %d' % (
+            labels[key], metric['count']))
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,56 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+
+from behaviors.behaviors import NamedAuthored, NamedEditored
+from behaviors.querysets import AuthoredQuerySet, EditoredQuerySet
+
+
+class Command(BaseCommand):
+    help = ("Refresh the denormalized author_name and editor_name columns of "
+            "NamedAuthored and NamedEditored models in chunks.")
+
+    people = (
+        ('author', NamedAuthored, AuthoredQuerySet),
+        ('editor', NamedEditored, EditoredQuerySet),
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'models', nargs='*', metavar='app_label.ModelName',
+            help='Models to refresh, defaults to every model with the behaviors.')
+        parser.add_argument(
+            '--user', dest='users', action='append', default=[],
+            help='Only refresh the rows of this user pk, e.g. after a rename. '
+                 'Can be repeated.')
+        parser.add_argument(
+            '--chunk-size', type=int, default=1000,
+            help='Number of rows updated per query.')
+
+    def handle(self, *args, **options):
+        models = [apps.get_model(label) for label in options['models']]
+        for model in models or apps.get_models():
+            for field, behavior, queryset_class in self.people:
+                if not issubclass(model, behavior):
+                    continue
+                queryset = queryset_class(model)
+                if options['users']:
+                    queryset = queryset.filter(
+                        **{'%s__in' % field: options['users']})
+                updated = self.sync(
+                    queryset, field, options['chunk_size'])
+                self.stdout.write('%s.%s_name: %d rows updated' % (
+                    model._meta.label, field, updated))
+
+    def sync(self, queryset, field, chunk_size):
+        sync_names = 'sync_%s_names' % field
+        updated = 0
+        last_pk = None
+        while True:
+            chunk = queryset.order_by('pk')
+            if last_pk is not None:
+                chunk = chunk.filter(pk__gt=last_pk)
+            pks = list(chunk.values_list('pk', flat=True)[:chunk_size])
+            if not pks:
+                return updated
+            updated += getattr(queryset.filter(pk__in=pks), sync_names)()
+            last_pk = pks[-1]
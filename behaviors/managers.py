@@ -2,12 +2,26 @@ from __future__ import unicode_literals
 
 from django.db import models
 
-from .querysets import (AuthoredQuerySet, EditoredQuerySet,
+from .compat import supports_async
+from .querysets import (AuthoredQuerySet, EditoredQuerySet, LiveQuerySet,
                         PublishedQuerySet, ReleasedQuerySet,
-                        StoreDeletedQuerySet)
+                        StoreDeletedQuerySet, TimestampedQuerySet,
+                        behavior_queryset_class)
 
 
-class AuthoredManager(models.Manager):
+class BaseBehaviorManager(models.Manager):
+
+    def with_states(self, now=None):
+        return self.get_queryset().with_states(now)
+
+    def as_records(self, *fields, **kwargs):
+        return self.get_queryset().as_records(*fields, **kwargs)
+
+    def timestamp_chunks(self, fields=None, chunk_size=10000, as_numpy=None):
+        return self.get_queryset().timestamp_chunks(fields, chunk_size, as_numpy)
+
+
+class AuthoredManager(BaseBehaviorManager):
 
     def get_queryset(self):
         return AuthoredQuerySet(self.model, using=self._db)
@@ -15,8 +29,14 @@ class AuthoredManager(models.Manager):
     def authored_by(self, author):
         return self.get_queryset().authored_by(author)
 
+    def authored_by_prefix(self, prefix):
+        return self.get_queryset().authored_by_prefix(prefix)
+
+    def with_people(self, fields=('username',)):
+        return self.get_queryset().with_people(fields)
 
-class EditoredManager(models.Manager):
+
+class EditoredManager(BaseBehaviorManager):
 
     def get_queryset(self):
         return EditoredQuerySet(self.model, using=self._db)
@@ -24,8 +44,14 @@ class EditoredManager(models.Manager):
     def edited_by(self, editor):
         return self.get_queryset().edited_by(editor)
 
+    def edited_by_prefix(self, prefix):
+        return self.get_queryset().edited_by_prefix(prefix)
+
+    def with_people(self, fields=('username',)):
+        return self.get_queryset().with_people(fields)
+
 
-class PublishedManager(models.Manager):
+class PublishedManager(BaseBehaviorManager):
 
     def get_queryset(self):
         return PublishedQuerySet(self.model, using=self._db)
@@ -36,8 +62,27 @@ class PublishedManager(models.Manager):
     def published(self):
         return self.get_queryset().published()
 
+    def publish(self):
+        return self.get_queryset().publish()
+
+    def unpublish(self):
+        return self.get_queryset().unpublish()
+
+    def status_counts(self):
+        return self.get_queryset().status_counts()
 
-class ReleasedManager(models.Manager):
+    if supports_async():
+        def apublish(self):
+            return self.get_queryset().apublish()
+
+        def aunpublish(self):
+            return self.get_queryset().aunpublish()
+
+        def astatus_counts(self):
+            return self.get_queryset().astatus_counts()
+
+
+class ReleasedManager(BaseBehaviorManager):
 
     def get_queryset(self):
         return ReleasedQuerySet(self.model, using=self._db)
@@ -51,8 +96,30 @@ class ReleasedManager(models.Manager):
     def no_release_date(self):
         return self.get_queryset().no_release_date()
 
+    def release_on(self, date=None):
+        return self.get_queryset().release_on(date)
+
+    def unrelease(self):
+        return self.get_queryset().unrelease()
+
+    if supports_async():
+        def arelease_on(self, date=None):
+            return self.get_queryset().arelease_on(date)
+
+        def aunrelease(self):
+            return self.get_queryset().aunrelease()
+
+
+class TimestampedManager(BaseBehaviorManager):
+
+    def get_queryset(self):
+        return TimestampedQuerySet(self.model, using=self._db)
 
-class StoreDeletedManager(models.Manager):
+    def last_modified(self):
+        return self.get_queryset().last_modified()
+
+
+class StoreDeletedManager(BaseBehaviorManager):
 
     def _get_base_queryset(self):
         return StoreDeletedQuerySet(self.model, using=self._db)
@@ -68,3 +135,69 @@ class StoreDeletedManager(models.Manager):
 
     def allow_deleted(self):
         return self._get_base_queryset().allow_deleted()
+
+    def soft_delete(self):
+        return self.get_queryset().soft_delete()
+
+    def restore(self):
+        return self._get_base_queryset().restore()
+
+    if supports_async():
+        def asoft_delete(self):
+            return self.get_queryset().asoft_delete()
+
+        def arestore(self):
+            return self._get_base_queryset().arestore()
+
+
+class LiveManager(PublishedManager, ReleasedManager, StoreDeletedManager):
+
+    def _get_base_queryset(self):
+        return LiveQuerySet(self.model, using=self._db)
+
+    def get_queryset(self):
+        return self._get_base_queryset().get_queryset()
+
+    def live(self):
+        return self._get_base_queryset().live()
+
+
+class BehaviorManager(BaseBehaviorManager):
+    """
+    Manager for models combining several behaviors. Its queryset combines the
+    querysets of every behavior of the model (and ``queryset_classes``, if
+    given), and its methods are available on the manager. Deleted objects of
+    ``StoreDeleted`` models are filtered out, except by ``deleted()``,
+    ``allow_deleted()`` and ``restore()``.
+    """
+    unfiltered_methods = ('deleted', 'not_deleted', 'allow_deleted', 'restore',
+                          'arestore')
+
+    def __init__(self, *queryset_classes):
+        super(BehaviorManager, self).__init__()
+        self.queryset_classes = queryset_classes
+
+    def _get_base_queryset(self):
+        queryset_class = behavior_queryset_class(
+            self.model, *self.queryset_classes)
+        return queryset_class(self.model, using=self._db, hints=self._hints)
+
+    def get_queryset(self):
+        queryset = self._get_base_queryset()
+        if isinstance(queryset, StoreDeletedQuerySet):
+            return queryset.get_queryset()
+        return queryset
+
+    def __getattr__(self, name):
+        # Like ``Manager.from_queryset()``, but the queryset class is only
+        # known once the manager is bound to a concrete model.
+        model = self.__dict__.get('model')
+        if name.startswith('_') or model is None or model._meta.abstract:
+            raise AttributeError(name)
+        queryset_class = behavior_queryset_class(model, *self.queryset_classes)
+        method = getattr(queryset_class, name, None)
+        if not callable(method) or getattr(method, 'queryset_only', False):
+            raise AttributeError(name)
+        if name in self.unfiltered_methods:
+            return getattr(self._get_base_queryset(), name)
+        return getattr(self.get_queryset(), name)
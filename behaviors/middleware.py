@@ -0,0 +1,38 @@
+from django.http import HttpResponse
+
+try:
+    from django.utils.deprecation import MiddlewareMixin
+except ImportError:
+    MiddlewareMixin = object
+
+from .apps import BehaviorsConfig
+from .instrumentation import prometheus_text
+from .routers import unpin
+
+
+class BehaviorMetricsMiddleware(MiddlewareMixin):
+    """
+    Serve the behavior instrumentation metrics in the Prometheus text format
+    at ``BEHAVIORS_METRICS_PATH``. Restrict access to that path to your
+    scrapers.
+    """
+
+    def process_request(self, request):
+        if request.path != BehaviorsConfig.metrics_path():
+            return None
+        return HttpResponse(
+            prometheus_text(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+class PrimaryPinningMiddleware(MiddlewareMixin):
+    """
+    Reset ``BehaviorRouter`` pinning at the start and end of every request, so
+    the behavior reads of a request go to a replica until it writes.
+    """
+
+    def process_request(self, request):
+        unpin()
+
+    def process_response(self, request, response):
+        unpin()
+        return response
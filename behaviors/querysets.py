@@ -1,54 +1,740 @@
 from __future__ import unicode_literals
 
-from django.db import models
+import functools
+from collections import Counter, OrderedDict, namedtuple
+
+from django.core.cache import cache
+from django.db import connections, models, router, transaction
+from django.db.models.functions import Coalesce, Lower
+from django.db.models.query import ValuesListIterable
 from django.utils import timezone
 
+from . import signals
+from .apps import BehaviorsConfig
+from .cache import invalidate_status_counts, status_counts_key
+from .columns import timestamp_chunks
+from .compat import alias, in_thread, string_types, supports_async
+from .instrumentation import instrumented, tagged, tagged_iterator
+from .routers import READ_HINT, is_installed, pin
+
+
+def _is_timestamped(model):
+    from .behaviors import Timestamped
+    return issubclass(model, Timestamped)
+
+
+def _is_counted(model):
+    from .counters.behaviors import CountedAuthored
+    return issubclass(model, CountedAuthored)
+
+
+def _user_lookup(field, user):
+    """
+    Return the filter matching a user instance or pk, or an iterable (or
+    queryset) of them, on the foreign key column alone.
+    """
+    if isinstance(user, models.Model) or not hasattr(user, '__iter__'):
+        return {field: user}
+    return {'%s__in' % field: user}
+
+
+def _username_prefix(queryset, field, prefix):
+    """
+    Filter ``field``'s users whose username starts with ``prefix``, ignoring
+    case. Comparing ``LOWER(username)`` with a lower-cased prefix can be
+    served by an index on ``Lower('username')``, unlike ``istartswith``.
+    """
+    user_model = queryset.model._meta.get_field(field).related_model
+    name = '_%s_username_lower' % field
+    queryset = alias(queryset, **{name: Lower(
+        '%s__%s' % (field, user_model.USERNAME_FIELD))})
+    return queryset.filter(**{'%s__startswith' % name: prefix.lower()})
+
+
+def _user_name(queryset, field):
+    user_model = queryset.model._meta.get_field(field).related_model
+    usernames = user_model._base_manager.filter(
+        pk=models.OuterRef(field)).values(user_model.USERNAME_FIELD)[:1]
+    return Coalesce(models.Subquery(usernames), models.Value(''))
+
+
+def _sync_user_names(queryset, field):
+    """
+    Copy the current username of the ``field`` users into ``<field>_name``
+    with a single UPDATE, only touching the rows whose name is stale.
+    """
+    name_field = '%s_name' % field
+    stale = queryset.exclude(**{name_field: _user_name(queryset, field)})
+    return stale.update(**{name_field: _user_name(queryset, field)})
+
+
+def _with_people(queryset, fields):
+    """
+    Join-load whichever of the ``author`` and ``editor`` foreign keys the
+    model has, restricting the user columns to ``fields``.
+    """
+    opts = queryset.model._meta
+    field_names = set(field.name for field in opts.concrete_fields)
+    people = [name for name in ('author', 'editor') if name in field_names]
+    only = [field.name for field in opts.concrete_fields]
+    only.extend('%s__%s' % (person, field)
+                for person in people for field in fields)
+    return queryset.select_related(*people).only(*only)
+
+
+def _state_case(condition):
+    return models.Case(
+        models.When(condition, then=models.Value(True)),
+        default=models.Value(False),
+        output_field=models.BooleanField())
+
+
+def _author_counts(queryset):
+    """
+    Count the objects of ``queryset`` per ``(author_pk, publication_status,
+    deleted)`` with a single ``GROUP BY`` query. The status is blank unless
+    the model is ``Published`` and the deleted state ``False`` unless it is
+    ``StoreDeleted``.
+    """
+    from .behaviors import Published, StoreDeleted
+    model = queryset.model
+    status = models.F('publication_status') if issubclass(
+        model, Published) else models.Value('', models.CharField())
+    deleted = _state_case(models.Q(deleted__isnull=False)) if issubclass(
+        model, StoreDeleted) else models.Value(False, models.BooleanField())
+    rows = queryset.order_by().annotate(
+        _counted_status=status, _counted_deleted=deleted).values(
+        'author', '_counted_status', '_counted_deleted').annotate(
+        count=models.Count('pk')).values_list(
+        'author', '_counted_status', '_counted_deleted', 'count')
+    return Counter(dict(((author, status, deleted), count)
+                        for author, status, deleted, count in rows))
+
+
+# The most primary keys a bulk transition, or a ``HistoriedQuerySet`` update
+# or delete, processes at once.
+TRANSITION_BATCH_SIZE = 10000
+
+
+def _pk_batches(using, pks):
+    """
+    Split ``pks`` in batches of at most ``TRANSITION_BATCH_SIZE`` keys, and of
+    no more than a ``pk__in`` query of the ``using`` database takes.
+    """
+    batch_size = min(TRANSITION_BATCH_SIZE, max(
+        connections[using].ops.bulk_batch_size(['pk'], pks), 1))
+    for start in range(0, len(pks), batch_size):
+        yield pks[start:start + batch_size]
+
+
+# The instance properties of the behavior states, and the ``with_states()``
+# annotations computing them.
+STATE_PROPERTIES = {
+    'published': 'is_published',
+    'released': 'is_released',
+    'changed': 'is_changed',
+}
+
+_record_classes = {}
+
+
+def record_class(model, fields):
+    """
+    Return the namedtuple class of the ``as_records(*fields)`` rows of
+    ``model``, created once per model and fields.
+    """
+    key = (model, fields)
+    cls = _record_classes.get(key)
+    if cls is None:
+        cls = _record_classes[key] = namedtuple(
+            str('%sRecord' % model.__name__), fields)
+    return cls
+
+
+class RecordIterable(ValuesListIterable):
+    """
+    Yield the rows of an ``as_records()`` queryset as namedtuples.
+    """
+
+    def __iter__(self):
+        cls = record_class(self.queryset.model, tuple(self.queryset._fields))
+        new = tuple.__new__
+        for row in super(RecordIterable, self).__iter__():
+            yield new(cls, row)
+
+
+def replica_read(method):
+    """
+    Decorate a queryset method that only reads, hinting ``BehaviorRouter``
+    that its queries, and those of the queryset it returns, may go to a
+    replica. The queryset is left as is when ``BehaviorRouter`` isn't
+    installed.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if not self._hints.get(READ_HINT) and is_installed():
+            # Clones share their hints, so don't update them in place.
+            self = self.all()
+            self._hints = dict(self._hints, **{READ_HINT: True})
+        return method(self, *args, **kwargs)
+    return wrapper
+
+
+def _async_variant(name):
+    """
+    Return the async variant of the ``name`` queryset method, running it in a
+    single thread hop. Like the async ORM methods, it is copied to managers.
+    """
+    def method(self, *args, **kwargs):
+        return in_thread(getattr(self, name))(*args, **kwargs)
+    method.__name__ = str('a%s' % name)
+    method.__doc__ = 'Async variant of ``%s()``.' % name
+    return method
+
+
+class BehaviorQuerySet(models.QuerySet):
+    """
+    Base QuerySet for the behaviors. Behaviors add their state annotations by
+    extending ``_state_annotations``.
+    """
+
+    # The ``(model, behavior, method)`` instrumentation tags of the behavior
+    # methods that built the queryset, see ``behaviors.instrumentation``.
+    _behavior_tags = ()
+
+    # The ``timezone.now()`` values the behavior methods filtered on, left
+    # out of the ``status_counts()`` cache keys.
+    _time_bounds = ()
+
+    def _clone(self, *args, **kwargs):
+        clone = super(BehaviorQuerySet, self)._clone(*args, **kwargs)
+        clone._behavior_tags = self._behavior_tags
+        clone._time_bounds = self._time_bounds
+        return clone
+
+    def _bounded_by(self, now, queryset):
+        queryset._time_bounds = self._time_bounds + (now,)
+        return queryset
+
+    def _fetch_all(self):
+        if not self._behavior_tags:
+            return super(BehaviorQuerySet, self)._fetch_all()
+        with tagged(self._behavior_tags):
+            return super(BehaviorQuerySet, self)._fetch_all()
+
+    def iterator(self, *args, **kwargs):
+        iterator = super(BehaviorQuerySet, self).iterator(*args, **kwargs)
+        if not self._behavior_tags:
+            return iterator
+        return tagged_iterator(self._behavior_tags, iterator)
+
+    def count(self):
+        if not self._behavior_tags:
+            return super(BehaviorQuerySet, self).count()
+        with tagged(self._behavior_tags):
+            return super(BehaviorQuerySet, self).count()
+
+    def exists(self):
+        if not self._behavior_tags:
+            return super(BehaviorQuerySet, self).exists()
+        with tagged(self._behavior_tags):
+            return super(BehaviorQuerySet, self).exists()
+
+    def aggregate(self, *args, **kwargs):
+        if not self._behavior_tags:
+            return super(BehaviorQuerySet, self).aggregate(*args, **kwargs)
+        with tagged(self._behavior_tags):
+            return super(BehaviorQuerySet, self).aggregate(*args, **kwargs)
+
+    def update(self, **kwargs):
+        pin()
+        if not self._behavior_tags:
+            return super(BehaviorQuerySet, self).update(**kwargs)
+        with tagged(self._behavior_tags):
+            return super(BehaviorQuerySet, self).update(**kwargs)
+    update.alters_data = True
+
+    def delete(self):
+        pin()
+        if not self._behavior_tags:
+            return super(BehaviorQuerySet, self).delete()
+        with tagged(self._behavior_tags):
+            return super(BehaviorQuerySet, self).delete()
+    delete.alters_data = True
+    delete.queryset_only = True
+
+    def _state_annotations(self, now):
+        return {}
 
-class AuthoredQuerySet(models.QuerySet):
+    @instrumented('states')
+    @replica_read
+    def with_states(self, now=None):
+        """
+        Annotate the state of each behavior (``is_released``,
+        ``is_published``, ``is_deleted``, ``is_changed``) as SQL ``CASE``
+        expressions evaluated against a single ``now``.
+        """
+        if now is not None:
+            return self.annotate(**self._state_annotations(now))
+        now = timezone.now()
+        return self._bounded_by(
+            now, self.annotate(**self._state_annotations(now)))
 
+    @instrumented('records')
+    @replica_read
+    def as_records(self, *fields, **kwargs):
+        """
+        Return the rows as immutable namedtuples of ``fields`` (every
+        concrete field by default) read with ``values_list()``, without
+        building model instances. Fields may name behavior states, like
+        ``with_states()``'s ``is_released`` or the ``released``,
+        ``published``, ``is_deleted`` and ``changed`` properties, which are
+        computed in SQL against a single ``now``.
+        """
+        now = kwargs.pop('now', None)
+        if kwargs:
+            raise TypeError('Unexpected arguments: %s' % ', '.join(kwargs))
+        if not fields:
+            fields = [field.attname for field in self.model._meta.concrete_fields]
+        states = self._state_annotations(now or timezone.now())
+        annotations = {}
+        for field in fields:
+            state = STATE_PROPERTIES.get(field, field)
+            if state in states:
+                annotations[field] = states[state]
+        clone = self.annotate(**annotations).values_list(*fields)
+        clone._iterable_class = RecordIterable
+        return clone
+
+    @instrumented('columns')
+    @replica_read
+    def timestamp_chunks(self, fields=None, chunk_size=10000, as_numpy=None):
+        """
+        Yield the timestamp columns of the queryset in chunks, see
+        ``behaviors.columns.timestamp_chunks()``.
+        """
+        return timestamp_chunks(self, fields, chunk_size, as_numpy)
+
+    def _transition(self, signal, signal_kwargs=None, **values):
+        """
+        Apply ``values`` with a single UPDATE, stamping ``modified`` on
+        ``Timestamped`` models, and send ``signal`` with the affected primary
+        keys once the transaction commits. Return the number of updated rows.
+
+        The keys are only collected when the signal has listeners or the
+        model has a ``behavior_transitioned(signal, pks, using)`` hook, such
+        as ``CountedAuthored``'s, called in the transaction. The rows are
+        then locked with ``SELECT ... FOR UPDATE`` and updated, hooked and
+        signalled in batches of at most ``TRANSITION_BATCH_SIZE`` keys.
+        """
+        if _is_timestamped(self.model):
+            values.setdefault('modified', timezone.now())
+        hook = getattr(self.model, 'behavior_transitioned', None)
+        if hook is None and not signal.has_listeners(self.model):
+            return self.update(**values)
+
+        using = self._db or router.db_for_write(self.model, **self._hints)
+        rows = 0
+        with transaction.atomic(using=using):
+            pks = list(self.using(using).select_for_update().values_list(
+                'pk', flat=True))
+            for batch in _pk_batches(using, pks):
+                rows += self.using(using).filter(pk__in=batch).update(**values)
+                if hook is not None:
+                    hook(signal, batch, using)
+                signals.send_on_commit(signal, self.model, batch, using,
+                                       **(signal_kwargs or {}))
+        return rows
+
+
+class AuthoredQuerySet(BehaviorQuerySet):
+
+    @instrumented('authored')
+    @replica_read
     def authored_by(self, author):
-        return self.filter(author__username__istartswith=author)
+        """
+        Filter on a user, a user pk, or an iterable or queryset of either
+        using the ``author_id`` index. A string is a username prefix, see
+        ``authored_by_prefix()``.
+        """
+        if isinstance(author, string_types):
+            return self.authored_by_prefix(author)
+        return self.filter(**_user_lookup('author', author))
+
+    @instrumented('authored')
+    @replica_read
+    def authored_by_prefix(self, prefix):
+        return _username_prefix(self, 'author', prefix)
+
+    @instrumented('authored')
+    @replica_read
+    def with_people(self, fields=('username',)):
+        """
+        Load the author (and the editor on ``Editored`` models) in the same
+        query, with only ``fields`` of the user model.
+        """
+        return _with_people(self, fields)
 
+    @instrumented('authored')
+    @replica_read
+    def counts_for(self, author):
+        """
+        Return a ``Counter`` of every object of ``author`` (whatever the
+        filters of the queryset) keyed by ``(publication_status, deleted)``.
+        ``CountedAuthored`` models read it from their counters instead of
+        counting the rows.
+        """
+        if _is_counted(self.model):
+            from .counters.models import AuthorCount
+            return AuthorCount.objects.using(self.db).counts_for(
+                self.model, author)
+        queryset = self.model._base_manager.using(self.db).filter(
+            author=author)
+        return Counter(dict(((status, deleted), count) for
+                            (_, status, deleted), count in
+                            _author_counts(queryset).items()))
 
-class EditoredQuerySet(models.QuerySet):
+    @instrumented('authored')
+    def sync_author_names(self):
+        """
+        Refresh the ``author_name`` of ``NamedAuthored`` models with a single
+        UPDATE. Return the number of updated rows.
+        """
+        return _sync_user_names(self, 'author')
 
+
+class EditoredQuerySet(BehaviorQuerySet):
+
+    @instrumented('editored')
+    @replica_read
     def edited_by(self, editor):
-        return self.filter(editor__username__istartswith=editor)
+        """
+        Filter on a user, a user pk, or an iterable or queryset of either
+        using the ``editor_id`` index. A string is a username prefix, see
+        ``edited_by_prefix()``.
+        """
+        if isinstance(editor, string_types):
+            return self.edited_by_prefix(editor)
+        return self.filter(**_user_lookup('editor', editor))
+
+    @instrumented('editored')
+    @replica_read
+    def edited_by_prefix(self, prefix):
+        return _username_prefix(self, 'editor', prefix)
 
+    @instrumented('editored')
+    @replica_read
+    def with_people(self, fields=('username',)):
+        """
+        Load the editor (and the author on ``Authored`` models) in the same
+        query, with only ``fields`` of the user model.
+        """
+        return _with_people(self, fields)
 
-class PublishedQuerySet(models.QuerySet):
+    @instrumented('editored')
+    def sync_editor_names(self):
+        """
+        Refresh the ``editor_name`` of ``NamedEditored`` models with a single
+        UPDATE. Return the number of updated rows.
+        """
+        return _sync_user_names(self, 'editor')
 
+
+class PublishedQuerySet(BehaviorQuerySet):
+
+    def _state_annotations(self, now):
+        annotations = super(PublishedQuerySet, self)._state_annotations(now)
+        annotations['is_published'] = _state_case(
+            models.Q(publication_status='p'))
+        return annotations
+
+    @instrumented('published')
+    @replica_read
     def draft(self):
         return self.filter(publication_status='d')
 
+    @instrumented('published')
+    @replica_read
     def published(self):
         return self.filter(publication_status='p')
 
+    @instrumented('published')
+    def publish(self):
+        """
+        Publish every object of the queryset that is not published yet with a
+        single UPDATE. Return the number of published objects.
+        """
+        return self.exclude(publication_status='p')._transition(
+            signals.published, publication_status='p')
+
+    @instrumented('published')
+    def unpublish(self):
+        """
+        Return every published object of the queryset to draft with a single
+        UPDATE. Return the number of unpublished objects.
+        """
+        return self.exclude(publication_status='d')._transition(
+            signals.unpublished, publication_status='d')
+
+    if supports_async():
+        apublish = _async_variant('publish')
+        aunpublish = _async_variant('unpublish')
+
+    @instrumented('published')
+    @replica_read
+    def status_counts(self):
+        """
+        Return an ordered mapping of every publication status to its number
+        of objects, computed with a single ``GROUP BY`` query. The result is
+        cached when ``STATUS_COUNTS_CACHE_TIMEOUT`` is set.
+        """
+        timeout = BehaviorsConfig.status_counts_cache_timeout()
+        if timeout is not None:
+            key = status_counts_key(self)
+            counts = cache.get(key)
+            if counts is not None:
+                return counts
+
+        counts = OrderedDict(
+            (status, 0) for status, _ in self.model.PUBLICATION_STATUS_CHOICES)
+        rows = self.order_by().values('publication_status').annotate(
+            count=models.Count('pk')).values_list('publication_status', 'count')
+        counts.update(rows)
+
+        if timeout is not None:
+            cache.set(key, counts, timeout)
+        return counts
+
+    if supports_async():
+        astatus_counts = _async_variant('status_counts')
+
+    def update(self, **kwargs):
+        rows = super(PublishedQuerySet, self).update(**kwargs)
+        invalidate_status_counts(self.model, self.db)
+        return rows
+    update.alters_data = True
+
+    def delete(self):
+        result = super(PublishedQuerySet, self).delete()
+        invalidate_status_counts(self.model, self.db)
+        return result
+    delete.alters_data = True
+    delete.queryset_only = True
+
 
-class ReleasedQuerySet(models.QuerySet):
+class ReleasedQuerySet(BehaviorQuerySet):
 
+    def _state_annotations(self, now):
+        annotations = super(ReleasedQuerySet, self)._state_annotations(now)
+        annotations['is_released'] = _state_case(
+            models.Q(release_date__lte=now))
+        return annotations
+
+    @instrumented('released')
+    @replica_read
     def released(self):
-        return self.filter(~models.Q(release_date=None)).filter(
-            release_date__lte=timezone.now())
+        # A NULL release_date never satisfies the comparison, so no separate
+        # ``IS NOT NULL`` predicate is needed.
+        now = timezone.now()
+        return self._bounded_by(now, self.filter(release_date__lte=now))
 
+    @instrumented('released')
+    @replica_read
     def not_released(self):
-        return self.filter(~models.Q(release_date=None)).filter(
-            release_date__gt=timezone.now())
+        now = timezone.now()
+        return self._bounded_by(now, self.filter(release_date__gt=now))
 
+    @instrumented('released')
+    @replica_read
     def no_release_date(self):
         return self.filter(models.Q(release_date=None))
 
+    @instrumented('released')
+    def release_on(self, date=None):
+        """
+        Set the release date of every object of the queryset with a single
+        UPDATE, defaulting to now. Return the number of updated objects.
+        """
+        if not date:
+            date = timezone.now()
+        return self._transition(
+            signals.released, signal_kwargs={'release_date': date},
+            release_date=date)
+
+    @instrumented('released')
+    def unrelease(self):
+        """
+        Clear the release date of the queryset with a single UPDATE. Return
+        the number of updated objects.
+        """
+        return self.filter(release_date__isnull=False)._transition(
+            signals.unreleased, release_date=None)
+
+    if supports_async():
+        arelease_on = _async_variant('release_on')
+        aunrelease = _async_variant('unrelease')
 
-class StoreDeletedQuerySet(models.QuerySet):
+
+class StoreDeletedQuerySet(BehaviorQuerySet):
+
+    def _state_annotations(self, now):
+        annotations = super(StoreDeletedQuerySet, self)._state_annotations(now)
+        annotations['is_deleted'] = _state_case(
+            models.Q(deleted__isnull=False))
+        return annotations
 
     def get_queryset(self):
-        return self.not_deleted()
+        # The filter of the default managers doesn't take the replica hint of
+        # not_deleted(), so that their reads stay on the primary like those
+        # of any other manager.
+        queryset = self.not_deleted()
+        queryset._hints = self._hints
+        return queryset
 
+    @instrumented('store_deleted')
+    @replica_read
     def deleted(self):
-        return self.exclude(deleted__isnull=True)
+        return self.filter(deleted__isnull=False)
 
+    @instrumented('store_deleted')
+    @replica_read
     def not_deleted(self):
-        return self.exclude(deleted__isnull=False)
+        return self.filter(deleted__isnull=True)
 
     def allow_deleted(self):
         return self
+
+    @instrumented('store_deleted')
+    def soft_delete(self):
+        """
+        Mark every object of the queryset that isn't deleted yet as deleted
+        with a single UPDATE. Return the number of deleted objects.
+        """
+        return self.filter(deleted__isnull=True)._transition(
+            signals.soft_deleted, deleted=timezone.now())
+
+    @instrumented('store_deleted')
+    def restore(self):
+        """
+        Restore every deleted object of the queryset with a single UPDATE.
+        Return the number of restored objects.
+        """
+        return self.filter(deleted__isnull=False)._transition(
+            signals.restored, deleted=None)
+
+    if supports_async():
+        asoft_delete = _async_variant('soft_delete')
+        arestore = _async_variant('restore')
+
+
+def last_modified_and_count(queryset):
+    """
+    Return the latest ``COALESCE(modified, created)`` of a queryset of
+    ``Timestamped`` objects, ``None`` when it is empty, and its number of
+    objects, read with one aggregate query. ``modified`` is never before
+    ``created``, so the former is the greater of the two column maximums.
+    The count changes when objects leave the queryset, which the timestamps
+    of the remaining ones don't show.
+    """
+    latest = queryset.order_by().aggregate(
+        latest_modified=models.Max('modified'),
+        latest_created=models.Max('created'),
+        count=models.Count('pk'))
+    count = latest.pop('count')
+    values = [value for value in latest.values() if value is not None]
+    return (max(values) if values else None), count
+
+
+def last_modified(queryset):
+    """
+    Return the latest ``COALESCE(modified, created)`` of a queryset of
+    ``Timestamped`` objects, ``None`` when it is empty. ``modified`` is never
+    before ``created``, so this is the greater of the two column maximums,
+    which a single aggregate query reads from their indexes.
+    """
+    latest = queryset.order_by().aggregate(
+        latest_modified=models.Max('modified'),
+        latest_created=models.Max('created'))
+    values = [value for value in latest.values() if value is not None]
+    return max(values) if values else None
+
+
+class TimestampedQuerySet(BehaviorQuerySet):
+
+    def _state_annotations(self, now):
+        annotations = super(TimestampedQuerySet, self)._state_annotations(now)
+        annotations['is_changed'] = _state_case(
+            models.Q(modified__isnull=False))
+        return annotations
+
+    @instrumented('timestamped')
+    @replica_read
+    def last_modified(self):
+        return last_modified(self)
+
+
+class LiveQuerySet(PublishedQuerySet, ReleasedQuerySet, StoreDeletedQuerySet):
+    """
+    QuerySet for models combining the ``Published``, ``Released`` and
+    ``StoreDeleted`` behaviors.
+    """
+
+    @instrumented('live')
+    @replica_read
+    def live(self):
+        """
+        Published, released and not deleted objects in a single WHERE clause,
+        served by ``behaviors.indexes.live_index``.
+        """
+        now = timezone.now()
+        return self._bounded_by(now, self.filter(publication_status='p',
+                                                 release_date__lte=now,
+                                                 deleted__isnull=True))
+
+
+_composed_querysets = {}
+
+
+def behavior_queryset_class(model, *queryset_classes):
+    """
+    Return a QuerySet class combining ``queryset_classes`` with the querysets
+    of every behavior of ``model``, so that any chain of their methods is a
+    single query. Combining ``Published``, ``Released`` and ``StoreDeleted``
+    adds ``LiveQuerySet.live()``. The classes are built once per combination.
+    """
+    from .behaviors import (Authored, Editored, Published, Released,
+                            StoreDeleted, Timestamped)
+    behaviors = (
+        (Authored, AuthoredQuerySet),
+        (Editored, EditoredQuerySet),
+        (Published, PublishedQuerySet),
+        (Released, ReleasedQuerySet),
+        (StoreDeleted, StoreDeletedQuerySet),
+        (Timestamped, TimestampedQuerySet),
+    )
+    bases = list(queryset_classes)
+    # Behaviors of other apps, like ``Historied``, name their querysets.
+    for queryset_class in getattr(model, 'behavior_querysets', ()):
+        if not any(issubclass(base, queryset_class)
+                   for base in queryset_classes):
+            bases.append(queryset_class)
+    for behavior, queryset_class in behaviors:
+        if not issubclass(model, behavior):
+            continue
+        if not any(issubclass(base, queryset_class)
+                   for base in queryset_classes):
+            bases.append(queryset_class)
+    live = (PublishedQuerySet, ReleasedQuerySet, StoreDeletedQuerySet)
+    if all(queryset_class in bases for queryset_class in live):
+        bases[bases.index(PublishedQuerySet)] = LiveQuerySet
+        bases = [base for base in bases if base not in live]
+    bases = tuple(bases) or (BehaviorQuerySet,)
+    if len(bases) == 1:
+        return bases[0]
+
+    try:
+        return _composed_querysets[bases]
+    except KeyError:
+        name = str('%sQuerySet' % ''.join(
+            base.__name__.replace('QuerySet', '') for base in bases))
+        return _composed_querysets.setdefault(bases, type(name, bases, {}))
@@ -0,0 +1,95 @@
+"""
+A database router sending the read-only queries of the behavior querysets to
+read replicas, and writes to the primary database.
+
+Once a context (a thread, or an asyncio task) has saved or deleted objects or
+updated or deleted behavior querysets, its reads stick to the primary until
+``unpin()``, which ``PrimaryPinningMiddleware`` calls around every request, so
+a request reads its own writes.
+"""
+from __future__ import unicode_literals
+
+import random
+from contextlib import contextmanager
+
+from django.db import router
+
+from .apps import BehaviorsConfig
+from .compat import context_var
+
+# Set by the behavior queryset methods that only read.
+READ_HINT = 'behaviors_read'
+
+_pinned = context_var('behaviors_pinned', False)
+
+
+def pin():
+    _pinned.set(True)
+
+
+def unpin():
+    _pinned.set(False)
+
+
+def is_pinned():
+    return _pinned.get()
+
+
+def is_installed():
+    """
+    Return whether a ``BehaviorRouter`` is one of the ``DATABASE_ROUTERS``.
+    """
+    return any(isinstance(instance, BehaviorRouter)
+               for instance in router.routers)
+
+
+def pin_on_write(sender, **kwargs):
+    """
+    ``post_save`` and ``post_delete`` receiver pinning the reads of the
+    context to the primary.
+    """
+    pin()
+
+
+@contextmanager
+def pinned_to_primary():
+    """
+    Send the behavior reads of the block to the primary, e.g. to read an
+    object before updating it.
+    """
+    outer = is_pinned()
+    pin()
+    try:
+        yield
+    finally:
+        _pinned.set(outer)
+
+
+class BehaviorRouter(object):
+    """
+    Route the reads of ``published()``, ``not_deleted()``, ``authored_by()``
+    and the other behavior queryset methods to one of the
+    ``BEHAVIORS_REPLICA_DATABASES``, and every write to the
+    ``BEHAVIORS_PRIMARY_DATABASE``. Other reads are left to the next router.
+    """
+
+    def db_for_read(self, model, **hints):
+        if not hints.get(READ_HINT):
+            return None
+        replicas = BehaviorsConfig.replica_databases()
+        if not replicas or is_pinned():
+            return BehaviorsConfig.primary_database()
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        # Not a write yet: Django also asks for the write database to read,
+        # e.g. in get_or_create() or the slug uniqueness checks, so pinning
+        # is left to the writes themselves.
+        return BehaviorsConfig.primary_database()
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = set(BehaviorsConfig.replica_databases())
+        databases.add(BehaviorsConfig.primary_database())
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
@@ -0,0 +1,25 @@
+from django.db import transaction
+from django.dispatch import Signal
+
+# Each signal is sent once per batch with ``sender`` (the model), ``pks`` (the
+# list of affected primary keys) and ``using`` (the database alias), after the
+# transaction of the update commits. When sent by the method of a single
+# object, such as ``StoreDeleted.delete()``, it also comes with that
+# ``instance``.
+published = Signal()
+unpublished = Signal()
+released = Signal()
+unreleased = Signal()
+soft_deleted = Signal()
+restored = Signal()
+slug_assigned = Signal()
+
+
+def send_on_commit(signal, sender, pks, using, **kwargs):
+    """
+    Send ``signal`` once the transaction on ``using`` commits, right away
+    outside of a transaction. Nothing is sent if it rolls back.
+    """
+    transaction.on_commit(
+        lambda: signal.send(sender=sender, pks=pks, using=using, **kwargs),
+        using=using)
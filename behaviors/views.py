@@ -0,0 +1,109 @@
+"""
+Conditional GET for views of ``Timestamped`` models: ``Last-Modified`` and
+ETag headers computed from ``COALESCE(modified, created)``, so requests for
+unchanged pages are answered with a 304 without rendering them. Also a form
+view mixin showing the edit conflicts found when saving.
+"""
+from __future__ import unicode_literals
+
+import functools
+
+from django.db import models
+from django.views.decorators.http import condition
+
+from .compat import epoch_micros
+from .exceptions import ConflictError
+from .querysets import last_modified_and_count
+
+
+def _fresh_queryset(queryset):
+    # Accept models and managers, and never reuse the result cache of a
+    # queryset built at import time.
+    if isinstance(queryset, type) and issubclass(queryset, models.Model):
+        return queryset._default_manager.all()
+    return queryset.all()
+
+
+def timestamped_condition(get_queryset):
+    """
+    Decorate a view to answer GET and HEAD requests with a 304 when the
+    ``Timestamped`` objects of ``get_queryset(request, *args, **kwargs)``
+    have not changed, reading their latest timestamp and their count with one
+    aggregate query. The count is part of the ETag so that deleting objects
+    changes it.
+    """
+    def decorator(view_func):
+        @functools.wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view_func(request, *args, **kwargs)
+            queryset = get_queryset(request, *args, **kwargs)
+            latest, count = last_modified_and_count(queryset)
+            etag = None
+            if latest is not None:
+                etag = '%s-%x-%x' % (queryset.model._meta.label_lower,
+                                     epoch_micros(latest), count)
+            return condition(
+                etag_func=lambda *args, **kwargs: etag,
+                last_modified_func=lambda *args, **kwargs: latest,
+            )(view_func)(request, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def timestamped_object_condition(queryset, lookup='pk', url_kwarg='pk'):
+    """
+    ``timestamped_condition()`` for the view of the object of ``queryset``
+    (a model, manager or queryset) looked up by ``lookup`` from the URL
+    keyword argument ``url_kwarg``.
+    """
+    return timestamped_condition(
+        lambda request, *args, **kwargs: _fresh_queryset(queryset).filter(
+            **{lookup: kwargs[url_kwarg]}))
+
+
+def timestamped_list_condition(queryset):
+    """
+    ``timestamped_condition()`` for the view of every object of
+    ``queryset``, a model, manager or queryset.
+    """
+    return timestamped_condition(
+        lambda request, *args, **kwargs: _fresh_queryset(queryset))
+
+
+class ConditionalGetMixin(object):
+    """
+    Answer GET requests of a ``DetailView`` or ``ListView`` of a
+    ``Timestamped`` model with a 304 when the object, or the objects of
+    ``get_queryset()``, have not changed.
+    """
+
+    def get_last_modified_queryset(self):
+        queryset = self.get_queryset()
+        pk = self.kwargs.get(getattr(self, 'pk_url_kwarg', 'pk'))
+        slug = self.kwargs.get(getattr(self, 'slug_url_kwarg', 'slug'))
+        if pk is not None:
+            queryset = queryset.filter(pk=pk)
+        elif slug is not None and hasattr(self, 'get_slug_field'):
+            queryset = queryset.filter(**{self.get_slug_field(): slug})
+        return queryset
+
+    def get(self, request, *args, **kwargs):
+        get = super(ConditionalGetMixin, self).get
+        return timestamped_condition(
+            lambda request, *args, **kwargs: self.get_last_modified_queryset(),
+        )(get)(request, *args, **kwargs)
+
+
+class ConflictFormMixin(object):
+    """
+    Render the form of a ``CreateView`` or ``UpdateView`` again when saving
+    it raises ``ConflictError``, the row having been modified after the form
+    validated. The form has the conflict in its non field errors.
+    """
+
+    def form_valid(self, form):
+        try:
+            return super(ConflictFormMixin, self).form_valid(form)
+        except ConflictError:
+            return self.form_invalid(form)
@@ -0,0 +1,66 @@
+#!/usr/bin/env python
+# -*- coding: utf-8
+from __future__ import unicode_literals, absolute_import, print_function
+
+import argparse
+import json
+import os
+import sys
+
+import django
+
+
+def run_benchmarks(argv):
+    parser = argparse.ArgumentParser(
+        description='Benchmark the behavior hot paths on the test models.')
+    parser.add_argument(
+        'names', nargs='*', metavar='name',
+        help='Benchmarks to run, e.g. slugged.save, defaults to all of them.')
+    parser.add_argument(
+        '--size', type=int, default=1000,
+        help='Number of rows seeded per model, from 1000 to 1000000.')
+    parser.add_argument(
+        '--repeat', type=int, default=3,
+        help='Runs per benchmark, the fastest one is kept.')
+    parser.add_argument(
+        '--memory', action='store_true',
+        help='Also measure the peak memory allocated by each benchmark.')
+    parser.add_argument(
+        '--output', default='benchmarks.json',
+        help='File the JSON results are written to.')
+    parser.add_argument(
+        '--baseline',
+        help='JSON results of a previous run to compare with; regressions '
+             'make the command fail.')
+    parser.add_argument(
+        '--threshold', type=float, default=1.5,
+        help='Slowdown over the baseline counted as a regression.')
+    args = parser.parse_args(argv)
+
+    os.environ['DJANGO_SETTINGS_MODULE'] = 'tests.settings'
+    django.setup()
+    from django.db import connection
+    from tests.benchmarks import compare, run_benchmarks
+
+    connection.creation.create_test_db(verbosity=0)
+    results = run_benchmarks(args.size, args.repeat, args.names, args.memory)
+    with open(args.output, 'w') as output:
+        json.dump(results, output, indent=2, sort_keys=True)
+    for name, result in sorted(results['results'].items()):
+        line = '%-32s %10.4fs %5d queries' % (
+            name, result['time'], result['queries'])
+        if 'memory' in result:
+            line += ' %10.1f KiB' % (result['memory'] / 1024.0)
+        print(line)
+
+    if args.baseline:
+        with open(args.baseline) as baseline:
+            regressions = compare(json.load(baseline), results, args.threshold)
+        for regression in regressions:
+            print('REGRESSION %s' % regression, file=sys.stderr)
+        return bool(regressions)
+    return False
+
+
+if __name__ == '__main__':
+    sys.exit(run_benchmarks(sys.argv[1:]))
@@ -43,10 +43,22 @@ setup(
     url='https://github.com/audiolion/django-behaviors',
     packages=[
         'behaviors',
+        'behaviors.counters',
+        'behaviors.counters.management',
+        'behaviors.counters.management.commands',
+        'behaviors.counters.migrations',
+        'behaviors.history',
+        'behaviors.history.migrations',
+        'behaviors.management',
+        'behaviors.management.commands',
     ],
     include_package_data=True,
-    extras={
+    install_requires=[
+        'Django>=1.11',
+    ],
+    extras_require={
         "slugged": "awesome-slugify>=1.6.5",
+        "numpy": "numpy",
     },
     license="MIT",
     zip_safe=False,
@@ -54,17 +66,17 @@ setup(
     classifiers=[
         'Development Status :: 4 - Beta',
         'Framework :: Django',
-        'Framework :: Django :: 1.8',
-        'Framework :: Django :: 1.11',
-        'Framework :: Django :: 2.0',
+        'Framework :: Django :: 3.2',
+        'Framework :: Django :: 4.2',
         'Intended Audience :: Developers',
         'License :: OSI Approved :: BSD License',
         'Natural Language :: English',
-        'Programming Language :: Python :: 2',
-        'Programming Language :: Python :: 2.7',
         'Programming Language :: Python :: 3',
-        'Programming Language :: Python :: 3.4',
-        'Programming Language :: Python :: 3.5',
         'Programming Language :: Python :: 3.6',
+        'Programming Language :: Python :: 3.7',
+        'Programming Language :: Python :: 3.8',
+        'Programming Language :: Python :: 3.9',
+        'Programming Language :: Python :: 3.10',
+        'Programming Language :: Python :: 3.11',
     ],
 )
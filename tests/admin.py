@@ -0,0 +1,13 @@
+# -*- coding: utf-8
+from __future__ import unicode_literals, absolute_import
+
+from django.contrib import admin
+
+from behaviors.admin import BehaviorsAdminMixin
+
+from .models import LiveMock
+
+
+@admin.register(LiveMock)
+class LiveMockAdmin(BehaviorsAdminMixin, admin.ModelAdmin):
+    list_display = ('pk', 'publication_status', 'release_date', 'deleted')
@@ -0,0 +1,8 @@
+"""
+Coroutines of the async tests that need Python 3 syntax, imported only where
+it parses.
+"""
+
+
+async def collect(queryset):
+    return [obj async for obj in queryset]
@@ -0,0 +1,401 @@
+"""
+Benchmarks of the behavior hot paths, run against the mock models by
+``runbenchmarks.py``.
+
+Every benchmark returns the callable to measure after doing its own set up.
+Each run happens in a transaction that is rolled back, so all of them see the
+same dataset seeded once per size.
+"""
+from __future__ import division, unicode_literals
+
+import time
+from datetime import timedelta
+
+import django
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test.client import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from behaviors.querysets import last_modified
+
+from .forms import SluggedPeopleFormSetMock, TimestampedEditoredModelFormMock
+from .models import (AuthoredEditoredMock, CountedMock, LiveMock, SluggedMock,
+                     TimestampedEditoredMock, TimestampedStoreDeletedMock)
+
+try:
+    from io import StringIO
+except ImportError:
+    from StringIO import StringIO
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+timer = getattr(time, 'perf_counter', time.time)
+
+BATCH_SIZE = 10000
+# Rows sharing the benchmark slug, bounding the probes of generate_unique_slug.
+SLUG_COLLISIONS = 200
+
+BENCHMARKS = []
+
+
+def benchmark(name):
+    def register(func):
+        BENCHMARKS.append((name, func))
+        return func
+    return register
+
+
+class Dataset(object):
+
+    def __init__(self, size):
+        self.size = size
+        self.now = timezone.now()
+
+
+def _bulk_create(model, objs):
+    for start in range(0, len(objs), BATCH_SIZE):
+        model.objects.bulk_create(objs[start:start + BATCH_SIZE])
+
+
+def seed(size):
+    """
+    Create ``size`` rows for each benchmarked model and return the
+    ``Dataset`` describing them.
+    """
+    data = Dataset(size)
+    User = get_user_model()
+    data.author = User.objects.create(username='author', email='a@example.com')
+    data.editor = User.objects.create(username='editor', email='e@example.com')
+    past = data.now - timedelta(days=1)
+    future = data.now + timedelta(days=1)
+
+    collisions = min(size, SLUG_COLLISIONS)
+    _bulk_create(SluggedMock, [
+        SluggedMock(title='Benchmark Title',
+                    slug='benchmark-title-%d' % i if i else 'benchmark-title')
+        for i in range(collisions)] + [
+        SluggedMock(title='Title %d' % i, slug='title-%d' % i)
+        for i in range(size - collisions)])
+    _bulk_create(LiveMock, [
+        LiveMock(publication_status='p' if i % 2 else 'd',
+                 release_date=future if i % 3 == 0 else past,
+                 deleted=past if i % 10 == 0 else None)
+        for i in range(size)])
+    _bulk_create(TimestampedStoreDeletedMock, [
+        TimestampedStoreDeletedMock(title='Title %d' % i,
+                                    deleted=past if i % 10 == 0 else None)
+        for i in range(size)])
+    _bulk_create(AuthoredEditoredMock, [
+        AuthoredEditoredMock(author=data.author if i % 2 else data.editor,
+                             editor=data.editor, title='Title %d' % i)
+        for i in range(size)])
+    _bulk_create(TimestampedEditoredMock, [
+        TimestampedEditoredMock(editor=data.editor, title='Title %d' % i)
+        for i in range(size)])
+    _bulk_create(CountedMock, [
+        CountedMock(author=data.author if i % 2 else data.editor,
+                    publication_status='p' if i % 2 else 'd')
+        for i in range(size)])
+    call_command('reconcile_author_counts', 'tests.CountedMock', stdout=StringIO())
+
+    data.live = LiveMock.objects.filter(deleted__isnull=True).first()
+    data.store_deleted = TimestampedStoreDeletedMock.objects.first()
+    data.timestamped = TimestampedEditoredMock.objects.first()
+    data.request = RequestFactory().post('/')
+    data.request.user = data.author
+    return data
+
+
+# Saves
+
+@benchmark('timestamped.save')
+def timestamped_save(data):
+    data.timestamped.title = 'Changed'
+    return data.timestamped.save
+
+
+@benchmark('slugged.save')
+def slugged_save(data):
+    return SluggedMock(title='Benchmark Title').save
+
+
+@benchmark('slugged.assign_slugs')
+def slugged_assign_slugs(data):
+    mocks = [SluggedMock(title='Benchmark Title') for _ in range(100)]
+    return lambda: SluggedMock.assign_slugs(mocks)
+
+
+@benchmark('store_deleted.delete')
+def store_deleted_delete(data):
+    return data.store_deleted.delete
+
+
+@benchmark('store_deleted.restore')
+def store_deleted_restore(data):
+    return data.store_deleted.restore
+
+
+@benchmark('released.release_on')
+def released_release_on(data):
+    return data.live.release_on
+
+
+@benchmark('counted.save')
+def counted_save(data):
+    return CountedMock(author=data.author).save
+
+
+# Bulk paths
+
+@benchmark('published.publish')
+def published_publish(data):
+    return LiveMock.objects.all().publish
+
+
+@benchmark('published.unpublish')
+def published_unpublish(data):
+    return LiveMock.objects.all().unpublish
+
+
+@benchmark('released.bulk_release_on')
+def released_bulk_release_on(data):
+    return LiveMock.objects.all().release_on
+
+
+@benchmark('released.unrelease')
+def released_unrelease(data):
+    return LiveMock.objects.all().unrelease
+
+
+@benchmark('store_deleted.soft_delete')
+def store_deleted_soft_delete(data):
+    return LiveMock.objects.soft_delete
+
+
+@benchmark('store_deleted.bulk_restore')
+def store_deleted_bulk_restore(data):
+    return LiveMock.objects.restore
+
+
+# Queryset methods
+
+def _count(queryset):
+    return queryset.count
+
+
+@benchmark('published.draft')
+def published_draft(data):
+    return _count(LiveMock.objects.draft())
+
+
+@benchmark('published.published')
+def published_published(data):
+    return _count(LiveMock.objects.published())
+
+
+@benchmark('published.status_counts')
+def published_status_counts(data):
+    return LiveMock.objects.status_counts
+
+
+@benchmark('released.released')
+def released_released(data):
+    return _count(LiveMock.objects.released())
+
+
+@benchmark('released.not_released')
+def released_not_released(data):
+    return _count(LiveMock.objects.not_released())
+
+
+@benchmark('released.no_release_date')
+def released_no_release_date(data):
+    return _count(LiveMock.objects.no_release_date())
+
+
+@benchmark('store_deleted.deleted')
+def store_deleted_deleted(data):
+    return _count(LiveMock.objects.deleted())
+
+
+@benchmark('store_deleted.not_deleted')
+def store_deleted_not_deleted(data):
+    return _count(LiveMock.objects.not_deleted())
+
+
+@benchmark('live.live')
+def live_live(data):
+    return _count(LiveMock.objects.live())
+
+
+@benchmark('states.with_states')
+def states_with_states(data):
+    return lambda: list(LiveMock.objects.with_states()[:1000])
+
+
+@benchmark('timestamped.last_modified')
+def timestamped_last_modified(data):
+    return lambda: last_modified(TimestampedEditoredMock.objects.all())
+
+
+@benchmark('authored.authored_by')
+def authored_authored_by(data):
+    return _count(AuthoredEditoredMock.objects.authored_by(data.author))
+
+
+@benchmark('authored.authored_by_prefix')
+def authored_authored_by_prefix(data):
+    return _count(AuthoredEditoredMock.objects.authored_by_prefix('aut'))
+
+
+@benchmark('authored.with_people')
+def authored_with_people(data):
+    return lambda: list(AuthoredEditoredMock.objects.with_people()[:1000])
+
+
+@benchmark('authored.counts_for')
+def authored_counts_for(data):
+    return lambda: CountedMock.objects.counts_for(data.author)
+
+
+@benchmark('authored.counts_for_group_by')
+def authored_counts_for_group_by(data):
+    return lambda: AuthoredEditoredMock.objects.counts_for(data.author)
+
+
+# Projections
+
+RECORD_FIELDS = ('pk', 'publication_status', 'release_date', 'released', 'is_deleted')
+
+
+@benchmark('records.as_records')
+def records_as_records(data):
+    return lambda: list(LiveMock.objects.as_records(*RECORD_FIELDS))
+
+
+@benchmark('records.instances')
+def records_instances(data):
+    # The instance path the projection replaces, reading the same values.
+    return lambda: [
+        (mock.pk, mock.publication_status, mock.release_date, mock.released,
+         mock.is_deleted)
+        for mock in LiveMock.objects.all()]
+
+
+@benchmark('columns.timestamp_chunks')
+def columns_timestamp_chunks(data):
+    queryset = TimestampedStoreDeletedMock.objects.allow_deleted()
+    return lambda: list(queryset.timestamp_chunks(as_numpy=False))
+
+
+@benchmark('columns.instances')
+def columns_instances(data):
+    # The instance path the columns replace, reading the same values.
+    return lambda: [
+        (mock.pk, mock.created, mock.modified, mock.deleted)
+        for mock in TimestampedStoreDeletedMock.objects.allow_deleted()]
+
+
+# Forms
+
+@benchmark('forms.editored_save')
+def forms_editored_save(data):
+    form = TimestampedEditoredModelFormMock(
+        data={'title': 'Changed'}, request=data.request,
+        instance=TimestampedEditoredMock.objects.get(pk=data.timestamped.pk))
+    form.is_valid()
+    return form.save
+
+
+@benchmark('forms.formset_save')
+def forms_formset_save(data):
+    post = {'form-TOTAL_FORMS': '100', 'form-INITIAL_FORMS': '0'}
+    for index in range(100):
+        post['form-%d-title' % index] = 'Benchmark Title'
+    formset = SluggedPeopleFormSetMock(
+        data=post, request=data.request,
+        queryset=SluggedPeopleFormSetMock.model.objects.none())
+    formset.is_valid()
+    return formset.save
+
+
+def _peak_memory(func, data):
+    with transaction.atomic():
+        measured = func(data)
+        tracemalloc.start()
+        try:
+            measured()
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+            transaction.set_rollback(True)
+
+
+def run_benchmarks(size, repeat=3, names=None, memory=False):
+    """
+    Seed ``size`` rows and run the benchmarks (only ``names`` if given)
+    ``repeat`` times. Return the results as a JSON serializable dict holding
+    the best wall time and the query count of each benchmark. With
+    ``memory``, an extra run measures the peak of the memory allocated by
+    Python, in bytes.
+    """
+    results = {}
+    with transaction.atomic():
+        data = seed(size)
+        for name, func in BENCHMARKS:
+            if names and name not in names:
+                continue
+            times = []
+            for _ in range(repeat):
+                with transaction.atomic():
+                    measured = func(data)
+                    # A full query log would hide the captured queries.
+                    connection.queries_log.clear()
+                    with CaptureQueriesContext(connection) as queries:
+                        start = timer()
+                        measured()
+                        times.append(timer() - start)
+                    transaction.set_rollback(True)
+                for obj in (data.live, data.store_deleted, data.timestamped):
+                    obj.refresh_from_db()
+            results[name] = {'time': min(times), 'queries': len(queries)}
+            if memory and tracemalloc is not None:
+                results[name]['memory'] = _peak_memory(func, data)
+        transaction.set_rollback(True)
+    return {
+        'size': size,
+        'vendor': connection.vendor,
+        'django': django.get_version(),
+        'results': results,
+    }
+
+
+def compare(baseline, current, threshold=1.5, min_time=0.001):
+    """
+    Return the regressions of ``current`` over ``baseline``: a benchmark
+    running more queries, or ``threshold`` times slower (ignoring times
+    under ``min_time`` seconds, which are mostly noise).
+    """
+    regressions = []
+    if baseline.get('size') != current['size']:
+        regressions.append('dataset size %s differs from the baseline %s' % (
+            current['size'], baseline.get('size')))
+        return regressions
+    for name, result in sorted(current['results'].items()):
+        expected = baseline['results'].get(name)
+        if expected is None:
+            continue
+        if result['queries'] > expected['queries']:
+            regressions.append('%s: %d queries, baseline %d' % (
+                name, result['queries'], expected['queries']))
+        slowest = max(expected['time'], min_time) * threshold
+        if result['time'] > slowest:
+            regressions.append('%s: %.4fs, baseline %.4fs' % (
+                name, result['time'], expected['time']))
+    return regressions
@@ -1,6 +1,10 @@
-from behaviors.forms import AuthoredModelForm, EditoredModelForm
+from django.forms import modelformset_factory
 
-from .models import AuthoredMock, EditoredMock
+from behaviors.forms import (AuthoredModelForm, BehaviorModelFormSet,
+                             EditoredModelForm)
+
+from .models import (AuthoredMock, EditoredMock, NamedAuthoredEditoredMock,
+                     SluggedPeopleMock, TimestampedEditoredMock)
 
 
 class AuthoredModelFormMock(AuthoredModelForm):
@@ -13,3 +17,28 @@ class EditoredModelFormMock(EditoredModelForm):
     class Meta:
         model = EditoredMock
         fields = []
+
+
+class TimestampedEditoredModelFormMock(EditoredModelForm):
+    check_conflicts = True
+
+    class Meta:
+        model = TimestampedEditoredMock
+        fields = ['title', 'reviewers']
+
+
+class NamedAuthoredModelFormMock(AuthoredModelForm):
+    class Meta:
+        model = NamedAuthoredEditoredMock
+        fields = ['title']
+
+
+class NamedEditoredModelFormMock(EditoredModelForm):
+    class Meta:
+        model = NamedAuthoredEditoredMock
+        fields = ['title']
+
+
+SluggedPeopleFormSetMock = modelformset_factory(
+    SluggedPeopleMock, fields=['title'], formset=BehaviorModelFormSet,
+    extra=0, can_delete=True)
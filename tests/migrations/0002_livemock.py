@@ -0,0 +1,26 @@
+# Generated by Django 3.2.25 on 2026-10-19 03:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tests', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LiveMock',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('publication_status', models.CharField(choices=[('d', 'Draft'), ('p', 'Published')], default='d', max_length=1, verbose_name='Publication Status')),
+                ('release_date', models.DateTimeField(blank=True, null=True)),
+                ('deleted', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='livemock',
+            index=models.Index(condition=models.Q(('deleted__isnull', True)), fields=['publication_status', 'release_date'], name='tests_livemock_live'),
+        ),
+    ]
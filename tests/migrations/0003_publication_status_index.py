@@ -0,0 +1,38 @@
+# Generated by Django 3.2.25 on 2026-10-19 03:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tests', '0002_livemock'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='livemock',
+            name='publication_status',
+            field=models.CharField(choices=[('d', 'Draft'), ('p', 'Published')], db_index=True, default='d', max_length=1, verbose_name='Publication Status'),
+        ),
+        migrations.AlterField(
+            model_name='mixinobjectsqueryset',
+            name='publication_status',
+            field=models.CharField(choices=[('d', 'Draft'), ('p', 'Published')], db_index=True, default='d', max_length=1, verbose_name='Publication Status'),
+        ),
+        migrations.AlterField(
+            model_name='overrideobjectsqueryset',
+            name='publication_status',
+            field=models.CharField(choices=[('d', 'Draft'), ('p', 'Published')], db_index=True, default='d', max_length=1, verbose_name='Publication Status'),
+        ),
+        migrations.AlterField(
+            model_name='publishedmock',
+            name='publication_status',
+            field=models.CharField(choices=[('d', 'Draft'), ('p', 'Published')], db_index=True, default='d', max_length=1, verbose_name='Publication Status'),
+        ),
+        migrations.AlterField(
+            model_name='publishedmockmanager',
+            name='publication_status',
+            field=models.CharField(choices=[('d', 'Draft'), ('p', 'Published')], db_index=True, default='d', max_length=1, verbose_name='Publication Status'),
+        ),
+    ]
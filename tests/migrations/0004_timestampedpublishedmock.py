@@ -0,0 +1,26 @@
+# Generated by Django 3.2.25 on 2026-10-19 03:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tests', '0003_publication_status_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TimestampedPublishedMock',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('publication_status', models.CharField(choices=[('d', 'Draft'), ('p', 'Published')], db_index=True, default='d', max_length=1, verbose_name='Publication Status')),
+                ('release_date', models.DateTimeField(blank=True, null=True)),
+                ('created', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('modified', models.DateTimeField(blank=True, db_index=True, null=True)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
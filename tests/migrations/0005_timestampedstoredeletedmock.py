@@ -0,0 +1,26 @@
+# Generated by Django 3.2.25 on 2026-10-19 03:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tests', '0004_timestampedpublishedmock'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TimestampedStoreDeletedMock',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('modified', models.DateTimeField(blank=True, db_index=True, null=True)),
+                ('deleted', models.DateTimeField(blank=True, null=True)),
+                ('title', models.CharField(blank=True, max_length=255)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
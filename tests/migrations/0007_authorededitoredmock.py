@@ -0,0 +1,28 @@
+# Generated by Django 3.2.25 on 2026-10-19 03:50
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('tests', '0006_timestampededitoredmock'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AuthoredEditoredMock',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(blank=True, max_length=255)),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tests_authorededitoredmock_author', to=settings.AUTH_USER_MODEL)),
+                ('editor', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='tests_authorededitoredmock_editor', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 3.2.25 on 2026-10-19 03:54
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('tests', '0008_namedauthorededitoredmock'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CountedMock',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('publication_status', models.CharField(choices=[('d', 'Draft'), ('p', 'Published')], db_index=True, default='d', max_length=1, verbose_name='Publication Status')),
+                ('deleted', models.DateTimeField(blank=True, null=True)),
+                ('title', models.CharField(blank=True, max_length=255)),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tests_countedmock_author', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='CountedAuthoredMock',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tests_countedauthoredmock_author', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+    ]
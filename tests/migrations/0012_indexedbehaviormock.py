@@ -0,0 +1,41 @@
+# Generated by Django 3.2.25 on 2026-10-19 04:03
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('tests', '0011_sluggedpeoplemock'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IndexedBehaviorMock',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('publication_status', models.CharField(choices=[('d', 'Draft'), ('p', 'Published')], db_index=True, default='d', max_length=1, verbose_name='Publication Status')),
+                ('release_date', models.DateTimeField(blank=True, null=True)),
+                ('created', models.DateTimeField(auto_now_add=True, db_index=True)),
+                ('modified', models.DateTimeField(blank=True, db_index=True, null=True)),
+                ('deleted', models.DateTimeField(blank=True, null=True)),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tests_indexedbehaviormock_author', to=settings.AUTH_USER_MODEL)),
+                ('editor', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='tests_indexedbehaviormock_editor', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='indexedbehaviormock',
+            index=models.Index(condition=models.Q(('deleted__isnull', True)), fields=['publication_status', 'release_date'], name='tests_indexed_live'),
+        ),
+        migrations.AddIndex(
+            model_name='indexedbehaviormock',
+            index=models.Index(fields=['release_date'], name='tests_indexed_release'),
+        ),
+        migrations.AddIndex(
+            model_name='indexedbehaviormock',
+            index=models.Index(condition=models.Q(('deleted__isnull', False)), fields=['deleted'], name='tests_indexed_deleted'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 4.2.30 on 2026-10-19 04:52
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('tests', '0013_historiedmock'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='timestampededitoredmock',
+            name='reviewers',
+            field=models.ManyToManyField(blank=True, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
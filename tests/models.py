@@ -1,11 +1,20 @@
+from django.conf import settings
 from django.db import models
 
-from behaviors.behaviors import (Authored, Editored, Published, Released,
+from behaviors.behaviors import (Authored, Editored, NamedAuthored,
+                                 NamedEditored, Published, Released,
                                  Slugged, Timestamped, StoreDeleted)
-from behaviors.managers import (AuthoredManager, EditoredManager,
-                                PublishedManager, ReleasedManager,
-                                StoreDeletedManager)
-from behaviors.querysets import PublishedQuerySet
+from behaviors.counters.behaviors import CountedAuthored
+from behaviors.history.behaviors import Historied
+from behaviors.indexes import live_index
+from behaviors.managers import (AuthoredManager, BehaviorManager,
+                                EditoredManager,
+                                LiveManager, PublishedManager,
+                                ReleasedManager, StoreDeletedManager,
+                                TimestampedManager)
+from behaviors.querysets import (AuthoredQuerySet, PublishedQuerySet,
+                                 ReleasedQuerySet, StoreDeletedQuerySet,
+                                 TimestampedQuerySet)
 
 
 class AuthoredMock(Authored):
@@ -37,7 +46,7 @@ class NonUniqueSluggedMock(Slugged):
 
 
 class TimestampedMock(Timestamped):
-    pass
+    objects = TimestampedManager()
 
 
 class ReleasedMock(Released):
@@ -108,3 +117,89 @@ class MixinObjectsQuerySet(Published):
 
 class StoreDeletedMock(StoreDeleted):
     objects = StoreDeletedManager()
+
+
+class LiveMock(Published, Released, StoreDeleted):
+    objects = LiveManager()
+
+    class Meta:
+        indexes = [live_index('tests_livemock_live')]
+
+
+class TimestampedPublishedQuerySet(PublishedQuerySet, ReleasedQuerySet,
+                                   TimestampedQuerySet):
+    pass
+
+
+class TimestampedPublishedMock(Published, Released, Timestamped):
+    objects = TimestampedPublishedQuerySet.as_manager()
+
+
+class TimestampedStoreDeletedMock(Timestamped, StoreDeleted):
+    title = models.CharField(max_length=255, blank=True)
+
+    objects = StoreDeletedManager()
+
+    silenced_behavior_checks = ['behaviors.W003']
+
+
+class TimestampedEditoredMock(Editored, Timestamped):
+    title = models.CharField(max_length=255, blank=True)
+    reviewers = models.ManyToManyField(
+        settings.AUTH_USER_MODEL, blank=True, related_name='+')
+
+
+class AuthoredEditoredMock(Authored, Editored):
+    title = models.CharField(max_length=255, blank=True)
+
+
+class NamedAuthoredEditoredMock(NamedAuthored, NamedEditored):
+    title = models.CharField(max_length=255, blank=True)
+
+
+class CountedQuerySet(AuthoredQuerySet, PublishedQuerySet,
+                      StoreDeletedQuerySet):
+    pass
+
+
+class CountedMock(CountedAuthored, Published, StoreDeleted):
+    title = models.CharField(max_length=255, blank=True)
+
+    objects = CountedQuerySet.as_manager()
+
+
+class CountedAuthoredMock(CountedAuthored):
+    pass
+
+
+class BehaviorMock(Authored, Published, Released, StoreDeleted, Timestamped):
+    title = models.CharField(max_length=255, blank=True)
+
+    objects = BehaviorManager()
+
+
+class SluggedPeopleMock(Authored, Editored, Slugged, Timestamped):
+    title = models.CharField(max_length=255)
+
+    @property
+    def slug_source(self):
+        return self.title
+
+
+class IndexedBehaviorMock(Authored, Editored, Published, Released,
+                          StoreDeleted, Timestamped):
+    objects = BehaviorManager()
+
+    class Meta:
+        indexes = [
+            live_index('tests_indexed_live'),
+            models.Index(fields=['release_date'], name='tests_indexed_release'),
+            models.Index(fields=['deleted'], name='tests_indexed_deleted',
+                         condition=models.Q(deleted__isnull=False)),
+        ]
+
+
+class HistoriedMock(Historied, Editored, Published, StoreDeleted, Timestamped):
+    title = models.CharField(max_length=255, blank=True)
+
+    objects = BehaviorManager()
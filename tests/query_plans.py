@@ -0,0 +1,74 @@
+"""
+Helpers running ``EXPLAIN QUERY PLAN`` on SQLite for the query plan
+regression tests, and storing the plan snapshots.
+"""
+from __future__ import unicode_literals
+
+import io
+import json
+import os
+import re
+import sqlite3
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+SNAPSHOTS = os.path.join(os.path.dirname(__file__), 'query_plans.json')
+
+# Set to rewrite the snapshots from the current plans.
+UPDATE_ENV = 'UPDATE_QUERY_PLANS'
+
+
+def explain_sql(sql, params=()):
+    with connection.cursor() as cursor:
+        cursor.execute('EXPLAIN QUERY PLAN %s' % sql, params)
+        # Older SQLite versions prefix the table with "TABLE".
+        return [re.sub(r'^(SCAN|SEARCH) TABLE ', r'\1 ', row[-1])
+                for row in cursor.fetchall()]
+
+
+def explain(queryset):
+    """
+    Return the plan lines of a queryset.
+    """
+    sql, params = queryset.query.sql_with_params()
+    return explain_sql(sql, params)
+
+
+def explain_calls(func):
+    """
+    Return the plan lines of every query run by ``func()``.
+    """
+    with CaptureQueriesContext(connection) as queries:
+        func()
+    plan = []
+    for query in queries:
+        plan.extend(explain_sql(query['sql']))
+    return plan
+
+
+def full_scans(plan, allowed_indexes=()):
+    """
+    Return the plan lines reading a whole table or a whole index, except
+    for scans of the ``allowed_indexes``.
+    """
+    return [line for line in plan if line.startswith('SCAN ') and not any(
+        line.endswith(' INDEX %s' % index) for index in allowed_indexes)]
+
+
+def sqlite_version():
+    return '.'.join(sqlite3.sqlite_version.split('.')[:2])
+
+
+def load_snapshots():
+    if not os.path.exists(SNAPSHOTS):
+        return {'sqlite': sqlite_version(), 'plans': {}}
+    with io.open(SNAPSHOTS, encoding='utf-8') as snapshots:
+        return json.load(snapshots)
+
+
+def save_snapshots(plans):
+    with io.open(SNAPSHOTS, 'w', encoding='utf-8') as snapshots:
+        snapshots.write(json.dumps(
+            {'sqlite': sqlite_version(), 'plans': plans},
+            indent=2, sort_keys=True) + '\n')
@@ -0,0 +1,162 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_django-behaviors
+------------
+
+Tests for `django-behaviors` admin module.
+"""
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.http import urlencode
+
+from behaviors.admin import BehaviorPaginator, DeletedListFilter
+
+from test_plus.test import TestCase
+
+from .models import LiveMock
+
+
+class TestBehaviorPaginator(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        LiveMock.objects.bulk_create([LiveMock() for _ in range(5)])
+
+    def test_count_under_the_cap(self):
+        paginator = BehaviorPaginator(LiveMock.objects.order_by('pk'), 2)
+        self.assertEqual(paginator.count, 5)
+        self.assertEqual(paginator.num_pages, 3)
+        self.assertFalse(paginator.capped)
+
+    def test_count_over_the_cap(self):
+        paginator = BehaviorPaginator(LiveMock.objects.order_by('pk'), 2)
+        paginator.max_count = 3
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(paginator.count, 3)
+        self.assertEqual(len(queries), 1)
+        self.assertIn('LIMIT 4', queries[0]['sql'])
+        self.assertTrue(paginator.capped)
+        self.assertEqual(str(paginator.count), '3+')
+        self.assertEqual(paginator.num_pages, 2)
+
+    def test_list(self):
+        self.assertEqual(BehaviorPaginator(list(range(5)), 2).count, 5)
+
+
+class TestBehaviorsAdmin(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = get_user_model().objects.create_superuser(
+            'admin', 'admin@example.com', 'password')
+        cls.draft = LiveMock.objects.create()
+        cls.published = LiveMock.objects.create(publication_status='p')
+        cls.deleted = LiveMock.objects.create(deleted=timezone.now())
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def changelist(self, **params):
+        return self.get('admin:tests_livemock_changelist', data=params)
+
+    def action(self, action, *objs, **params):
+        # Actions apply to the filtered changelist, as when posted from it.
+        url = self.reverse('admin:tests_livemock_changelist')
+        if params:
+            url += '?' + urlencode(params)
+        return self.client.post(url, data={
+            'action': action, '_selected_action': [obj.pk for obj in objs]})
+
+    def test_changelist_has_no_unbounded_count(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.changelist()
+        self.assertEqual(response.status_code, 200)
+        counts = [query['sql'] for query in queries if 'COUNT(' in query['sql']]
+        self.assertEqual(len(counts), 1)
+        self.assertIn('LIMIT', counts[0])
+
+    def test_changelist_shows_capped_count(self):
+        self.addCleanup(setattr, BehaviorPaginator, 'max_count',
+                        BehaviorPaginator.max_count)
+        BehaviorPaginator.max_count = 1
+        self.assertContains(self.changelist(), '1+ live mocks')
+
+    def test_deleted_filter(self):
+        response = self.changelist()
+        self.assertEqual(set(response.context['cl'].result_list),
+                         {self.draft, self.published})
+        response = self.changelist(deleted='yes')
+        self.assertEqual(list(response.context['cl'].result_list), [self.deleted])
+        response = self.changelist(deleted='all')
+        self.assertEqual(len(response.context['cl'].result_list), 3)
+
+    def test_list_filters(self):
+        response = self.changelist(publication_status='p')
+        self.assertEqual(list(response.context['cl'].result_list), [self.published])
+        response = self.changelist(released='none')
+        self.assertEqual(len(response.context['cl'].result_list), 2)
+        filters = [type(spec) for spec in response.context['cl'].filter_specs]
+        self.assertIn(DeletedListFilter, filters)
+
+    def test_deleted_object_can_be_changed(self):
+        response = self.get('admin:tests_livemock_change', self.deleted.pk)
+        self.assertEqual(response.status_code, 200)
+
+    def test_actions(self):
+        actions = self.changelist().context['action_form'].fields['action'].choices
+        names = [name for name, _ in actions]
+        self.assertNotIn('delete_selected', names)
+        self.assertIn('soft_delete_selected', names)
+        self.assertIn('release_now_selected', names)
+
+    def test_soft_delete_action(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.action('soft_delete_selected', self.draft, self.published)
+        self.assertEqual(len([query for query in queries
+                              if query['sql'].startswith('UPDATE')]), 1)
+        self.assertEqual(LiveMock.objects.deleted().count(), 3)
+
+    def test_restore_action(self):
+        self.action('restore_selected', self.deleted, deleted='yes')
+        self.deleted.refresh_from_db()
+        self.assertIsNone(self.deleted.deleted)
+
+    def test_publish_actions(self):
+        self.action('publish_selected', self.draft)
+        self.assertEqual(LiveMock.objects.published().count(), 2)
+        self.action('unpublish_selected', self.draft, self.published)
+        self.assertEqual(LiveMock.objects.published().count(), 0)
+
+    def test_release_now_action(self):
+        self.action('release_now_selected', self.draft)
+        self.draft.refresh_from_db()
+        self.assertTrue(self.draft.released)
+
+    def test_soft_delete_action_needs_delete_permission(self):
+        editor = get_user_model().objects.create_user(
+            'editor', 'editor@example.com', 'password', is_staff=True)
+        editor.user_permissions.set(Permission.objects.filter(
+            codename__in=['view_livemock', 'change_livemock']))
+        self.client.force_login(editor)
+        actions = self.changelist().context['action_form'].fields['action'].choices
+        names = [name for name, _ in actions]
+        self.assertNotIn('soft_delete_selected', names)
+        self.assertIn('restore_selected', names)
+
+    def test_delete_view_lists_only_the_object(self):
+        response = self.get('admin:tests_livemock_delete', self.draft.pk)
+        self.assertEqual(response.context['deleted_objects'],
+                         ['Live mock: %s' % self.draft])
+        self.assertEqual(dict(response.context['model_count']),
+                         {'live mocks': 1})
+
+    def test_delete_view_soft_deletes(self):
+        self.post('admin:tests_livemock_delete', self.draft.pk,
+                  data={'post': 'yes'})
+        self.draft.refresh_from_db()
+        self.assertIsNotNone(self.draft.deleted)
@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_django-behaviors
+------------
+
+Tests for the async methods of `django-behaviors`, awaited in an asyncio
+event loop.
+"""
+from datetime import timedelta
+from unittest import skipIf
+
+from django.core.exceptions import ObjectDoesNotExist
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from behaviors.exceptions import ConflictError
+
+from test_plus.test import TestCase
+
+from .models import (LiveMock, PublishedMock, ReleasedMock, SluggedMock,
+                     StoreDeletedMock, TimestampedMock)
+
+try:
+    from asgiref.sync import async_to_sync
+except ImportError:
+    async_to_sync = None
+
+try:
+    from asgiref.sync import markcoroutinefunction
+except ImportError:
+    markcoroutinefunction = None
+
+try:
+    from .async_iteration import collect
+except SyntaxError:
+    collect = None
+
+
+def run(method, *args, **kwargs):
+    """
+    Await ``method(*args, **kwargs)`` in an event loop, from which the
+    thread sensitive ORM calls come back to the test thread and transaction.
+    """
+    def call():
+        return method(*args, **kwargs)
+    if markcoroutinefunction is not None:
+        markcoroutinefunction(call)
+    return async_to_sync(call)()
+
+
+@skipIf(async_to_sync is None, 'Async methods need Django 3.0 or later.')
+class TestAsyncBehaviors(TestCase):
+
+    def test_slugged_asave_generates_unique_slug(self):
+        SluggedMock.objects.create(title='Some Title')
+        mock = SluggedMock(title='Some Title')
+        run(mock.asave)
+        self.assertEqual(SluggedMock.objects.get(pk=mock.pk).slug, 'some-title-1')
+
+    def test_slugged_async_uniqueness_checks(self):
+        SluggedMock.objects.create(title='Some Title')
+        mock = SluggedMock(title='Some Title')
+        self.assertFalse(run(mock.ais_unique_slug, 'some-title'))
+        self.assertTrue(run(mock.ais_unique_slug, 'some-title-1'))
+        self.assertEqual(run(mock.agenerate_unique_slug), 'some-title-1')
+
+    def test_timestamped_asave_stamps_modified(self):
+        mock = TimestampedMock.objects.create()
+        run(mock.asave)
+        mock.refresh_from_db()
+        self.assertIsNotNone(mock.modified)
+
+    def test_timestamped_asave_checks_conflicts(self):
+        mock = TimestampedMock.objects.create()
+        TimestampedMock.objects.get(pk=mock.pk).save()
+        with self.assertRaises(ConflictError):
+            run(mock.asave, check_conflicts=True)
+
+    def test_store_deleted_adelete_and_arestore(self):
+        mock = StoreDeletedMock.objects.create()
+        run(mock.adelete)
+        self.assertTrue(StoreDeletedMock.objects.deleted().filter(pk=mock.pk).exists())
+        run(mock.arestore)
+        self.assertTrue(StoreDeletedMock.objects.not_deleted().filter(pk=mock.pk).exists())
+
+    def test_store_deleted_adelete_without_pk(self):
+        with self.assertRaises(ObjectDoesNotExist):
+            run(StoreDeletedMock().adelete)
+
+    def test_released_arelease_on(self):
+        mock = ReleasedMock.objects.create()
+        date = timezone.now() - timedelta(days=1)
+        run(mock.arelease_on, date)
+        self.assertEqual(ReleasedMock.objects.get(pk=mock.pk).release_date, date)
+
+    def test_queryset_apublish_and_aunpublish(self):
+        PublishedMock.objects.create()
+        PublishedMock.objects.create()
+        self.assertEqual(run(PublishedMock.objects.apublish), 2)
+        self.assertEqual(PublishedMock.objects.published().count(), 2)
+        self.assertEqual(run(PublishedMock.objects.all().aunpublish), 2)
+        self.assertEqual(run(PublishedMock.objects.astatus_counts)['d'], 2)
+
+    def test_queryset_arelease_on_and_aunrelease(self):
+        LiveMock.objects.create()
+        self.assertEqual(run(LiveMock.objects.arelease_on), 1)
+        self.assertEqual(LiveMock.objects.released().count(), 1)
+        self.assertEqual(run(LiveMock.objects.aunrelease), 1)
+        self.assertEqual(LiveMock.objects.no_release_date().count(), 1)
+
+    @skipIf(collect is None or not hasattr(QuerySet, '__aiter__'),
+            'Async iteration needs Django 4.1 or later.')
+    def test_async_iteration(self):
+        published = LiveMock.objects.create(publication_status='p')
+        LiveMock.objects.create(publication_status='p').delete()
+        LiveMock.objects.create()
+        self.assertEqual(run(collect, LiveMock.objects.published()), [published])
+        self.assertEqual(run(collect, StoreDeletedMock.objects.all()), [])
@@ -8,17 +8,26 @@ test_django-behaviors
 Tests for `django-behaviors` behaviors module.
 """
 from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
 from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 from django.core.exceptions import ObjectDoesNotExist
 
+from behaviors import signals
+from behaviors.exceptions import ConflictError
+
 from test_plus.test import TestCase
 
 from datetime import timedelta
+from io import StringIO
 
 from .models import (AuthoredMock, EditoredMock, PublishedMock,
                      ReleasedMock, SluggedMock, NonUniqueSluggedMock,
-                     TimestampedMock, StoreDeletedMock)
+                     TimestampedMock, StoreDeletedMock,
+                     TimestampedPublishedMock, TimestampedStoreDeletedMock,
+                     NamedAuthoredEditoredMock)
 
 
 class TestAuthored(TestCase):
@@ -137,6 +146,30 @@ class TestReleased(TestCase):
         self.mock.release_on(timezone.now())
         self.assertTrue(self.mock.released)
 
+    def test_release_on_writes_release_date_only(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.mock.release_on()
+        self.assertEqual(len(queries), 1)
+        assignments = queries[0]['sql'].split(' SET ')[1].split(' WHERE ')[0]
+        self.assertEqual(assignments.count('='), 1)
+        self.assertIn('"release_date"', assignments)
+
+    def test_release_on_stamps_modified(self):
+        mock = TimestampedPublishedMock.objects.create()
+        with CaptureQueriesContext(connection) as queries:
+            mock.release_on()
+        sql = queries[0]['sql']
+        self.assertIn('"release_date"', sql)
+        self.assertIn('"modified"', sql)
+        self.assertNotIn('"publication_status"', sql)
+        mock.refresh_from_db()
+        self.assertTrue(mock.changed)
+
+    def test_release_on_unsaved_object_creates_it(self):
+        mock = ReleasedMock()
+        mock.release_on()
+        self.assertIsNotNone(mock.pk)
+
 
 class TestSlugged(TestCase):
 
@@ -159,6 +192,14 @@ class TestSlugged(TestCase):
         self.assertEqual(self.mock2.slug, "slugged-title-1")
         self.assertEqual(self.mock3.slug, "slugged-title-2")
 
+    def test_assign_slugs(self):
+        mocks = [SluggedMock(title="Slugged Title"), SluggedMock(title="Other"),
+                 SluggedMock(title="Other"), SluggedMock(title="x", slug="kept")]
+        with self.assertNumQueries(1):
+            SluggedMock.assign_slugs(mocks)
+        self.assertEqual([mock.slug for mock in mocks],
+                         ["slugged-title-3", "other", "other-1", "kept"])
+
 
 @override_settings(UNIQUE_SLUG_BEHAVIOR=False)
 class TestNonUniqueSlugged(TestCase):
@@ -196,6 +237,35 @@ class TestTimestamped(TestCase):
         self.mock.save()
         self.assertTrue(self.mock.changed)
 
+    def test_check_conflicts_saves_unchanged_row(self):
+        self.mock.save(check_conflicts=True)
+        self.mock.save(check_conflicts=True)
+        self.mock.refresh_from_db()
+        self.assertTrue(self.mock.changed)
+
+    def test_check_conflicts_raises_on_concurrent_save(self):
+        other = TimestampedMock.objects.get(pk=self.mock.pk)
+        other.save()
+        with self.assertRaises(ConflictError):
+            self.mock.save(check_conflicts=True)
+        self.mock.refresh_from_db()
+        self.assertEqual(self.mock.modified, other.modified)
+
+    def test_check_conflicts_single_update_query(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.mock.save(check_conflicts=True)
+        statements = [query['sql'] for query in queries
+                      if 'SAVEPOINT' not in query['sql']]
+        self.assertEqual(len(statements), 1)
+        self.assertIn('"modified" IS NULL', statements[0])
+
+    def test_save_without_check_overwrites(self):
+        other = TimestampedMock.objects.get(pk=self.mock.pk)
+        other.save()
+        self.mock.save()
+        self.mock.refresh_from_db()
+        self.assertNotEqual(self.mock.modified, other.modified)
+
 
 class TestStoreDeleted(TestCase):
 
@@ -243,3 +313,172 @@ class TestStoreDeleted(TestCase):
         mock = StoreDeletedMock()
         mock.save()
         self.assertFalse(mock.is_deleted)
+
+
+class TestStoreDeletedNarrowWrites(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.mock = TimestampedStoreDeletedMock.objects.create(title='original')
+
+    def setUp(self):
+        self.mock.refresh_from_db()
+
+    def test_delete_writes_deleted_and_modified_only(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.mock.delete()
+        self.assertEqual(len(queries), 1)
+        sql = queries[0]['sql']
+        self.assertIn('"deleted"', sql)
+        self.assertIn('"modified"', sql)
+        self.assertNotIn('"title"', sql)
+        self.assertNotIn('"created"', sql)
+
+    def test_delete_stamps_modified_regardless_of_mro(self):
+        self.mock.delete()
+        self.mock.refresh_from_db()
+        self.assertTrue(self.mock.changed)
+        self.assertTrue(self.mock.is_deleted)
+
+    def test_restore_doesnt_clobber_concurrent_edits(self):
+        self.mock.delete()
+        TimestampedStoreDeletedMock.objects.allow_deleted().filter(
+            pk=self.mock.pk).update(title='concurrent')
+        self.mock.restore()
+        self.mock.refresh_from_db()
+        self.assertEqual(self.mock.title, 'concurrent')
+        self.assertFalse(self.mock.is_deleted)
+
+
+class TestNamedPeople(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.author = User.objects.create(
+            username='u1', email='u1@example.com', password='password')
+        cls.editor = User.objects.create(
+            username='u2', email='u2@example.com', password='password')
+        cls.mock = NamedAuthoredEditoredMock.objects.create(author=cls.author)
+
+    def setUp(self):
+        self.author.refresh_from_db()
+        self.editor.refresh_from_db()
+        self.mock.refresh_from_db()
+
+    def rename(self, user, username):
+        user.username = username
+        user.save()
+
+    def test_names_set_on_create(self):
+        self.assertEqual(self.mock.author_name, 'u1')
+        self.assertEqual(self.mock.editor_name, '')
+
+    def test_editor_name_follows_editor(self):
+        self.mock.editor = self.editor
+        self.mock.save()
+        self.mock.refresh_from_db()
+        self.assertEqual(self.mock.editor_name, 'u2')
+        self.mock.editor = None
+        self.mock.save()
+        self.mock.refresh_from_db()
+        self.assertEqual(self.mock.editor_name, '')
+
+    def test_name_follows_reassigned_id(self):
+        mock = NamedAuthoredEditoredMock.objects.create(author=self.author)
+        mock.author_id = self.editor.pk
+        mock.save()
+        mock.refresh_from_db()
+        self.assertEqual(mock.author_name, 'u2')
+        mock = NamedAuthoredEditoredMock.objects.get(pk=mock.pk)
+        mock.author_id = self.author.pk
+        mock.save(update_fields=['author'])
+        mock.refresh_from_db()
+        self.assertEqual(mock.author_name, 'u1')
+
+    def test_save_doesnt_fetch_user_when_name_stored(self):
+        with self.assertNumQueries(1):
+            self.mock.save()
+
+    def test_narrowed_save_includes_name(self):
+        self.mock.editor = self.editor
+        self.mock.save(update_fields=['editor'])
+        self.mock.refresh_from_db()
+        self.assertEqual(self.mock.editor_name, 'u2')
+
+    def test_sync_names_queryset(self):
+        self.rename(self.author, 'renamed')
+        queryset = NamedAuthoredEditoredMock.objects.all()
+        with self.assertNumQueries(1):
+            self.assertEqual(queryset.sync_author_names(), 1)
+        self.assertEqual(queryset.sync_author_names(), 0)
+        self.mock.refresh_from_db()
+        self.assertEqual(self.mock.author_name, 'renamed')
+
+    def test_sync_people_names_command(self):
+        for i in range(0, 4):
+            NamedAuthoredEditoredMock.objects.create(
+                author=self.author, editor=self.editor)
+        self.rename(self.author, 'renamed')
+        self.rename(self.editor, 'renamed2')
+        out = StringIO()
+        call_command('sync_people_names', 'tests.NamedAuthoredEditoredMock',
+                     '--chunk-size', '2', stdout=out)
+        self.assertIn('tests.NamedAuthoredEditoredMock.author_name: 5 rows updated', out.getvalue())
+        self.assertIn('tests.NamedAuthoredEditoredMock.editor_name: 4 rows updated', out.getvalue())
+        names = NamedAuthoredEditoredMock.objects.values_list('author_name', 'editor_name')
+        self.assertEqual(set(names), {('renamed', ''), ('renamed', 'renamed2')})
+
+    def test_sync_people_names_command_for_user(self):
+        self.rename(self.author, 'renamed')
+        out = StringIO()
+        call_command('sync_people_names', '--user', str(self.editor.pk), stdout=out)
+        self.mock.refresh_from_db()
+        self.assertEqual(self.mock.author_name, 'u1')
+
+
+class TestInstanceSignals(TestCase):
+
+    def receive(self, sender, pks, **kwargs):
+        self.received.append((sender, pks, kwargs.get('instance'), kwargs.get('using')))
+
+    def connect(self, signal):
+        self.received = []
+        signal.connect(self.receive)
+        self.addCleanup(signal.disconnect, self.receive)
+
+    def test_delete_and_restore_send_signals(self):
+        mock = StoreDeletedMock.objects.create()
+        self.connect(signals.soft_deleted)
+        with self.captureOnCommitCallbacks(execute=True):
+            mock.delete()
+        self.assertEqual(self.received, [(StoreDeletedMock, [mock.pk], mock, 'default')])
+        self.connect(signals.restored)
+        with self.captureOnCommitCallbacks(execute=True):
+            mock.restore()
+        self.assertEqual(self.received, [(StoreDeletedMock, [mock.pk], mock, 'default')])
+
+    def test_release_on_sends_released(self):
+        mock = ReleasedMock.objects.create()
+        self.connect(signals.released)
+        with self.captureOnCommitCallbacks(execute=True):
+            mock.release_on()
+        self.assertEqual(self.received, [(ReleasedMock, [mock.pk], mock, 'default')])
+
+    def test_signal_not_sent_on_rollback(self):
+        mock = ReleasedMock.objects.create()
+        self.connect(signals.released)
+        with self.captureOnCommitCallbacks() as callbacks:
+            mock.release_on()
+            self.assertEqual(self.received, [])
+        self.assertEqual(len(callbacks), 1)
+
+    def test_slug_assigned_only_when_generated(self):
+        self.connect(signals.slug_assigned)
+        with self.captureOnCommitCallbacks(execute=True):
+            mock = SluggedMock.objects.create(title='Title')
+        self.assertEqual(self.received, [(SluggedMock, [mock.pk], mock, 'default')])
+        with self.captureOnCommitCallbacks(execute=True):
+            mock.save()
+            SluggedMock.objects.create(title='Other', slug='other')
+        self.assertEqual(len(self.received), 1)
@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_django-behaviors
+------------
+
+Tests for `django-behaviors` benchmark suite.
+"""
+
+
+from test_plus.test import TestCase
+
+from .benchmarks import BENCHMARKS, compare, run_benchmarks
+from .models import LiveMock
+
+
+class TestBenchmarks(TestCase):
+
+    def test_run_benchmarks(self):
+        results = run_benchmarks(20, repeat=1)
+        self.assertEqual(results['size'], 20)
+        self.assertEqual(set(results['results']), set(name for name, _ in BENCHMARKS))
+        self.assertEqual(results['results']['published.published']['queries'], 1)
+        # The dataset is rolled back.
+        self.assertEqual(LiveMock.objects.count(), 0)
+
+    def test_run_some_benchmarks(self):
+        results = run_benchmarks(20, repeat=1, names=['slugged.save'])
+        self.assertEqual(list(results['results']), ['slugged.save'])
+        self.assertEqual(results['results']['slugged.save']['queries'], 22)
+
+    def test_memory(self):
+        results = run_benchmarks(20, repeat=1, memory=True, names=[
+            'records.as_records', 'records.instances'])
+        for result in results['results'].values():
+            self.assertEqual(result['queries'], 1)
+            self.assertGreater(result['memory'], 0)
+
+    def test_compare(self):
+        baseline = {'size': 10, 'results': {
+            'fast': {'time': 0.0001, 'queries': 1},
+            'slow': {'time': 0.1, 'queries': 1},
+        }}
+        current = {'size': 10, 'results': {
+            'fast': {'time': 0.0009, 'queries': 1},
+            'slow': {'time': 0.2, 'queries': 2},
+            'new': {'time': 1, 'queries': 1},
+        }}
+        self.assertEqual(compare(baseline, current), [
+            'slow: 2 queries, baseline 1',
+            'slow: 0.2000s, baseline 0.1000s',
+        ])
+        self.assertEqual(compare(baseline, baseline), [])
+        self.assertEqual(len(compare(dict(baseline, size=20), current)), 1)
@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_django-behaviors
+------------
+
+Tests for `django-behaviors` checks module.
+"""
+from django.apps import apps
+from django.core import checks
+
+from test_plus.test import TestCase
+
+from behaviors.checks import check_behavior_indexes
+
+from .models import (IndexedBehaviorMock, LiveMock, PublishedMock,
+                     ReleasedMock, StoreDeletedMock, TimestampedPublishedMock,
+                     TimestampedStoreDeletedMock)
+
+
+class TestBehaviorIndexChecks(TestCase):
+
+    def ids_for(self, model):
+        return [error.id for error in check_behavior_indexes() if error.obj is model]
+
+    def test_check_is_registered(self):
+        self.assertIn(check_behavior_indexes, checks.registry.registry.get_checks())
+
+    def test_indexed_fields_pass(self):
+        self.assertEqual(self.ids_for(PublishedMock), [])
+
+    def test_live_index_only_serves_live(self):
+        # released() and deleted() scan the whole live index, which neither
+        # release_date nor deleted leads.
+        errors = [error for error in check_behavior_indexes()
+                  if error.obj is LiveMock]
+        self.assertEqual([error.id for error in errors],
+                         ['behaviors.W002', 'behaviors.W003'])
+        self.assertIn("fields=['release_date']", errors[0].hint)
+        self.assertIn("condition=models.Q(deleted__isnull=False)", errors[1].hint)
+
+    def test_leading_fields_pass(self):
+        self.assertEqual(self.ids_for(IndexedBehaviorMock), [])
+
+    def test_missing_release_date_index(self):
+        self.assertEqual(self.ids_for(ReleasedMock), ['behaviors.W002'])
+        error = [error for error in check_behavior_indexes()
+                 if error.obj is TimestampedPublishedMock][0]
+        self.assertIn("fields=['release_date']", error.hint)
+
+    def test_missing_deleted_index(self):
+        self.assertEqual(self.ids_for(StoreDeletedMock), ['behaviors.W003'])
+
+    def test_silenced_per_model(self):
+        self.assertEqual(self.ids_for(TimestampedStoreDeletedMock), [])
+
+    def test_app_configs(self):
+        errors = check_behavior_indexes(app_configs=[apps.get_app_config('auth')])
+        self.assertEqual(errors, [])
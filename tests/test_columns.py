@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_django-behaviors
+------------
+
+Tests for `django-behaviors` columns module.
+"""
+from array import array
+from datetime import timedelta
+from unittest import skipIf, skipUnless
+
+from django.utils import timezone
+
+from behaviors.columns import NULL_TIMESTAMP, numpy, timestamp_chunks
+from behaviors.compat import epoch_micros
+
+from test_plus.test import TestCase
+
+from .models import LiveMock, TimestampedStoreDeletedMock
+
+
+class TestTimestampChunks(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.mocks = [TimestampedStoreDeletedMock.objects.create() for _ in range(5)]
+        cls.mocks[1].save()
+        cls.mocks[2].delete()
+
+    def chunks(self, queryset, **kwargs):
+        kwargs.setdefault('as_numpy', False)
+        return list(queryset.timestamp_chunks(**kwargs))
+
+    def test_columns(self):
+        chunks = self.chunks(TimestampedStoreDeletedMock.objects.allow_deleted())
+        self.assertEqual(len(chunks), 1)
+        columns = chunks[0]
+        self.assertEqual(list(columns), ['pk', 'created', 'modified', 'deleted'])
+        for column in columns.values():
+            self.assertIsInstance(column, array)
+        self.assertEqual(list(columns['pk']), [mock.pk for mock in self.mocks])
+        self.assertEqual(columns['created'][0], epoch_micros(self.mocks[0].created))
+        self.assertEqual(columns['modified'][0], NULL_TIMESTAMP)
+        self.assertEqual(columns['modified'][1], epoch_micros(self.mocks[1].modified))
+        self.assertEqual(columns['deleted'][2], epoch_micros(self.mocks[2].deleted))
+
+    def test_chunks_use_keyset_pagination(self):
+        queryset = TimestampedStoreDeletedMock.objects.allow_deleted()
+        with self.assertNumQueries(3):
+            chunks = self.chunks(queryset, chunk_size=2, fields=['created'])
+        self.assertEqual([len(chunk['pk']) for chunk in chunks], [2, 2, 1])
+        pks = [pk for chunk in chunks for pk in chunk['pk']]
+        self.assertEqual(pks, [mock.pk for mock in self.mocks])
+
+    def test_filtered_queryset(self):
+        chunks = self.chunks(TimestampedStoreDeletedMock.objects.all())
+        self.assertEqual(len(chunks[0]['pk']), 4)
+        self.assertEqual(list(chunks[0]['deleted']), [NULL_TIMESTAMP] * 4)
+
+    def test_default_fields(self):
+        LiveMock.objects.create(release_date=timezone.now() - timedelta(days=1))
+        chunk = next(timestamp_chunks(LiveMock.objects.all(), as_numpy=False))
+        self.assertEqual(list(chunk), ['pk', 'release_date', 'deleted'])
+
+    def test_empty(self):
+        self.assertEqual(self.chunks(LiveMock.objects.all()), [])
+
+    @skipIf(numpy is not None, 'NumPy is installed')
+    def test_numpy_missing(self):
+        with self.assertRaises(ImportError):
+            self.chunks(LiveMock.objects.all(), as_numpy=True)
+
+    @skipUnless(numpy is not None, 'NumPy is not installed')
+    def test_numpy(self):
+        columns = self.chunks(TimestampedStoreDeletedMock.objects.allow_deleted(),
+                              as_numpy=True)[0]
+        self.assertEqual(columns['pk'].dtype, numpy.dtype('int64'))
+        self.assertEqual(columns['created'].dtype, numpy.dtype('datetime64[us]'))
+        self.assertTrue(numpy.isnat(columns['modified'][0]))
+        self.assertEqual(numpy.count_nonzero(~numpy.isnat(columns['deleted'])), 1)
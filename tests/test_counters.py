@@ -0,0 +1,128 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_django-behaviors
+------------
+
+Tests for `django-behaviors` counters app.
+"""
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+
+from behaviors.counters.models import AuthorCount
+
+from test_plus.test import TestCase
+
+from io import StringIO
+
+from .models import AuthoredMock, CountedAuthoredMock, CountedMock
+
+
+class TestCountedAuthored(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.author = User.objects.create(
+            username='u1', email='u1@example.com', password='password')
+        cls.other = User.objects.create(
+            username='u2', email='u2@example.com', password='password')
+
+    def counts(self, model=CountedMock, author=None):
+        return dict(model.objects.counts_for(author or self.author))
+
+    def test_create_counts(self):
+        CountedMock.objects.create(author=self.author)
+        CountedMock.objects.create(author=self.author, publication_status='p')
+        self.assertEqual(self.counts(), {('d', False): 1, ('p', False): 1})
+
+    def test_counts_for_reads_counters(self):
+        CountedMock.objects.create(author=self.author)
+        with self.assertNumQueries(1):
+            self.counts()
+
+    def test_save_moves_count(self):
+        mock = CountedMock.objects.create(author=self.author)
+        mock.publication_status = 'p'
+        mock.save()
+        self.assertEqual(self.counts(), {('p', False): 1})
+        mock.author = self.other
+        mock.save()
+        self.assertEqual(self.counts(), {})
+        self.assertEqual(self.counts(author=self.other), {('p', False): 1})
+
+    def test_loaded_object_moves_count(self):
+        CountedMock.objects.create(author=self.author)
+        mock = CountedMock.objects.get()
+        mock.publication_status = 'p'
+        mock.save()
+        self.assertEqual(self.counts(), {('p', False): 1})
+
+    def test_deferred_object_moves_count(self):
+        CountedMock.objects.create(author=self.author)
+        mock = CountedMock.objects.only('title').get()
+        mock.publication_status = 'p'
+        mock.save()
+        self.assertEqual(self.counts(), {('p', False): 1})
+
+    def test_narrowed_save_only_counts_saved_fields(self):
+        mock = CountedMock.objects.create(author=self.author)
+        mock.publication_status = 'p'
+        mock.save(update_fields=['title'])
+        self.assertEqual(self.counts(), {('d', False): 1})
+
+    def test_delete_and_restore(self):
+        mock = CountedMock.objects.create(author=self.author)
+        mock.delete()
+        self.assertEqual(self.counts(), {('d', True): 1})
+        mock.restore()
+        self.assertEqual(self.counts(), {('d', False): 1})
+
+    def test_hard_delete(self):
+        mock = CountedAuthoredMock.objects.create(author=self.author)
+        self.assertEqual(self.counts(CountedAuthoredMock), {('', False): 1})
+        mock.delete()
+        self.assertEqual(self.counts(CountedAuthoredMock), {})
+
+    def test_bulk_publish_and_unpublish(self):
+        CountedMock.objects.create(author=self.author)
+        CountedMock.objects.create(author=self.author)
+        CountedMock.objects.create(author=self.other)
+        CountedMock.objects.create(author=self.author).delete()
+        CountedMock.objects.allow_deleted().publish()
+        self.assertEqual(self.counts(), {('p', False): 2, ('p', True): 1})
+        self.assertEqual(self.counts(author=self.other), {('p', False): 1})
+        CountedMock.objects.filter(author=self.author).unpublish()
+        self.assertEqual(self.counts(), {('d', False): 2, ('d', True): 1})
+        self.assertEqual(self.counts(author=self.other), {('p', False): 1})
+
+    def test_bulk_soft_delete_and_restore(self):
+        CountedMock.objects.create(author=self.author)
+        CountedMock.objects.create(author=self.author).delete()
+        CountedMock.objects.create(author=self.other)
+        CountedMock.objects.filter(author=self.author).soft_delete()
+        self.assertEqual(self.counts(), {('d', True): 2})
+        self.assertEqual(self.counts(author=self.other), {('d', False): 1})
+        CountedMock.objects.restore()
+        self.assertEqual(self.counts(), {('d', False): 2})
+        self.assertEqual(self.counts(author=self.other), {('d', False): 1})
+
+    def test_counts_for_without_counters(self):
+        AuthoredMock.objects.create(author=self.author)
+        AuthoredMock.objects.create(author=self.author)
+        AuthoredMock.objects.create(author=self.other)
+        self.assertEqual(self.counts(AuthoredMock), {('', False): 2})
+
+    def test_reconcile_command(self):
+        CountedMock.objects.create(author=self.author)
+        CountedMock.objects.filter(
+            author=self.author).update(publication_status='p')
+        AuthorCount.objects.update(count=5)
+        out = StringIO()
+        call_command('reconcile_author_counts', 'tests.CountedMock', stdout=out)
+        self.assertIn('tests.CountedMock: 2 counters fixed', out.getvalue())
+        self.assertEqual(self.counts(), {('p', False): 1})
+        out = StringIO()
+        call_command('reconcile_author_counts', 'tests.CountedMock', stdout=out)
+        self.assertIn('tests.CountedMock: 0 counters fixed', out.getvalue())
@@ -9,12 +9,29 @@ Tests for `django-behaviors` forms module.
 """
 from django.contrib.auth import get_user_model
 
+from django.db import connection
 from django.test import TransactionTestCase
+from django.test.utils import CaptureQueriesContext
 from django.test.client import RequestFactory
 
+try:
+    from django.urls import reverse
+except ImportError:
+    from django.core.urlresolvers import reverse
 
-from .forms import AuthoredModelFormMock, EditoredModelFormMock
-from .models import AuthoredMock, EditoredMock
+try:
+    from unittest import mock
+except ImportError:
+    import mock
+
+from behaviors import signals
+from behaviors.exceptions import ConflictError
+
+from .forms import (AuthoredModelFormMock, EditoredModelFormMock,
+                    NamedAuthoredModelFormMock, NamedEditoredModelFormMock,
+                    SluggedPeopleFormSetMock, TimestampedEditoredModelFormMock)
+from .models import (AuthoredMock, EditoredMock, NamedAuthoredEditoredMock,
+                     SluggedPeopleMock, TimestampedEditoredMock)
 
 
 class TestAuthoredModelForm(TransactionTestCase):
@@ -145,3 +162,265 @@ class TestEditoredModelForm(TransactionTestCase):
             obj = form.save(commit=False)
             self.assertEqual(obj.editor, self.editor)
             self.assertEqual(EditoredMock.objects.all().count(), 0)
+
+
+class TestEditoredModelFormUpdateFields(TransactionTestCase):
+
+    def setUp(self):
+        User = get_user_model()
+        self.editor = User.objects.create(
+            username='u1', email='u1@test.com', password='password')
+        self.editor2 = User.objects.create(
+            username='u2', email='u2@test.com', password='password')
+        self.request = RequestFactory().get('/')
+        self.request.user = self.editor
+        self.obj = NamedAuthoredEditoredMock.objects.create(
+            author=self.editor, editor=self.editor, title='original')
+
+    def save(self, **data):
+        form = NamedEditoredModelFormMock(
+            data=data, request=self.request,
+            instance=NamedAuthoredEditoredMock.objects.get(pk=self.obj.pk))
+        self.assertTrue(form.is_valid())
+        with CaptureQueriesContext(connection) as queries:
+            form.save()
+        return [query['sql'] for query in queries]
+
+    def test_unchanged_form_skips_save(self):
+        self.assertEqual(self.save(title='original'), [])
+
+    def test_only_changed_fields_updated(self):
+        queries = self.save(title='changed')
+        self.assertEqual(len(queries), 1)
+        self.assertIn('SET "title" = ', queries[0])
+        self.assertNotIn('"editor_id"', queries[0])
+        self.obj.refresh_from_db()
+        self.assertEqual(self.obj.title, 'changed')
+
+    def test_new_editor_updated(self):
+        self.request.user = self.editor2
+        queries = self.save(title='original')
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('"title"', queries[0])
+        self.obj.refresh_from_db()
+        self.assertEqual(self.obj.editor, self.editor2)
+        self.assertEqual(self.obj.editor_name, 'u2')
+
+    def test_timestamped_updates_modified(self):
+        obj = TimestampedEditoredMock.objects.create(title='original')
+        form = TimestampedEditoredModelFormMock(
+            data={'title': 'changed'}, request=self.request,
+            instance=TimestampedEditoredMock.objects.get(pk=obj.pk))
+        self.assertTrue(form.is_valid())
+        form.save()
+        obj.refresh_from_db()
+        self.assertEqual(obj.title, 'changed')
+        self.assertTrue(obj.changed)
+
+
+class TestConflictCheckModelForm(TransactionTestCase):
+
+    def setUp(self):
+        User = get_user_model()
+        self.editor = User.objects.create(
+            username='u1', email='u1@test.com', password='password')
+        self.obj = TimestampedEditoredMock.objects.create(title='original')
+        self.requests = RequestFactory()
+        self.request = self.requests.get('/')
+        self.request.user = self.editor
+
+    def get_form(self, **data):
+        form = TimestampedEditoredModelFormMock(
+            instance=TimestampedEditoredMock.objects.get(pk=self.obj.pk))
+        data.setdefault('modified_token', form['modified_token'].value())
+        return data
+
+    def test_token_rendered_as_hidden_field(self):
+        form = TimestampedEditoredModelFormMock(instance=self.obj)
+        self.assertIn('type="hidden"', str(form['modified_token']))
+
+    def test_no_token_for_new_objects(self):
+        form = TimestampedEditoredModelFormMock()
+        self.assertNotIn('modified_token', form.fields)
+
+    def test_sequential_edits_succeed(self):
+        for title in ('first', 'second'):
+            data = self.get_form(title=title)
+            form = TimestampedEditoredModelFormMock(
+                data=data, request=self.request,
+                instance=TimestampedEditoredMock.objects.get(pk=self.obj.pk))
+            self.assertTrue(form.is_valid())
+            form.save()
+        self.obj.refresh_from_db()
+        self.assertEqual(self.obj.title, 'second')
+
+    def test_concurrent_edit_is_invalid(self):
+        first = self.get_form(title='first')
+        second = self.get_form(title='second')
+        form = TimestampedEditoredModelFormMock(
+            data=first, request=self.request,
+            instance=TimestampedEditoredMock.objects.get(pk=self.obj.pk))
+        self.assertTrue(form.is_valid())
+        form.save()
+        form = TimestampedEditoredModelFormMock(
+            data=second, request=self.request,
+            instance=TimestampedEditoredMock.objects.get(pk=self.obj.pk))
+        self.assertFalse(form.is_valid())
+        self.assertIn('was modified since it was loaded', form.non_field_errors()[0])
+        self.obj.refresh_from_db()
+        self.assertEqual(self.obj.title, 'first')
+
+    def test_edit_after_validation_is_not_saved(self):
+        form = TimestampedEditoredModelFormMock(
+            data=self.get_form(title='second', reviewers=[self.editor.pk]),
+            request=self.request,
+            instance=TimestampedEditoredMock.objects.get(pk=self.obj.pk))
+        self.assertTrue(form.is_valid())
+        TimestampedEditoredMock.objects.get(pk=self.obj.pk).save()
+        with self.assertRaises(ConflictError):
+            form.save()
+        self.assertIn('was modified since it was loaded', form.non_field_errors()[0])
+        self.obj.refresh_from_db()
+        self.assertEqual(self.obj.title, 'original')
+        self.assertFalse(self.obj.reviewers.exists())
+
+    def test_update_view_shows_conflict_found_when_saving(self):
+        def conflict(form, obj, update_fields=None):
+            form.add_error(None, 'Conflict.')
+            raise ConflictError('Conflict.')
+        with mock.patch.object(TimestampedEditoredModelFormMock,
+                               '_save_instance', conflict):
+            response = self.client.post(
+                reverse('timestamped_editored_update', args=[self.obj.pk]),
+                self.get_form(title='second', reviewers=[self.editor.pk]))
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(self.obj.reviewers.exists())
+
+    def test_update_view_shows_conflict(self):
+        data = self.get_form(title='second')
+        TimestampedEditoredMock.objects.get(pk=self.obj.pk).save()
+        response = self.client.post(
+            reverse('timestamped_editored_update', args=[self.obj.pk]), data)
+        self.assertEqual(response.status_code, 200)
+        response = self.client.post(
+            reverse('timestamped_editored_update', args=[self.obj.pk]),
+            self.get_form(title='second'))
+        self.assertEqual(response.status_code, 302)
+
+    def test_invalid_token(self):
+        for token in ('2020-02-30T00:00', 'nonsense'):
+            form = TimestampedEditoredModelFormMock(
+                data={'title': 'changed', 'modified_token': token},
+                request=self.request,
+                instance=TimestampedEditoredMock.objects.get(pk=self.obj.pk))
+            self.assertFalse(form.is_valid())
+            self.assertIn('modified_token', form.errors)
+
+
+class TestNamedPeopleModelForms(TransactionTestCase):
+
+    def setUp(self):
+        User = get_user_model()
+        self.user = User.objects.create(
+            username='u1', email='u1@test.com', password='password')
+        self.request = RequestFactory().get('/')
+        self.request.user = self.user
+
+    def test_author_name_set_without_commit(self):
+        form = NamedAuthoredModelFormMock(data={'title': 't'}, request=self.request)
+        self.assertTrue(form.is_valid())
+        obj = form.save(commit=False)
+        self.assertEqual(obj.author_name, 'u1')
+
+    def test_editor_name_set_on_save(self):
+        form = NamedAuthoredModelFormMock(data={'title': 't'}, request=self.request)
+        obj = form.save()
+        form = NamedEditoredModelFormMock(
+            data={'title': 'u'}, request=self.request, instance=obj)
+        form.save()
+        obj.refresh_from_db()
+        self.assertEqual((obj.author_name, obj.editor_name), ('u1', 'u1'))
+
+
+class TestBehaviorModelFormSet(TransactionTestCase):
+
+    def setUp(self):
+        User = get_user_model()
+        self.author = User.objects.create(
+            username='u1', email='u1@test.com', password='password')
+        self.editor = User.objects.create(
+            username='u2', email='u2@test.com', password='password')
+        self.request = RequestFactory().get('/')
+        self.request.user = self.editor
+
+    def data(self, titles, initial=0, delete=()):
+        data = {
+            'form-TOTAL_FORMS': str(len(titles)),
+            'form-INITIAL_FORMS': str(initial),
+        }
+        mocks = SluggedPeopleMock.objects.order_by('pk')
+        for index, title in enumerate(titles):
+            data['form-%d-title' % index] = title
+            if index < initial:
+                data['form-%d-id' % index] = str(mocks[index].pk)
+            if index in delete:
+                data['form-%d-DELETE' % index] = 'on'
+        return data
+
+    def formset(self, data):
+        formset = SluggedPeopleFormSetMock(
+            data=data, request=self.request,
+            queryset=SluggedPeopleMock.objects.order_by('pk'))
+        self.assertTrue(formset.is_valid())
+        return formset
+
+    def test_new_objects_are_stamped_and_slugged(self):
+        SluggedPeopleMock.objects.create(author=self.author, title='Title')
+        objs = self.formset(self.data(['Title', 'Title', 'Other'])).save()
+        self.assertEqual(len(objs), 3)
+        self.assertTrue(all(obj.pk for obj in objs))
+        mocks = SluggedPeopleMock.objects.filter(editor=self.editor).order_by('pk')
+        self.assertEqual([mock.slug for mock in mocks], ['title-1', 'title-2', 'other'])
+        self.assertEqual(set(mock.author_id for mock in mocks), {self.editor.pk})
+
+    def test_changed_objects_are_one_update(self):
+        for title in ('A', 'B', 'C'):
+            SluggedPeopleMock.objects.create(author=self.author, title=title)
+        formset = self.formset(self.data(['A2', 'B2', 'C'], initial=3))
+        with CaptureQueriesContext(connection) as queries:
+            objs = formset.save()
+        statements = [query['sql'] for query in queries
+                      if query['sql'] not in ('BEGIN', 'COMMIT')]
+        self.assertEqual(len(statements), 1)
+        self.assertTrue(statements[0].startswith('UPDATE'))
+        self.assertEqual(len(objs), 2)
+        mocks = SluggedPeopleMock.objects.order_by('pk')
+        self.assertEqual([mock.title for mock in mocks], ['A2', 'B2', 'C'])
+        self.assertEqual([mock.editor_id for mock in mocks], [self.editor.pk, self.editor.pk, None])
+        self.assertEqual([mock.changed for mock in mocks], [True, True, False])
+        self.assertEqual([mock.author_id for mock in mocks], [self.author.pk] * 3)
+        # Slugs are kept, like save() does.
+        self.assertEqual([mock.slug for mock in mocks], ['a', 'b', 'c'])
+
+    def test_new_slugs_send_one_signal(self):
+        received = []
+
+        def receive(sender, pks, **kwargs):
+            received.append(sorted(pks))
+        signals.slug_assigned.connect(receive, sender=SluggedPeopleMock)
+        self.addCleanup(signals.slug_assigned.disconnect, receive,
+                        sender=SluggedPeopleMock)
+        objs = self.formset(self.data(['A', 'B'])).save()
+        self.assertEqual(received, [sorted(obj.pk for obj in objs)])
+
+    def test_deleted_objects(self):
+        for title in ('A', 'B'):
+            SluggedPeopleMock.objects.create(author=self.author, title=title)
+        self.formset(self.data(['A', 'B'], initial=2, delete=[0])).save()
+        self.assertEqual(list(SluggedPeopleMock.objects.values_list('title', flat=True)), ['B'])
+
+    def test_commit_false(self):
+        objs = self.formset(self.data(['A'])).save(commit=False)
+        self.assertEqual(objs[0].author, self.editor)
+        self.assertIsNone(objs[0].pk)
+        self.assertEqual(SluggedPeopleMock.objects.count(), 0)
@@ -0,0 +1,135 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_django-behaviors
+------------
+
+Tests for `django-behaviors` history app.
+"""
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from behaviors import querysets
+from behaviors.history.models import HistoryEntry
+
+from test_plus.test import TestCase
+
+from .models import HistoriedMock
+
+
+class TestHistoried(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.editor = User.objects.create(
+            username='u1', email='u1@example.com', password='password')
+
+    def history(self, mock):
+        return [(entry.action, entry.diff) for entry in mock.history()]
+
+    def test_create_and_update(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            mock = HistoriedMock.objects.create(title='First', editor=self.editor)
+            mock.title = 'Second'
+            mock.save()
+        history = self.history(mock)
+        self.assertEqual(history[0], ('u', {'title': ['First', 'Second']}))
+        self.assertEqual(history[1][0], 'c')
+        self.assertEqual(history[1][1]['title'], [None, 'First'])
+        self.assertEqual(mock.history()[0].editor, self.editor)
+
+    def test_entries_written_in_one_query_on_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            mocks = [HistoriedMock.objects.create(title=str(i)) for i in range(3)]
+            for mock in mocks:
+                mock.publication_status = 'p'
+                mock.save(update_fields=['publication_status'])
+        self.assertFalse(HistoryEntry.objects.exists())
+        self.assertEqual(len(callbacks), 1)
+        with self.assertNumQueries(1):
+            callbacks[0]()
+        self.assertEqual(HistoryEntry.objects.count(), 6)
+
+    def test_unchanged_save_records_nothing(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            mock = HistoriedMock.objects.create()
+        mock = HistoriedMock.objects.get(pk=mock.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            mock.save()
+        self.assertEqual(len(self.history(mock)), 1)
+
+    def test_soft_delete_and_restore(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            mock = HistoriedMock.objects.create()
+            mock.delete()
+            mock.restore()
+        self.assertEqual([action for action, _ in self.history(mock)], ['r', 'd', 'c'])
+
+    def test_bulk_update(self):
+        mocks = [HistoriedMock.objects.create(title=str(i)) for i in range(2)]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(HistoriedMock.objects.publish(), 2)
+            HistoriedMock.objects.filter(pk=mocks[0].pk).update(
+                title='Changed', editor=self.editor)
+        self.assertEqual(self.history(mocks[0])[:2], [
+            ('u', {'title': ['0', 'Changed'], 'editor_id': [None, self.editor.pk]}),
+            ('u', {'publication_status': ['d', 'p']}),
+        ])
+        self.assertEqual(self.history(mocks[1])[0],
+                         ('u', {'publication_status': ['d', 'p']}))
+
+    def test_bulk_update_of_excluded_fields_records_nothing(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            mock = HistoriedMock.objects.create()
+            HistoriedMock.objects.update(modified=None)
+        self.assertEqual(len(self.history(mock)), 1)
+
+    def test_bulk_delete(self):
+        mock = HistoriedMock.objects.create()
+        with self.captureOnCommitCallbacks(execute=True):
+            HistoriedMock.objects.all().delete()
+        self.assertEqual(self.history(mock)[0], ('d', {}))
+
+    def test_bulk_update_and_delete_in_batches(self):
+        self.addCleanup(setattr, querysets, 'TRANSITION_BATCH_SIZE',
+                        querysets.TRANSITION_BATCH_SIZE)
+        querysets.TRANSITION_BATCH_SIZE = 2
+        mocks = [HistoriedMock.objects.create(title=str(i)) for i in range(3)]
+        with self.captureOnCommitCallbacks(execute=True), \
+                CaptureQueriesContext(connection) as queries:
+            self.assertEqual(HistoriedMock.objects.update(title='Changed'), 3)
+            self.assertEqual(HistoriedMock.objects.all().delete(),
+                             (3, {'tests.HistoriedMock': 3}))
+        statements = [query['sql'].split()[0] for query in queries]
+        self.assertEqual(statements.count('UPDATE'), 2)
+        self.assertEqual(statements.count('DELETE'), 2)
+        self.assertEqual(
+            [self.history(mock)[:2] for mock in mocks],
+            [[('d', {}), ('u', {'title': [str(i), 'Changed']})]
+             for i in range(3)])
+
+    def test_rolled_back_savepoint_discards_entries(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            mock = HistoriedMock.objects.create(title='Kept')
+            try:
+                with transaction.atomic():
+                    mock.title = 'Rolled back'
+                    mock.save()
+                    raise ValueError
+            except ValueError:
+                pass
+        self.assertEqual([action for action, _ in self.history(mock)], ['c'])
+
+    def test_history_for(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            mock = HistoriedMock.objects.create()
+            other = HistoriedMock.objects.create()
+            mock.save()
+            other.title = 'Other'
+            other.save()
+        entries = HistoryEntry.objects.history_for(other)
+        self.assertEqual([entry.action for entry in entries], ['u', 'c'])
+        self.assertEqual(entries[0].diff, {'title': ['', 'Other']})
@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_django-behaviors
+------------
+
+Tests for `django-behaviors` instrumentation module.
+"""
+from unittest import skipIf
+
+from django.db import connection
+from django.test.client import RequestFactory
+
+from test_plus.test import TestCase
+
+try:
+    import contextvars
+except ImportError:
+    contextvars = None
+
+from behaviors import instrumentation
+from behaviors.middleware import BehaviorMetricsMiddleware
+
+from .models import (AuthoredEditoredMock, LiveMock, SluggedMock,
+                     StoreDeletedMock)
+
+
+class TestInstrumentation(TestCase):
+
+    def setUp(self):
+        instrumentation.reset()
+        instrumentation.enable()
+
+    def tearDown(self):
+        instrumentation.disable()
+        instrumentation.reset()
+
+    def metric(self, model, behavior, method):
+        return instrumentation.get_metrics().get(
+            (model._meta.label_lower, behavior, method), {}).get('count', 0)
+
+    def test_disabled_adds_nothing(self):
+        instrumentation.disable()
+        queryset = LiveMock.objects.released()
+        self.assertEqual(queryset._behavior_tags, ())
+        list(queryset)
+        SluggedMock.objects.create(title='Title')
+        self.assertEqual(instrumentation.get_metrics(), {})
+        self.assertEqual(connection.execute_wrappers, [])
+
+    def test_slug_probes(self):
+        SluggedMock.objects.create(title='Title')
+        SluggedMock.objects.create(title='Title')
+        self.assertEqual(self.metric(SluggedMock, 'slugged', 'generate_unique_slug'), 3)
+        self.assertEqual(self.metric(SluggedMock, 'slugged', 'is_unique_slug'), 3)
+        self.assertEqual(connection.execute_wrappers, [])
+
+    def test_lazy_querysets_tagged_on_evaluation(self):
+        queryset = LiveMock.objects.published().released()
+        self.assertEqual(self.metric(LiveMock, 'released', 'released'), 0)
+        list(queryset)
+        queryset.all().count()
+        self.assertEqual(self.metric(LiveMock, 'released', 'released'), 2)
+        self.assertEqual(self.metric(LiveMock, 'published', 'published'), 2)
+
+    def test_with_people_tagged(self):
+        list(AuthoredEditoredMock.objects.with_people())
+        self.assertEqual(
+            self.metric(AuthoredEditoredMock, 'authored', 'with_people'), 1)
+
+    def test_iterator_tagged(self):
+        LiveMock.objects.create()
+        records = LiveMock.objects.released().iterator()
+        self.assertEqual(self.metric(LiveMock, 'released', 'released'), 0)
+        list(records)
+        self.assertEqual(self.metric(LiveMock, 'released', 'released'), 1)
+        self.assertEqual(connection.execute_wrappers, [])
+
+    def test_timestamp_chunks_tagged(self):
+        LiveMock.objects.create()
+        LiveMock.objects.create()
+        chunks = LiveMock.objects.not_deleted().timestamp_chunks(
+            chunk_size=1, as_numpy=False)
+        self.assertEqual(self.metric(LiveMock, 'columns', 'timestamp_chunks'), 0)
+        self.assertEqual(len(list(chunks)), 2)
+        self.assertEqual(self.metric(LiveMock, 'columns', 'timestamp_chunks'), 3)
+        self.assertEqual(self.metric(LiveMock, 'store_deleted', 'not_deleted'), 3)
+
+    @skipIf(contextvars is None, 'contextvars needs Python 3.7')
+    def test_tags_are_per_context(self):
+        LiveMock.objects.create()
+        tag = ('tests.livemock', 'released', 'released')
+        with instrumentation.tagged([tag]):
+            # A query of another request or coroutine, in its own context.
+            contextvars.Context().run(lambda: list(LiveMock.objects.all()))
+        self.assertNotIn(tag, instrumentation.get_metrics())
+
+    def test_store_deleted_filtering_and_writes(self):
+        mock = StoreDeletedMock.objects.create()
+        mock.delete()
+        mock.restore()
+        StoreDeletedMock.objects.deleted().exists()
+        list(StoreDeletedMock.objects.all())
+        self.assertEqual(self.metric(StoreDeletedMock, 'store_deleted', 'delete'), 1)
+        self.assertEqual(self.metric(StoreDeletedMock, 'store_deleted', 'restore'), 1)
+        self.assertEqual(self.metric(StoreDeletedMock, 'store_deleted', 'deleted'), 1)
+        self.assertEqual(self.metric(StoreDeletedMock, 'store_deleted', 'not_deleted'), 1)
+
+    def test_bulk_transitions(self):
+        LiveMock.objects.create()
+        LiveMock.objects.all().publish()
+        self.assertEqual(self.metric(LiveMock, 'published', 'publish'), 1)
+
+    def test_histogram(self):
+        SluggedMock.objects.create(title='Title')
+        metric = instrumentation.get_metrics()[
+            ('tests.sluggedmock', 'slugged', 'generate_unique_slug')]
+        self.assertEqual(metric['buckets'][-1], 1)
+        self.assertGreater(metric['time'], 0)
+
+    def test_prometheus_text(self):
+        SluggedMock.objects.create(title='Title')
+        text = instrumentation.prometheus_text()
+        labels = 'model="tests.sluggedmock",behavior="slugged",method="generate_unique_slug"'
+        self.assertIn('behaviors_queries_total{%s} 1\n' % labels, text)
+        self.assertIn('behaviors_query_duration_seconds_bucket{%s,le="+Inf"} 1\n' % labels, text)
+        self.assertIn('behaviors_query_duration_seconds_count{%s} 1\n' % labels, text)
+        self.assertIn('# TYPE behaviors_query_duration_seconds histogram', text)
+
+    def test_middleware(self):
+        SluggedMock.objects.create(title='Title')
+        middleware = BehaviorMetricsMiddleware(lambda request: None)
+        requests = RequestFactory()
+        response = middleware.process_request(requests.get('/metrics/behaviors/'))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(b'behaviors_queries_total', response.content)
+        self.assertIsNone(middleware.process_request(requests.get('/')))
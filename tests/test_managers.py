@@ -15,10 +15,14 @@ from test_plus.test import TestCase
 from datetime import timedelta
 
 from behaviors.querysets import (AuthoredQuerySet, EditoredQuerySet,
-                                 PublishedQuerySet, ReleasedQuerySet)
+                                 LiveQuerySet, PublishedQuerySet,
+                                 ReleasedQuerySet, TimestampedQuerySet,
+                                 behavior_queryset_class)
 
-from .models import (AuthoredMockManager, EditoredMockManager,
-                     PublishedMockManager, ReleasedMockManager)
+from .models import (AuthoredMockManager, BehaviorMock, CountedMock,
+                     CountedQuerySet, EditoredMockManager,
+                     PublishedMockManager, ReleasedMockManager,
+                     TimestampedMock)
 
 
 class TestAuthoredMockManager(TestCase):
@@ -130,3 +134,62 @@ class TestReleasedMockManager(TestCase):
     def test_no_release_date_manager_method(self):
         queryset = ReleasedMockManager.objects.no_release_date()
         self.assertEquals(queryset.count(), 1)
+
+
+class TestBehaviorManager(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.author = User.objects.create(
+            username='u1', email='u1@test.com', password='password')
+        cls.author2 = User.objects.create(
+            username='u2', email='u2@test.com', password='password')
+        past = timezone.now() - timedelta(days=1)
+        cls.live = BehaviorMock.objects.create(
+            author=cls.author, publication_status='p', release_date=past)
+        BehaviorMock.objects.create(author=cls.author, release_date=past)
+        BehaviorMock.objects.create(
+            author=cls.author2, publication_status='p', release_date=past)
+        BehaviorMock.objects.create(
+            author=cls.author, publication_status='p',
+            release_date=past).delete()
+
+    def test_queryset_class_combines_behaviors(self):
+        queryset_class = behavior_queryset_class(BehaviorMock)
+        self.assertTrue(issubclass(queryset_class, AuthoredQuerySet))
+        self.assertTrue(issubclass(queryset_class, LiveQuerySet))
+        self.assertTrue(issubclass(queryset_class, TimestampedQuerySet))
+        self.assertFalse(issubclass(queryset_class, EditoredQuerySet))
+        self.assertTrue(type(BehaviorMock.objects.all()) is queryset_class)
+
+    def test_queryset_class_is_cached(self):
+        self.assertIs(behavior_queryset_class(BehaviorMock),
+                      behavior_queryset_class(BehaviorMock))
+
+    def test_single_behavior_uses_its_queryset(self):
+        self.assertIs(behavior_queryset_class(TimestampedMock),
+                      TimestampedQuerySet)
+
+    def test_queryset_classes_cover_their_behaviors(self):
+        queryset_class = behavior_queryset_class(CountedMock, CountedQuerySet)
+        self.assertEqual(queryset_class, CountedQuerySet)
+
+    def test_chained_filters_are_one_query(self):
+        with self.assertNumQueries(1):
+            mocks = list(BehaviorMock.objects.authored_by(
+                self.author).published().released())
+        self.assertEqual(mocks, [self.live])
+        self.assertEqual(list(BehaviorMock.objects.live()), [
+            self.live, BehaviorMock.objects.get(author=self.author2)])
+
+    def test_deleted_objects_are_filtered(self):
+        self.assertEqual(BehaviorMock.objects.count(), 3)
+        self.assertEqual(BehaviorMock.objects.published().count(), 2)
+        self.assertEqual(BehaviorMock.objects.deleted().count(), 1)
+        self.assertEqual(BehaviorMock.objects.not_deleted().count(), 3)
+        self.assertEqual(BehaviorMock.objects.allow_deleted().count(), 4)
+
+    def test_queryset_only_methods_are_not_exposed(self):
+        self.assertFalse(hasattr(BehaviorMock.objects, 'delete'))
+        self.assertFalse(hasattr(BehaviorMock.objects, '_transition'))
@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_django-behaviors
+------------
+
+Query plan regression tests for `django-behaviors` querysets.
+"""
+import os
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+
+from test_plus.test import TestCase
+
+from .models import IndexedBehaviorMock
+from .query_plans import (UPDATE_ENV, explain, explain_calls, full_scans,
+                          load_snapshots, save_snapshots, sqlite_version)
+
+
+# The whole index scans a queryset may do, each with the reason it is fine.
+ALLOWED_INDEX_SCANS = {
+    # The index is partial on deleted IS NULL, so scanning it reads exactly
+    # the rows not_deleted() returns.
+    'store_deleted.not_deleted': ['tests_indexed_live'],
+}
+
+
+@skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN is SQLite only')
+class TestQueryPlans(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.user = User.objects.create(
+            username='u1', email='u1@test.com', password='password')
+
+    def plans(self):
+        objects = IndexedBehaviorMock.objects
+        plans = {
+            'published.draft': explain(objects.draft()),
+            'published.published': explain(objects.published()),
+            'published.allow_deleted_published': explain(objects.allow_deleted().published()),
+            'released.released': explain(objects.released()),
+            'released.not_released': explain(objects.not_released()),
+            'released.no_release_date': explain(objects.no_release_date()),
+            'released.allow_deleted_released': explain(objects.allow_deleted().released()),
+            'store_deleted.deleted': explain(objects.deleted()),
+            'store_deleted.not_deleted': explain(objects.not_deleted()),
+            'live.live': explain(objects.live()),
+            'authored.authored_by': explain(objects.authored_by(self.user)),
+            'editored.edited_by': explain(objects.edited_by(self.user)),
+            'authored.counts_for': explain_calls(lambda: objects.counts_for(self.user)),
+        }
+        return plans
+
+    def test_behavior_querysets_use_indexes(self):
+        for name, plan in sorted(self.plans().items()):
+            with self.subTest(name):
+                self.assertEqual(
+                    full_scans(plan, ALLOWED_INDEX_SCANS.get(name, ())), [], plan)
+
+    def test_full_scans(self):
+        self.assertEqual(full_scans(['SCAN t']), ['SCAN t'])
+        self.assertEqual(full_scans(['SCAN t USING INDEX i']), ['SCAN t USING INDEX i'])
+        self.assertEqual(full_scans(['SCAN t USING COVERING INDEX i']),
+                         ['SCAN t USING COVERING INDEX i'])
+        self.assertEqual(full_scans(['SCAN t USING INDEX i'], ['i']), [])
+        self.assertEqual(full_scans(['SEARCH t USING INDEX i (a=?)']), [])
+
+    def test_plan_snapshots(self):
+        plans = self.plans()
+        if os.environ.get(UPDATE_ENV):
+            save_snapshots(plans)
+        snapshots = load_snapshots()
+        if snapshots['sqlite'] != sqlite_version():
+            self.skipTest('Snapshots were taken with SQLite %s, set %s=1 to '
+                          'retake them.' % (snapshots['sqlite'], UPDATE_ENV))
+        for name, plan in sorted(plans.items()):
+            with self.subTest(name):
+                self.assertIn(name, snapshots['plans'], 'Set %s=1 to add it.' % UPDATE_ENV)
+                self.assertEqual(plan, snapshots['plans'][name])
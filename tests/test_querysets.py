@@ -8,13 +8,21 @@ test_django-behaviors
 Tests for `django-behaviors` querysets module.
 """
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+
+from behaviors import querysets, signals
 from django.utils import timezone
 
 from test_plus.test import TestCase
 
 from datetime import timedelta
 
-from .models import AuthoredMock, EditoredMock, PublishedMock, ReleasedMock, StoreDeletedMock
+from .models import (AuthoredMock, AuthoredEditoredMock, EditoredMock,
+                     LiveMock, PublishedMock,
+                     ReleasedMock, StoreDeletedMock, TimestampedMock,
+                     TimestampedPublishedMock)
 
 
 class TestAuthoredQuerySet(TestCase):
@@ -78,6 +86,33 @@ class TestAuthoredQuerySet(TestCase):
         queryset = AuthoredMock.authors.authored_by('Nobody')
         self.assertEqual(queryset.count(), 0)
 
+    def test_authored_by_filters_on_foreign_key_without_join(self):
+        queryset = AuthoredMock.objects.authored_by(self.author)
+        sql = str(queryset.query)
+        self.assertNotIn('JOIN', sql)
+        self.assertIn('"author_id" = %d' % self.author.pk, sql)
+
+    def test_authored_by_pk(self):
+        self.assertEqual(AuthoredMock.objects.authored_by(self.author.pk).count(), 9)
+
+    def test_authored_by_iterable(self):
+        both = [self.author.pk, self.author2.pk]
+        self.assertEqual(AuthoredMock.objects.authored_by(both).count(), 10)
+        self.assertEqual(AuthoredMock.objects.authored_by([self.author2]).count(), 1)
+        self.assertNotIn('JOIN', str(AuthoredMock.objects.authored_by(both).query))
+
+    def test_authored_by_queryset(self):
+        users = get_user_model().objects.filter(username='u2')
+        self.assertEqual(AuthoredMock.objects.authored_by(users).count(), 1)
+
+    def test_authored_by_prefix_is_case_insensitive(self):
+        self.assertEqual(AuthoredMock.objects.authored_by_prefix('U').count(), 10)
+        self.assertEqual(AuthoredMock.objects.authored_by_prefix('U2').count(), 1)
+        self.assertEqual(AuthoredMock.objects.authored_by('U1').count(), 9)
+        sql = str(AuthoredMock.objects.authored_by_prefix('U1').query)
+        self.assertIn('LOWER(', sql)
+        self.assertNotIn('LOWER(', sql.split(' FROM ')[0])
+
 
 class TestEditoredQuerySet(TestCase):
 
@@ -121,6 +156,14 @@ class TestEditoredQuerySet(TestCase):
         for record in queryset:
             self.assertEqual(record.editor, self.editor2)
 
+    def test_edited_by_iterable(self):
+        queryset = EditoredMock.objects.edited_by([self.editor, self.editor2.pk])
+        self.assertEqual(queryset.count(), 9)
+        self.assertNotIn('JOIN', str(queryset.query))
+
+    def test_edited_by_prefix(self):
+        self.assertEqual(EditoredMock.editors.edited_by_prefix('U2').count(), 1)
+
     def test_editors_editored_by_no_results(self):
         queryset = EditoredMock.editors.edited_by('Nobody')
         self.assertEqual(queryset.count(), 0)
@@ -168,6 +211,83 @@ class TestPublishedQuerySet(TestCase):
             self.assertEqual(
                 record.publication_status, PublishedMock.PUBLISHED)
 
+    def test_status_counts(self):
+        with self.assertNumQueries(1):
+            counts = PublishedMock.objects.status_counts()
+        self.assertEqual(counts, {PublishedMock.DRAFT: 5, PublishedMock.PUBLISHED: 5})
+        self.assertEqual(list(counts), [PublishedMock.DRAFT, PublishedMock.PUBLISHED])
+
+    def test_status_counts_filtered_queryset(self):
+        queryset = PublishedMock.objects.order_by('pk')[:3]
+        pks = list(queryset.values_list('pk', flat=True))
+        counts = PublishedMock.objects.filter(pk__in=pks).status_counts()
+        self.assertEqual(counts, {PublishedMock.DRAFT: 2, PublishedMock.PUBLISHED: 1})
+
+    def test_status_counts_missing_status_is_zero(self):
+        counts = PublishedMock.objects.draft().status_counts()
+        self.assertEqual(counts, {PublishedMock.DRAFT: 5, PublishedMock.PUBLISHED: 0})
+
+    def test_status_counts_not_cached_by_default(self):
+        PublishedMock.objects.status_counts()
+        with self.assertNumQueries(1):
+            PublishedMock.objects.status_counts()
+
+    @override_settings(STATUS_COUNTS_CACHE_TIMEOUT=60)
+    def test_status_counts_cached(self):
+        cache.clear()
+        PublishedMock.objects.status_counts()
+        with self.assertNumQueries(0):
+            counts = PublishedMock.objects.status_counts()
+        self.assertEqual(counts[PublishedMock.PUBLISHED], 5)
+        with self.assertNumQueries(1):
+            PublishedMock.objects.draft().status_counts()
+
+    @override_settings(STATUS_COUNTS_CACHE_TIMEOUT=60)
+    def test_status_counts_invalidated_on_transitions(self):
+        cache.clear()
+        PublishedMock.objects.status_counts()
+        record = PublishedMock.objects.draft().first()
+        record.publication_status = PublishedMock.PUBLISHED
+        with self.captureOnCommitCallbacks(execute=True):
+            record.save()
+        counts = PublishedMock.objects.status_counts()
+        self.assertEqual(counts, {PublishedMock.DRAFT: 4, PublishedMock.PUBLISHED: 6})
+        with self.captureOnCommitCallbacks(execute=True):
+            PublishedMock.objects.published().update(
+                publication_status=PublishedMock.DRAFT)
+        counts = PublishedMock.objects.status_counts()
+        self.assertEqual(counts, {PublishedMock.DRAFT: 10, PublishedMock.PUBLISHED: 0})
+        with self.captureOnCommitCallbacks(execute=True):
+            PublishedMock.objects.draft().first().delete()
+        self.assertEqual(PublishedMock.objects.status_counts()[PublishedMock.DRAFT], 9)
+
+    @override_settings(STATUS_COUNTS_CACHE_TIMEOUT=60)
+    def test_status_counts_invalidated_on_commit(self):
+        cache.clear()
+        PublishedMock.objects.status_counts()
+        with self.captureOnCommitCallbacks() as callbacks:
+            PublishedMock.objects.draft().publish()
+            # Counts read before the commit are still the cached ones.
+            with self.assertNumQueries(0):
+                counts = PublishedMock.objects.status_counts()
+            self.assertEqual(counts[PublishedMock.PUBLISHED], 5)
+        self.assertEqual(len(callbacks), 1)
+        callbacks[0]()
+        counts = PublishedMock.objects.status_counts()
+        self.assertEqual(counts[PublishedMock.PUBLISHED], 10)
+
+    @override_settings(STATUS_COUNTS_CACHE_TIMEOUT=60)
+    def test_status_counts_kept_when_status_unchanged(self):
+        record = PublishedMock.objects.draft().first()
+        with self.captureOnCommitCallbacks() as callbacks:
+            record.save()
+            record.save(update_fields=['publication_status'])
+        self.assertEqual(callbacks, [])
+        record.publication_status = PublishedMock.PUBLISHED
+        with self.captureOnCommitCallbacks() as callbacks:
+            record.save(update_fields=['publication_status'])
+        self.assertEqual(len(callbacks), 1)
+
 
 class TestReleasedQuerySet(TestCase):
 
@@ -246,3 +366,333 @@ class TestStoreDeletedQuerySet(TestCase):
         queryset = StoreDeletedMock.objects.allow_deleted()
         self.assertIsNotNone(queryset)
         self.assertEqual(queryset.count(), 10)
+
+
+class TestLiveQuerySet(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        past_date = timezone.now() - timedelta(weeks=1)
+        future_date = timezone.now() + timedelta(weeks=1)
+        cls.live = LiveMock.objects.create(
+            publication_status=LiveMock.PUBLISHED, release_date=past_date)
+        LiveMock.objects.create(release_date=past_date)
+        LiveMock.objects.create(publication_status=LiveMock.PUBLISHED)
+        LiveMock.objects.create(
+            publication_status=LiveMock.PUBLISHED, release_date=future_date)
+        LiveMock.objects.create(
+            publication_status=LiveMock.PUBLISHED,
+            release_date=past_date).delete()
+
+    def test_live_returns_published_released_not_deleted(self):
+        queryset = LiveMock.objects.live()
+        self.assertEqual(list(queryset), [self.live])
+
+    def test_live_single_minimal_where_clause(self):
+        sql = str(LiveMock.objects.live().query).upper()
+        self.assertEqual(sql.count('WHERE'), 1)
+        self.assertNotIn('NOT', sql)
+        self.assertEqual(sql.count('RELEASE_DATE'), 2)
+
+    def test_live_uses_live_index(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('Plan assertion is written for SQLite')
+        plan = LiveMock.objects.live().explain()
+        self.assertIn('tests_livemock_live', plan)
+
+    def test_manager_combines_behavior_filters(self):
+        self.assertEqual(LiveMock.objects.all().count(), 4)
+        self.assertEqual(LiveMock.objects.published().released().count(), 1)
+        self.assertEqual(LiveMock.objects.allow_deleted().count(), 5)
+
+    @override_settings(STATUS_COUNTS_CACHE_TIMEOUT=60)
+    def test_live_status_counts_cached_across_calls(self):
+        cache.clear()
+        self.assertEqual(LiveMock.objects.live().status_counts()[LiveMock.PUBLISHED], 1)
+        with self.assertNumQueries(0):
+            counts = LiveMock.objects.live().status_counts()
+        self.assertEqual(counts[LiveMock.PUBLISHED], 1)
+        with self.assertNumQueries(1):
+            LiveMock.objects.released().status_counts()
+            LiveMock.objects.released().status_counts()
+        with self.assertNumQueries(1):
+            LiveMock.objects.not_released().status_counts()
+        keys = set([querysets.status_counts_key(LiveMock.objects.live()),
+                    querysets.status_counts_key(LiveMock.objects.live())])
+        self.assertEqual(len(keys), 1)
+
+
+class TestWithStates(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.past_date = timezone.now() - timedelta(weeks=1)
+        cls.future_date = timezone.now() + timedelta(weeks=1)
+        ReleasedMock.objects.create(release_date=cls.past_date)
+        ReleasedMock.objects.create(release_date=cls.future_date)
+        ReleasedMock.objects.create()
+        PublishedMock.objects.create()
+        PublishedMock.objects.create(publication_status=PublishedMock.PUBLISHED)
+        StoreDeletedMock.objects.create()
+        StoreDeletedMock.objects.create().delete()
+        TimestampedMock.objects.create()
+        TimestampedMock.objects.create().save()
+
+    def test_released_state(self):
+        queryset = ReleasedMock.objects.with_states().order_by('-is_released', 'pk')
+        self.assertEqual(
+            [record.is_released for record in queryset], [True, False, False])
+        for record in queryset:
+            self.assertEqual(record.released, record.is_released)
+
+    def test_released_state_uses_single_now(self):
+        earlier = self.past_date - timedelta(days=1)
+        queryset = ReleasedMock.objects.with_states(now=earlier)
+        self.assertFalse(any(record.released for record in queryset))
+
+    def test_release_on_discards_released_state(self):
+        record = ReleasedMock.objects.with_states().get(release_date=self.future_date)
+        record.release_on()
+        self.assertTrue(record.released)
+
+    def test_published_state(self):
+        queryset = PublishedMock.objects.with_states().order_by('pk')
+        self.assertEqual(
+            [record.is_published for record in queryset], [False, True])
+        for record in queryset:
+            self.assertEqual(record.published, record.is_published)
+            self.assertEqual(record.draft, not record.is_published)
+
+    def test_published_state_follows_status(self):
+        record = PublishedMock.objects.with_states().get(
+            publication_status=PublishedMock.DRAFT)
+        record.publication_status = PublishedMock.PUBLISHED
+        self.assertTrue(record.published)
+        self.assertFalse(record.draft)
+        record.save()
+        self.assertNotIn('is_published', record.__dict__)
+
+    def test_released_at_release_date(self):
+        record = ReleasedMock.objects.get(release_date=self.past_date)
+        queryset = ReleasedMock.objects.with_states(now=self.past_date)
+        self.assertTrue(queryset.get(pk=record.pk).is_released)
+        self.assertIn(record, ReleasedMock.objects.released())
+        self.assertTrue(record.released)
+
+    def test_deleted_state(self):
+        queryset = StoreDeletedMock.objects.allow_deleted().with_states()
+        states = queryset.order_by('pk').values_list('is_deleted', flat=True)
+        self.assertEqual(list(states), [False, True])
+        record = queryset.get(is_deleted=True)
+        self.assertTrue(record.is_deleted)
+        record.restore()
+        self.assertFalse(record.is_deleted)
+
+    def test_changed_state(self):
+        queryset = TimestampedMock.objects.with_states().order_by('pk')
+        self.assertEqual(
+            [record.is_changed for record in queryset], [False, True])
+        for record in queryset:
+            self.assertEqual(record.changed, record.is_changed)
+
+    def test_combined_states(self):
+        LiveMock.objects.create(publication_status=LiveMock.PUBLISHED,
+                                release_date=self.past_date)
+        record = LiveMock.objects.with_states().get()
+        self.assertTrue(record.is_published)
+        self.assertTrue(record.is_released)
+        self.assertFalse(record.is_deleted)
+
+
+class TestAsRecords(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.past_date = timezone.now() - timedelta(weeks=1)
+        cls.released = LiveMock.objects.create(
+            publication_status=LiveMock.PUBLISHED, release_date=cls.past_date)
+        cls.draft = LiveMock.objects.create()
+        TimestampedMock.objects.create()
+        TimestampedMock.objects.create().save()
+
+    def test_records(self):
+        records = list(LiveMock.objects.order_by('pk').as_records(
+            'pk', 'publication_status', 'released', 'published', 'is_deleted'))
+        self.assertEqual(records[0], (self.released.pk, 'p', True, True, False))
+        self.assertEqual(records[1].pk, self.draft.pk)
+        self.assertFalse(records[1].released)
+        self.assertEqual(type(records[0]).__name__, 'LiveMockRecord')
+        self.assertIs(type(records[0]), type(records[1]))
+
+    def test_records_are_immutable(self):
+        record = LiveMock.objects.as_records('pk').first()
+        with self.assertRaises(AttributeError):
+            record.pk = 0
+
+    def test_default_fields(self):
+        record = LiveMock.objects.as_records().get(pk=self.draft.pk)
+        self.assertEqual(record._fields, (
+            'id', 'publication_status', 'release_date', 'deleted'))
+        self.assertEqual(record.publication_status, 'd')
+
+    def test_states_use_single_now(self):
+        earlier = self.past_date - timedelta(days=1)
+        records = LiveMock.objects.as_records('released', now=earlier)
+        self.assertFalse(any(record.released for record in records))
+
+    def test_changed_state(self):
+        records = TimestampedMock.objects.order_by('pk').as_records('changed')
+        self.assertEqual([record.changed for record in records], [False, True])
+
+    def test_single_query_without_instances(self):
+        with self.assertNumQueries(1):
+            records = list(LiveMock.objects.as_records('pk', 'released').iterator())
+        self.assertEqual(len(records), 2)
+        self.assertNotIsInstance(records[0], LiveMock)
+
+
+class TestBulkTransitions(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        for i in range(0, 6):
+            TimestampedPublishedMock.objects.create(
+                publication_status=PublishedMock.PUBLISHED if i < 2 else PublishedMock.DRAFT)
+        for i in range(0, 3):
+            ReleasedMock.objects.create()
+
+    def receive(self, sender, pks, **kwargs):
+        self.received.append((sender, sorted(pks), kwargs))
+
+    def connect(self, signal):
+        self.received = []
+        signal.connect(self.receive)
+        self.addCleanup(signal.disconnect, self.receive)
+
+    def test_publish_single_update(self):
+        with self.assertNumQueries(1):
+            rows = TimestampedPublishedMock.objects.publish()
+        self.assertEqual(rows, 4)
+        self.assertEqual(TimestampedPublishedMock.objects.draft().count(), 0)
+
+    def test_publish_stamps_modified(self):
+        TimestampedPublishedMock.objects.draft().publish()
+        queryset = TimestampedPublishedMock.objects.all()
+        self.assertEqual(queryset.filter(modified__isnull=False).count(), 4)
+
+    def test_publish_without_timestamped(self):
+        PublishedMock.objects.create()
+        self.assertEqual(PublishedMock.objects.publish(), 1)
+        self.assertEqual(PublishedMock.objects.published().count(), 1)
+
+    def test_unpublish(self):
+        self.assertEqual(TimestampedPublishedMock.objects.unpublish(), 2)
+        self.assertEqual(TimestampedPublishedMock.objects.published().count(), 0)
+
+    def test_publish_sends_one_signal(self):
+        self.connect(signals.published)
+        drafts = list(TimestampedPublishedMock.objects.draft().values_list('pk', flat=True))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(TimestampedPublishedMock.objects.publish(), 4)
+        self.assertEqual(
+            self.received,
+            [(TimestampedPublishedMock, sorted(drafts), {'signal': signals.published, 'using': 'default'})])
+
+    def test_release_on(self):
+        date = timezone.now() - timedelta(days=1)
+        with self.assertNumQueries(1):
+            rows = ReleasedMock.objects.all().release_on(date)
+        self.assertEqual(rows, 3)
+        self.assertEqual(ReleasedMock.objects.released().count(), 3)
+
+    def test_release_on_sends_release_date(self):
+        self.connect(signals.released)
+        with self.captureOnCommitCallbacks(execute=True):
+            rows = ReleasedMock.objects.release_on()
+        self.assertEqual(rows, 3)
+        self.assertEqual(len(self.received), 1)
+        self.assertEqual(len(self.received[0][1]), 3)
+        self.assertIn('release_date', self.received[0][2])
+
+    def test_unrelease(self):
+        ReleasedMock.objects.release_on()
+        self.connect(signals.unreleased)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(ReleasedMock.objects.unrelease(), 3)
+        self.assertEqual(ReleasedMock.objects.no_release_date().count(), 3)
+        self.assertEqual(len(self.received), 1)
+
+    def test_soft_delete_and_restore(self):
+        mocks = [StoreDeletedMock.objects.create() for _ in range(4)]
+        mocks[0].delete()
+        with self.assertNumQueries(1):
+            self.assertEqual(StoreDeletedMock.objects.filter(pk=mocks[1].pk).soft_delete(), 1)
+        self.connect(signals.soft_deleted)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(StoreDeletedMock.objects.soft_delete(), 2)
+        self.assertEqual(self.received[0][1], sorted(mock.pk for mock in mocks[2:]))
+        self.assertEqual(StoreDeletedMock.objects.count(), 0)
+        self.connect(signals.restored)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(StoreDeletedMock.objects.restore(), 4)
+        self.assertEqual(len(self.received[0][1]), 4)
+        self.assertEqual(StoreDeletedMock.objects.count(), 4)
+
+    def test_transition_batches(self):
+        self.addCleanup(setattr, querysets, 'TRANSITION_BATCH_SIZE',
+                        querysets.TRANSITION_BATCH_SIZE)
+        querysets.TRANSITION_BATCH_SIZE = 3
+        self.connect(signals.published)
+        drafts = list(TimestampedPublishedMock.objects.draft().values_list('pk', flat=True))
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(TimestampedPublishedMock.objects.publish(), 4)
+        self.assertEqual([len(pks) for _, pks, _ in self.received], [3, 1])
+        self.assertEqual(sorted(pk for _, pks, _ in self.received for pk in pks),
+                         sorted(drafts))
+
+
+class TestWithPeople(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.author = User.objects.create(
+            username='u1', email='u1@test.com', password='password')
+        cls.editor = User.objects.create(
+            username='u2', email='u2@test.com', password='password')
+        AuthoredEditoredMock.objects.bulk_create([
+            AuthoredEditoredMock(author=cls.author,
+                                 editor=cls.editor if i % 2 else None)
+            for i in range(0, 1000)])
+        AuthoredMock.objects.create(author=cls.author)
+        EditoredMock.objects.create(editor=cls.editor)
+        EditoredMock.objects.create()
+
+    def test_fixed_query_count_for_authored_editored(self):
+        with self.assertNumQueries(1):
+            records = list(AuthoredEditoredMock.objects.with_people())
+            names = [(record.author.username,
+                      record.editor.username if record.editor else None)
+                     for record in records]
+        self.assertEqual(len(names), 1000)
+        self.assertEqual(names[0], ('u1', None))
+        self.assertEqual(names[1], ('u1', 'u2'))
+
+    def test_only_requested_user_columns(self):
+        sql = str(AuthoredEditoredMock.objects.with_people().query)
+        self.assertIn('"username"', sql)
+        self.assertNotIn('"email"', sql)
+        self.assertNotIn('"password"', sql)
+        sql = str(AuthoredEditoredMock.objects.with_people(fields=('email',)).query)
+        self.assertIn('"email"', sql)
+
+    def test_authored_only(self):
+        with self.assertNumQueries(1):
+            record = AuthoredMock.objects.with_people().get()
+            self.assertEqual(record.author.username, 'u1')
+
+    def test_editored_only(self):
+        with self.assertNumQueries(1):
+            records = list(EditoredMock.editors.with_people().order_by('pk'))
+            self.assertEqual(records[0].editor.username, 'u2')
+            self.assertIsNone(records[1].editor)
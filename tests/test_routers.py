@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_django-behaviors
+------------
+
+Tests for `django-behaviors` routers module.
+"""
+from unittest import skipIf
+
+from django.db import router
+from django.test import override_settings
+from django.test.client import RequestFactory
+from django.http import HttpResponse
+
+try:
+    import contextvars
+except ImportError:
+    contextvars = None
+
+from behaviors.middleware import PrimaryPinningMiddleware
+from behaviors.routers import (READ_HINT, is_installed, is_pinned,
+                               pinned_to_primary, unpin)
+
+from test_plus.test import TestCase
+
+from .models import (AuthoredEditoredMock, BehaviorMock, LiveMock,
+                     PublishedMock, SluggedMock, StoreDeletedMock)
+
+
+@override_settings(DATABASE_ROUTERS=['behaviors.routers.BehaviorRouter'],
+                   BEHAVIORS_REPLICA_DATABASES=['replica'])
+class TestBehaviorRouter(TestCase):
+    databases = {'default', 'replica'}
+    multi_db = True
+
+    def setUp(self):
+        # The replica is a separate database here, so rows created on it are
+        # only visible to the queries routed to it.
+        PublishedMock.objects.using('replica').create(publication_status='p')
+        StoreDeletedMock.objects.using('replica').create()
+        LiveMock.objects.using('replica').create()
+        unpin()
+
+    def tearDown(self):
+        unpin()
+
+    def test_behavior_reads_go_to_replica(self):
+        self.assertEqual(PublishedMock.objects.published().count(), 1)
+        self.assertEqual(PublishedMock.objects.status_counts()['p'], 1)
+        self.assertEqual(StoreDeletedMock.objects.not_deleted().count(), 1)
+        self.assertEqual(LiveMock.objects.live().count(), 0)
+        self.assertEqual(LiveMock.objects.not_deleted().db, 'replica')
+        self.assertEqual(AuthoredEditoredMock.objects.with_people().db, 'replica')
+
+    def test_other_reads_go_to_primary(self):
+        self.assertEqual(PublishedMock.objects.count(), 0)
+        self.assertEqual(PublishedMock.objects.all().db, 'default')
+
+    def test_default_manager_reads_go_to_primary(self):
+        self.assertEqual(StoreDeletedMock.objects.count(), 0)
+        for model in (StoreDeletedMock, LiveMock, BehaviorMock):
+            self.assertEqual(model.objects.all().db, 'default')
+            self.assertEqual(model.objects.filter(pk=1).db, 'default')
+        self.assertEqual(BehaviorMock.objects.not_deleted().db, 'replica')
+
+    def test_write_database_lookup_does_not_pin(self):
+        self.assertEqual(router.db_for_write(SluggedMock), 'default')
+        SluggedMock(title='Some Title').is_unique_slug('some-title')
+        self.assertFalse(is_pinned())
+
+    def test_queryset_writes_pin(self):
+        PublishedMock.objects.filter(pk=0).update(publication_status='p')
+        self.assertTrue(is_pinned())
+        unpin()
+        StoreDeletedMock.objects.filter(pk=0).delete()
+        self.assertTrue(is_pinned())
+
+    @skipIf(contextvars is None, 'contextvars needs Python 3.7')
+    def test_pinning_is_per_context(self):
+        contextvars.Context().run(PublishedMock.objects.create)
+        self.assertFalse(is_pinned())
+
+    def test_writes_go_to_primary_and_pin(self):
+        mock = PublishedMock.objects.create()
+        self.assertEqual(mock._state.db, 'default')
+        self.assertTrue(is_pinned())
+        self.assertEqual(PublishedMock.objects.draft().count(), 1)
+        self.assertEqual(PublishedMock.objects.published().count(), 0)
+
+    def test_bulk_transition_reads_primary(self):
+        PublishedMock.objects.using('default').create()
+        unpin()
+        self.assertEqual(PublishedMock.objects.draft().publish(), 1)
+        self.assertEqual(PublishedMock.objects.using('default').get().publication_status, 'p')
+
+    def test_pinned_to_primary(self):
+        with pinned_to_primary():
+            self.assertEqual(PublishedMock.objects.published().count(), 0)
+        self.assertFalse(is_pinned())
+        self.assertEqual(PublishedMock.objects.published().count(), 1)
+
+    def test_slug_uniqueness_checked_on_primary(self):
+        SluggedMock.objects.using('replica').create(title='Some Title')
+        SluggedMock.objects.create(title='Other Title', slug='some-title')
+        unpin()
+        mock = SluggedMock.objects.create(title='Some Title')
+        self.assertEqual(mock.slug, 'some-title-1')
+
+    def test_slug_uniqueness_checked_on_using(self):
+        mock = SluggedMock(title='Some Title')
+        SluggedMock.objects.create(title='Some Title')
+        mock.save(using='replica')
+        self.assertEqual(mock.slug, 'some-title')
+
+    def test_middleware_unpins(self):
+        middleware = PrimaryPinningMiddleware(lambda request: HttpResponse())
+        PublishedMock.objects.create()
+        middleware(RequestFactory().get('/'))
+        self.assertFalse(is_pinned())
+
+
+class TestWithoutBehaviorRouter(TestCase):
+
+    def test_not_installed(self):
+        self.assertFalse(is_installed())
+        with self.settings(DATABASE_ROUTERS=['behaviors.routers.BehaviorRouter']):
+            self.assertTrue(is_installed())
+
+    def test_reads_not_hinted(self):
+        self.assertNotIn(READ_HINT, PublishedMock.objects.published()._hints)
+        self.assertNotIn(READ_HINT, LiveMock.objects.live()._hints)
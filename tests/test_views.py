@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_django-behaviors
+------------
+
+Tests for `django-behaviors` views module.
+"""
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from django.utils.http import http_date
+
+from behaviors.compat import epoch_micros
+
+from test_plus.test import TestCase
+
+from .models import TimestampedMock
+
+
+class TestConditionalGet(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.mock = TimestampedMock.objects.create()
+        cls.other = TimestampedMock.objects.create()
+        cls.other.save()
+
+    def assertConditional(self, url_name, *args):
+        response = self.get(url_name, *args)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('ETag', response)
+        self.assertIn('Last-Modified', response)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.get(url_name, *args, extra={
+                'HTTP_IF_NONE_MATCH': response['ETag']})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(len(queries), 1)
+        return response
+
+    def test_detail_view(self):
+        self.assertConditional('timestamped_detail_view', self.mock.pk)
+
+    def test_list_view(self):
+        self.assertConditional('timestamped_list_view')
+
+    def test_detail_function(self):
+        self.assertConditional('timestamped_detail', self.mock.pk)
+
+    def test_list_function(self):
+        self.assertConditional('timestamped_list')
+
+    def test_changed_object_is_rendered(self):
+        etag = self.get('timestamped_detail', self.mock.pk)['ETag']
+        self.mock.save()
+        response = self.get('timestamped_detail', self.mock.pk, extra={
+            'HTTP_IF_NONE_MATCH': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_deleted_object_is_rendered(self):
+        etag = self.get('timestamped_list')['ETag']
+        TimestampedMock.objects.filter(pk=self.mock.pk).delete()
+        response = self.get('timestamped_list', extra={
+            'HTTP_IF_NONE_MATCH': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_if_modified_since(self):
+        response = self.get('timestamped_list', extra={
+            'HTTP_IF_MODIFIED_SINCE': http_date(
+                epoch_micros(self.other.modified) // 10 ** 6 + 1)})
+        self.assertEqual(response.status_code, 304)
+
+    def test_missing_object(self):
+        response = self.get('timestamped_detail_view', 0)
+        self.assertEqual(response.status_code, 404)
+        self.assertNotIn('ETag', response)
+
+    def test_last_modified(self):
+        self.assertEqual(TimestampedMock.objects.last_modified(),
+                         self.other.modified)
+        self.assertEqual(
+            TimestampedMock.objects.filter(pk=self.mock.pk).last_modified(),
+            self.mock.created)
+        self.assertIsNone(TimestampedMock.objects.none().last_modified())
+
+    def test_cache_key_changes_on_save(self):
+        key = self.mock.cache_key
+        self.assertTrue(key.startswith('tests.timestampedmock.%s.' % self.mock.pk))
+        self.mock.save()
+        self.assertNotEqual(self.mock.cache_key, key)
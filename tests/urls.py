@@ -1,11 +1,28 @@
 # -*- coding: utf-8
 from __future__ import unicode_literals, absolute_import
 
-from django.conf.urls import url
+try:
+    from django.urls import re_path as url
+except ImportError:
+    from django.conf.urls import url
+
+from django.contrib import admin
 
 from . import views
 
 
 urlpatterns = [
+    url(r'^admin/', admin.site.urls),
     url(r'authored$', views.AuthoredMockCreateView.as_view(), name='authored'),
+    url(r'timestamped/(?P<pk>\d+)$', views.TimestampedMockDetailView.as_view(),
+        name='timestamped_detail_view'),
+    url(r'timestamped$', views.TimestampedMockListView.as_view(),
+        name='timestamped_list_view'),
+    url(r'timestamped-function/(?P<pk>\d+)$', views.timestamped_detail,
+        name='timestamped_detail'),
+    url(r'timestamped-function$', views.timestamped_list,
+        name='timestamped_list'),
+    url(r'timestamped-editored/(?P<pk>\d+)$',
+        views.TimestampedEditoredMockUpdateView.as_view(),
+        name='timestamped_editored_update'),
 ]
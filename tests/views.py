@@ -1,7 +1,15 @@
+from django.http import HttpResponse
+from django.views.generic import DetailView, ListView
 from django.views.generic.edit import CreateView, UpdateView
 
-from .models import AuthoredMock, EditoredMock
-from .forms import AuthoredModelFormMock, EditoredModelFormMock
+from behaviors.views import (ConditionalGetMixin, ConflictFormMixin,
+                             timestamped_list_condition,
+                             timestamped_object_condition)
+
+from .models import (AuthoredMock, EditoredMock, TimestampedEditoredMock,
+                     TimestampedMock)
+from .forms import (AuthoredModelFormMock, EditoredModelFormMock,
+                    TimestampedEditoredModelFormMock)
 
 
 class FormKwargsRequestMixin(object):
@@ -20,3 +28,38 @@ class AuthoredMockCreateView(FormKwargsRequestMixin, CreateView):
 class EditoredMockUpdateView(FormKwargsRequestMixin, UpdateView):
     model = EditoredMock
     form = EditoredModelFormMock
+
+
+class RenderMixin(object):
+
+    def render_to_response(self, context, **response_kwargs):
+        return HttpResponse('rendered')
+
+
+class TimestampedMockDetailView(ConditionalGetMixin, RenderMixin, DetailView):
+    model = TimestampedMock
+
+
+class TimestampedMockListView(ConditionalGetMixin, RenderMixin, ListView):
+    model = TimestampedMock
+
+
+class TimestampedEditoredMockUpdateView(ConflictFormMixin, RenderMixin, UpdateView):
+    model = TimestampedEditoredMock
+    form_class = TimestampedEditoredModelFormMock
+    success_url = '/'
+
+    def get_form_kwargs(self):
+        kwargs = super(TimestampedEditoredMockUpdateView, self).get_form_kwargs()
+        kwargs['request'] = self.request
+        return kwargs
+
+
+@timestamped_object_condition(TimestampedMock)
+def timestamped_detail(request, pk):
+    return HttpResponse('rendered')
+
+
+@timestamped_list_condition(TimestampedMock.objects.all())
+def timestamped_list(request):
+    return HttpResponse('rendered')